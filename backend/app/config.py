@@ -1,6 +1,7 @@
 """
 應用配置檔案
 """
+import os
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -17,11 +18,47 @@ class Settings(BaseSettings):
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "self_learning_system"
 
-    # 或者分開配置（根據老師 SDK 的要求調整）
+    # 或者分開配置（未設定 MONGODB_URL 時以 HOST/PORT 組成連線字串；
+    # 設定 USER 時以帳號密碼認證，兩種方式皆適用）
     MONGODB_HOST: str = "localhost"
     MONGODB_PORT: int = 27017
     MONGODB_USER: Optional[str] = None
     MONGODB_PASSWORD: Optional[str] = None
+    MONGODB_AUTH_SOURCE: str = "admin"
+
+    # MongoDB 連線池與逾時
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None  # 閒置連線關閉時間，None 表示不關閉
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None  # 等待可用連線的上限，None 表示不限
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 5000
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = 30000
+    # 網路傳輸壓縮（逗號分隔，依序協商），例如 "zstd,snappy,zlib"；空字串表示不壓縮
+    MONGODB_COMPRESSORS: str = ""
+    # 教師列表與統計查詢的讀取偏好（primary / primaryPreferred / secondary /
+    # secondaryPreferred / nearest）；使用 secondary 時列表可能落後主節點數秒
+    MONGODB_LIST_READ_PREFERENCE: str = "primary"
+
+    @property
+    def mongodb_uri(self) -> str:
+        """MongoDB 連線字串（明確設定 MONGODB_URL 時優先使用）"""
+        if "MONGODB_URL" in self.model_fields_set:
+            return self.MONGODB_URL
+        return f"mongodb://{self.MONGODB_HOST}:{self.MONGODB_PORT}"
+
+    # worker 行程數量（uvicorn --workers），0 表示依 CPU 核心數
+    WORKERS: int = 1
+
+    @property
+    def worker_count(self) -> int:
+        """實際的 worker 行程數量"""
+        if self.WORKERS > 0:
+            return self.WORKERS
+        return os.cpu_count() or 1
+
+    # 啟動時資料庫沒有學生資料則從此檔案匯入（留空表示不自動匯入）
+    SEED_STUDENTS_FILE: Optional[str] = "/114-1全校名單.xlsx"
 
     # JWT 認證配置
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
@@ -35,6 +72,103 @@ class Settings(BaseSettings):
         "http://localhost:8080",
     ]
 
+    # 回應壓縮配置（小於此位元組數的回應不壓縮）
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
+
+    # 草稿寫入緩衝：同一使用者兩次寫入資料庫的最短間隔（秒），0 表示每次直接寫入
+    # （多個 worker 時緩衝不跨行程共享，因此一律直接寫入）
+    DRAFT_FLUSH_INTERVAL_SECONDS: float = 5.0
+
+    # 申請表狀態推播（Server-Sent Events）
+    APPLICATION_EVENTS_POLL_INTERVAL_SECONDS: float = 5.0  # 非 replica set 時的輪詢間隔
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # 需小於 nginx 的 proxy_read_timeout
+    SSE_TOKEN_EXPIRE_SECONDS: int = 60  # 事件串流 token 的有效時間（只在建立連線時檢查）
+
+    # PDF 生成方式：libreoffice（Word 模板 + LibreOffice 轉換）或 native（fpdf2 直接繪製）
+    PDF_ENGINE: str = "libreoffice"
+    # native 使用的中文字型（fonts-noto-cjk）；字型集（.ttc）中的第幾個字型，3 為 Noto Sans CJK TC
+    PDF_FONT_PATH: str = "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc"
+    PDF_FONT_INDEX: int = 3
+
+    # PDF 生成排程（每個 worker 行程）：槽位數量即同時執行的 LibreOffice 數量，
+    # 通知郵件與批次 / 預先生成各自的上限需小於總數，保留槽位給使用者匯出
+    PDF_RENDER_CONCURRENCY: int = 3
+    PDF_RENDER_NOTIFICATION_CONCURRENCY: int = 1
+    PDF_RENDER_BULK_CONCURRENCY: int = 1
+
+    # PDF 預先生成：送出、更新與審核通過後以低優先順序生成 PDF 並存入快取，
+    # 匯出與通知郵件直接使用快取（內容未變更時不重新生成）
+    PDF_PRERENDER_ENABLED: bool = False
+    ARTIFACT_CACHE_DIR: str = "/app/uploads/artifacts"  # 多個 worker 共用（ARTIFACT_STORAGE=local）
+    # 生成結果的儲存後端：local（ARTIFACT_CACHE_DIR）或 s3（S3 相容物件儲存，多個副本共用）
+    ARTIFACT_STORAGE: str = "local"
+    # 生成結果保留天數（local 定期刪除、s3 以儲存桶生命週期規則刪除），0 表示不過期
+    ARTIFACT_TTL_DAYS: int = 30
+    S3_ENDPOINT_URL: Optional[str] = None  # AWS S3 留空；MinIO 例如 http://minio:9000
+    S3_PUBLIC_ENDPOINT_URL: Optional[str] = None  # 瀏覽器下載使用的端點（預簽網址），預設同 S3_ENDPOINT_URL
+    S3_REGION: str = "us-east-1"
+    S3_BUCKET: str = "fhsh-artifacts"
+    S3_PREFIX: str = "artifacts/"
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    # 預先生成時一併產生的第一頁縮圖（png 或 webp）
+    PDF_THUMBNAIL_FORMAT: str = "png"
+    PDF_THUMBNAIL_WIDTH: int = 320
+
+    # 非同步 PDF 匯出工作
+    PDF_JOB_CONCURRENCY: int = 2  # 每個 worker 行程同時執行的工作數量
+    PDF_JOB_DIR: str = "/app/uploads/pdf-jobs"  # 生成的 PDF 存放目錄（重新啟動後保留）
+    PDF_JOB_POLL_INTERVAL_SECONDS: float = 1.0  # 閒置時檢查新工作的間隔（同一行程建立的工作會立即執行）
+    PDF_JOB_LEASE_SECONDS: float = 300.0  # 執行中的工作定期延長租約，超過此時間未延長視為行程已終止並重新執行
+    PDF_JOB_MAX_ATTEMPTS: int = 3
+    PDF_JOB_RESULT_TTL_SECONDS: int = 3600  # 完成的工作與 PDF 保留時間
+
+    # 簽章下載網址：生成的 PDF 以有時效的 HMAC 簽章網址下載（/downloads/...，不需登入）
+    DOWNLOAD_URL_TTL_SECONDS: int = 300  # 匯出完成後的下載網址有效時間
+    # 設定後（例如 /protected-downloads/），下載由 nginx 依 X-Accel-Redirect 直接從 uploads 目錄傳送，
+    # 檔案內容不經過 Python；只能在 nginx 之後使用（直接連線到後端會收到空的回應）
+    DOWNLOAD_X_ACCEL_PREFIX: Optional[str] = None
+    # 對外的 API 網址（例如 https://selflearn.example.com/api），郵件中的下載連結使用
+    PUBLIC_API_URL: Optional[str] = None
+    # 審核通知郵件以下載連結取代 PDF 附件（需設定 PUBLIC_API_URL）
+    EMAIL_PDF_AS_LINK: bool = False
+    EMAIL_DOWNLOAD_URL_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # 申請表匯出（Excel 與分析用資料）：每次從資料庫讀取的筆數，記憶體用量與匯出總筆數無關
+    EXPORT_BATCH_SIZE: int = 500
+    # 分析用欄式資料匯出（scripts/export_analytics.py，依 updated_at 增量匯出）
+    ANALYTICS_EXPORT_DIR: str = "/app/uploads/analytics"
+    ANALYTICS_EXPORT_FORMAT: str = "parquet"  # parquet 或 arrow（Arrow IPC）
+
+    # SMTP 配置（Gmail 帳號與 App Password 在系統設定中設定）
+    SMTP_HOST: str = "smtp.gmail.com"
+    SMTP_PORT: int = 587
+    SMTP_STARTTLS: bool = True
+
+    # 健康檢查（/health/ready）
+    HEALTH_MONGODB_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_LIBREOFFICE_TIMEOUT_SECONDS: float = 10.0
+    HEALTH_SMTP_TIMEOUT_SECONDS: float = 3.0
+    HEALTH_ARTIFACT_STORAGE_TIMEOUT_SECONDS: float = 3.0
+    HEALTH_CACHE_SECONDS: float = 60.0  # LibreOffice、SMTP 與物件儲存檢查結果的快取時間
+
+    # 日誌配置
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json 或 text
+    LOG_LEVELS: str = ""  # 個別模組等級，例如 "app.services.pdf_service=DEBUG,pymongo=WARNING"
+
+    # Prometheus 指標（/metrics 不需認證，請在 nginx 限制僅內部網路可存取）
+    METRICS_ENABLED: bool = True
+
+    # 請求剖析（預設關閉）：帶有 X-Profile: <PROFILING_SECRET> 的請求，
+    # 或依 PROFILING_SAMPLE_RATE（0-1）抽樣的請求會被剖析
+    PROFILING_SECRET: Optional[str] = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.001  # CPU 取樣間隔
+    PROFILING_MAX_PROFILES: int = 20  # 保留最近幾筆剖析結果
+    PROFILING_DIR: str = "/app/temp/profiles"  # 剖析結果存放目錄（所有 worker 共用）
+
     # 檔案上傳配置
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
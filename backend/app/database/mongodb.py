@@ -1,9 +1,31 @@
 """
 MongoDB 資料庫連線管理 - 使用 Beanie ODM
 """
+import logging
+from typing import Any, Dict
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+    _ServerMode,
+)
 from ..config import settings
+from ..utils.metrics import MongoCommandMetrics, MongoPoolMetrics
+from ..utils.profiling import MongoProfileListener
+
+logger = logging.getLogger(__name__)
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
 
 
 class MongoDBClient:
@@ -13,13 +35,60 @@ class MongoDBClient:
 
     client: AsyncIOMotorClient | None = None
 
+    @staticmethod
+    def build_client_options() -> Dict[str, Any]:
+        """
+        由設定組成 Motor 客戶端參數
+
+        Returns:
+            Dict: 傳給 AsyncIOMotorClient 的關鍵字參數
+        """
+        options: Dict[str, Any] = {
+            "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+            "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+            "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+            "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            # 記錄每個指令耗時與連線池使用量到 Prometheus 指標，以及請求剖析
+            "event_listeners": [MongoCommandMetrics(), MongoPoolMetrics(), MongoProfileListener()],
+        }
+        compressors = [name.strip() for name in settings.MONGODB_COMPRESSORS.split(",") if name.strip()]
+        if compressors:
+            options["compressors"] = compressors
+        if settings.MONGODB_USER:
+            options["username"] = settings.MONGODB_USER
+            options["password"] = settings.MONGODB_PASSWORD
+            options["authSource"] = settings.MONGODB_AUTH_SOURCE
+        return options
+
+    @staticmethod
+    def list_read_preference() -> _ServerMode:
+        """
+        教師列表與統計查詢的讀取偏好
+
+        Returns:
+            _ServerMode: pymongo 讀取偏好
+
+        Raises:
+            ValueError: MONGODB_LIST_READ_PREFERENCE 不是有效的模式名稱
+        """
+        mode = READ_PREFERENCES.get(settings.MONGODB_LIST_READ_PREFERENCE)
+        if mode is None:
+            raise ValueError(f"無效的 MONGODB_LIST_READ_PREFERENCE: {settings.MONGODB_LIST_READ_PREFERENCE}")
+        return mode()
+
     @classmethod
     async def connect_db(cls):
         """
         連線到 MongoDB 資料庫並初始化 Beanie
         """
+        # 先驗證讀取偏好設定，避免到第一次查詢才發現錯誤
+        cls.list_read_preference()
+
         # 建立 Motor 客戶端
-        cls.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        cls.client = AsyncIOMotorClient(settings.mongodb_uri, **cls.build_client_options())
         database = cls.client[settings.MONGODB_DB_NAME]
 
         # 匯入所有 Document 模型
@@ -28,6 +97,7 @@ class MongoDBClient:
         from ..models.student import Student
         from ..models.draft import Draft
         from ..models.settings import SystemSettings
+        from ..models.pdf_job import PdfJob
 
         # 初始化 Beanie
         await init_beanie(
@@ -38,11 +108,11 @@ class MongoDBClient:
                 Student,
                 Draft,
                 SystemSettings,
+                PdfJob,
             ]
         )
 
-        print(f"✅ 成功連線到 MongoDB: {settings.MONGODB_DB_NAME}")
-        print(f"✅ Beanie ODM 已初始化")
+        logger.info("已連線到 MongoDB 並初始化 Beanie: %s", settings.MONGODB_DB_NAME)
 
     @classmethod
     async def close_db(cls):
@@ -51,7 +121,7 @@ class MongoDBClient:
         """
         if cls.client:
             cls.client.close()
-            print("👋 MongoDB 連線已關閉")
+            logger.info("MongoDB 連線已關閉")
 
 
 # 全域性資料庫客戶端例項
@@ -1,14 +1,16 @@
 """
 FastAPI 依賴注入 - 使用 Beanie ODM
 """
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .models.user import User, UserRole
 from .services.user_service import UserService
-from .utils.auth import decode_access_token
+from .utils.auth import EVENTS_TOKEN_SCOPE, decode_access_token
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def get_user_service() -> UserService:
@@ -19,19 +21,23 @@ def get_user_service() -> UserService:
     return UserService()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    user_service: UserService = Depends(get_user_service)
-) -> User:
+async def _resolve_user(token: str, user_service: UserService, scope: Optional[str] = None) -> User:
     """
-    獲取當前登入使用者
+    由 JWT token 解析並驗證使用者
 
-    從 JWT token 中解析使用者資訊
-    """
-    token = credentials.credentials
+    Args:
+        token: JWT token
+        user_service: 使用者服務
+        scope: 要求的 token scope，None 表示登入 token
+
+    Returns:
+        User: 使用者
 
+    Raises:
+        HTTPException: token 無效、使用者不存在或已被禁用
+    """
     # 解碼 token
-    payload = decode_access_token(token)
+    payload = decode_access_token(token, scope)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,6 +72,43 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: UserService = Depends(get_user_service)
+) -> User:
+    """
+    獲取當前登入使用者
+
+    從 JWT token 中解析使用者資訊
+    """
+    return await _resolve_user(credentials.credentials, user_service)
+
+
+async def get_current_user_for_stream(
+    access_token: Optional[str] = Query(
+        None, description="事件串流 token（POST /applications/events/token 取得；EventSource 無法設定標頭時使用）"
+    ),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    user_service: UserService = Depends(get_user_service)
+) -> User:
+    """
+    獲取串流連線（Server-Sent Events）的當前使用者
+
+    瀏覽器的 EventSource 無法設定 Authorization 標頭，因此也接受
+    access_token 查詢參數。查詢參數會出現在存取日誌中，只接受短效的
+    事件串流 token，不接受登入 token。
+    """
+    if credentials:
+        return await _resolve_user(credentials.credentials, user_service)
+    if not access_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="未提供認證憑證",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await _resolve_user(access_token, user_service, EVENTS_TOKEN_SCOPE)
+
+
 async def get_current_student(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -1,12 +1,35 @@
 """
 FastAPI 主應用
 """
-from fastapi import FastAPI
+import logging
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from .config import settings
 from .database import mongodb_client
-from .routes import auth_router, applications_router, students_router, drafts_router, settings_router
+from .middleware import SelectiveGZipMiddleware, MetricsMiddleware, RequestIdMiddleware, ProfilingMiddleware
+from .services.draft_buffer import draft_write_buffer
+from .services.application_events import application_event_hub
+from .services.seed_service import SeedService
+from .services.pdf_job_service import pdf_job_runner
+from .services.artifact_cache import artifact_cache
+from .utils.metrics import CONTENT_TYPE_LATEST, mark_process_dead, render_metrics
+from .utils.log import setup_logging
+from .routes import (
+    auth_router,
+    applications_router,
+    students_router,
+    drafts_router,
+    settings_router,
+    profiles_router,
+    health_router,
+    pdf_jobs_router,
+    downloads_router,
+)
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -16,11 +39,27 @@ async def lifespan(app: FastAPI):
     """
     # 啟動時連線資料庫
     await mongodb_client.connect_db()
-    print(f"✅ {settings.APP_NAME} v{settings.APP_VERSION} 已啟動")
+    # 首次啟動時匯入學生名單
+    await SeedService().seed_if_empty()
+    # 啟動申請表狀態推播
+    await application_event_hub.start()
+    # 啟動 PDF 匯出工作執行器（繼續執行重新啟動前排隊中的工作）
+    await pdf_job_runner.start()
+    # 生成結果過期處理（local 刪除舊檔、s3 設定生命週期規則）
+    await artifact_cache.start()
+    logger.info("%s v%s 已啟動", settings.APP_NAME, settings.APP_VERSION)
     yield
+    await artifact_cache.stop()
+    await pdf_job_runner.stop()
+    await application_event_hub.stop()
+    # 關閉前寫入緩衝中的草稿
+    flushed = await draft_write_buffer.flush_all()
+    if flushed:
+        logger.info("已寫入 %d 份緩衝中的草稿", flushed)
     # 關閉時斷開資料庫連線
     await mongodb_client.close_db()
-    print(f"👋 {settings.APP_NAME} 已關閉")
+    mark_process_dead()
+    logger.info("%s 已關閉", settings.APP_NAME)
 
 
 # 建立 FastAPI 應用
@@ -29,6 +68,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="臺北市立復興高階中學 自主學習計畫申請系統 API",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -41,6 +81,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 回應壓縮（申請表含簽名 base64，JSON 回應通常數十 KB）
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+
+# 請求耗時指標（在壓縮之外，包含壓縮的耗時；外層依序為請求剖析與請求 ID）
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# 請求剖析（需設定 PROFILING_SECRET 或 PROFILING_SAMPLE_RATE 才會啟用）
+if settings.PROFILING_SECRET or settings.PROFILING_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilingMiddleware)
+
+# 請求 ID（最外層，讓其他中介軟體與路由的日誌都帶有請求 ID）
+app.add_middleware(RequestIdMiddleware)
+
 
 # 註冊路由
 app.include_router(auth_router)
@@ -48,6 +106,10 @@ app.include_router(applications_router)
 app.include_router(students_router)
 app.include_router(drafts_router)
 app.include_router(settings_router)
+app.include_router(profiles_router)
+app.include_router(health_router)
+app.include_router(pdf_jobs_router)
+app.include_router(downloads_router)
 
 
 @app.get("/", tags=["系統"])
@@ -64,15 +126,14 @@ async def root():
     }
 
 
-@app.get("/health", tags=["系統"])
-async def health_check():
+@app.get("/metrics", tags=["系統"], include_in_schema=False)
+async def metrics():
     """
-    健康檢查
+    Prometheus 效能指標
     """
-    return {
-        "status": "healthy",
-        "database": "connected" if mongodb_client.client is not None else "disconnected"
-    }
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 if __name__ == "__main__":
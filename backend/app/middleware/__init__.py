@@ -0,0 +1,14 @@
+"""
+中介軟體模組
+"""
+from .compression import SelectiveGZipMiddleware
+from .metrics import MetricsMiddleware
+from .request_id import RequestIdMiddleware
+from .profiling import ProfilingMiddleware
+
+__all__ = [
+    "SelectiveGZipMiddleware",
+    "MetricsMiddleware",
+    "RequestIdMiddleware",
+    "ProfilingMiddleware",
+]
@@ -0,0 +1,116 @@
+"""
+回應壓縮中介軟體
+"""
+import gzip
+import io
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 不壓縮的內容型別：本身已壓縮的檔案，以及需要即時送出的串流
+UNCOMPRESSED_CONTENT_TYPES = (
+    "application/pdf",
+    "application/zip",
+    "application/vnd.openxmlformats-officedocument",
+    "application/vnd.apache.parquet",
+    "application/vnd.apache.arrow",
+    "image/",
+    "text/event-stream",
+)
+
+
+class _GZipResponder:
+    """
+    單一回應的壓縮處理
+
+    在 http.response.start 依標頭決定是否壓縮（已有 Content-Encoding 或內容型別不壓縮時原樣轉送）；
+    不依賴 Starlette GZipResponder 的內部屬性，升級 Starlette 不會改變略過的行為。
+    """
+
+    def __init__(self, send: Send, minimum_size: int, compresslevel: int):
+        self.send = send
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.start_message: Optional[Message] = None
+        # None：尚未決定；False：原樣轉送；True：壓縮
+        self.compress: Optional[bool] = None
+        self.started = False
+        self.buffer = io.BytesIO()
+        self.gzip_file: Optional[gzip.GzipFile] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.compress = not (
+                "content-encoding" in headers
+                or content_type.startswith(UNCOMPRESSED_CONTENT_TYPES)
+            )
+            if not self.compress:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or not self.compress:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if len(body) < self.minimum_size and not more_body:
+                # 內容太小，不壓縮
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.gzip_file = gzip.GzipFile(mode="wb", fileobj=self.buffer, compresslevel=self.compresslevel)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                # 串流回應：長度未知
+                del headers["Content-Length"]
+            else:
+                compressed = self._compress(body, finish=True)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(self.start_message)
+
+        compressed = self._compress(body, finish=not more_body)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _compress(self, body: bytes, finish: bool) -> bytes:
+        self.gzip_file.write(body)
+        if finish:
+            self.gzip_file.close()
+        else:
+            self.gzip_file.flush()
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+class SelectiveGZipMiddleware:
+    """
+    GZip 壓縮中介軟體
+
+    與 Starlette 的 GZipMiddleware 相同（用戶端支援 gzip 且內容達 minimum_size 時壓縮），
+    但略過 PDF、圖片等已壓縮的檔案和 Server-Sent Events 串流（串流壓縮會把事件留在緩衝區內）。
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            send = _GZipResponder(send, self.minimum_size, self.compresslevel)
+        await self.app(scope, receive, send)
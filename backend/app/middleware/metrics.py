@@ -0,0 +1,51 @@
+"""
+HTTP 請求指標中介軟體
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+# 不記錄的路徑（指標本身與健康檢查）
+EXCLUDED_PATHS = ("/metrics", "/health", "/health/live", "/health/ready")
+
+
+class MetricsMiddleware:
+    """
+    依路由樣板（如 /applications/{application_id}）記錄請求耗時
+
+    以路由樣板而非實際路徑作為標籤，避免申請表 ID 造成標籤數量無限增長；
+    沒有對應路由的請求（404）統一記為 "unmatched"。
+    串流回應（SSE、PDF）的耗時計算到最後一個 body 片段送出為止。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.labels(method).dec()
+            # FastAPI 比對路由後會將路由物件放入 scope（同一個 dict）
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, route_path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
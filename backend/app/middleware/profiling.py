@@ -0,0 +1,91 @@
+"""
+請求剖析中介軟體
+"""
+import hmac
+import random
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..utils.log import request_id_var
+from ..utils.profiling import RequestProfile, current_profile, profile_store
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# 不剖析的路徑（剖析結果下載、指標與健康檢查）
+EXCLUDED_PREFIXES = ("/profiles", "/metrics", "/health")
+
+
+class ProfilingMiddleware:
+    """
+    依需求剖析單一請求（預設關閉）
+
+    - 請求帶有 X-Profile: <PROFILING_SECRET> 時剖析該請求
+    - PROFILING_SAMPLE_RATE > 0 時依比例隨機剖析
+
+    剖析結果的 ID 會放在回應標頭 X-Profile-Id，可透過 /profiles/{id} 下載。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _trigger(self, scope: Scope) -> str:
+        """返回剖析原因（header / sample），不剖析時返回空字串"""
+        if scope["path"].startswith(EXCLUDED_PREFIXES):
+            return ""
+
+        secret = settings.PROFILING_SECRET
+        if secret:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    if hmac.compare_digest(value, secret.encode("utf-8")):
+                        return "header"
+                    break
+
+        rate = settings.PROFILING_SAMPLE_RATE
+        if rate > 0 and random.random() < rate:
+            return "sample"
+        return ""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if not trigger:
+            await self.app(scope, receive, send)
+            return
+
+        # 只在實際剖析時載入 pyinstrument
+        from pyinstrument import Profiler
+
+        profile = RequestProfile(
+            id=profile_store.new_id(),
+            method=scope["method"],
+            path=scope["path"],
+            query=scope.get("query_string", b"").decode("latin-1"),
+            request_id=request_id_var.get(),
+            trigger=trigger,
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile.id
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled")
+        token = current_profile.set(profile)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            current_profile.reset(token)
+            profile.duration_ms = round(profile.elapsed_ms(), 3)
+            profile.session = profiler.last_session
+            profile.cpu_ms = round(profile.session.cpu_time * 1000, 3)
+            profile_store.add(profile)
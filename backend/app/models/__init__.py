@@ -15,6 +15,7 @@ from .application import (
     PlanItem,
     Signature,
 )
+from .pdf_job import PdfJob, PdfJobStatus, PdfJobResponse, RenderPriority
 
 __all__ = [
     # Base
@@ -40,4 +41,9 @@ __all__ = [
     "Member",
     "PlanItem",
     "Signature",
+    # PDF export job
+    "PdfJob",
+    "PdfJobStatus",
+    "PdfJobResponse",
+    "RenderPriority",
 ]
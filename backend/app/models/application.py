@@ -1,10 +1,13 @@
 """
 申請表資料模型 - 使用 Beanie ODM
 """
+from datetime import datetime
 from typing import List, Optional, Dict
 from enum import Enum
+from beanie import PydanticObjectId
 from pydantic import BaseModel, Field, field_validator
-from .base import Document, TimestampMixin
+from .base import Document, TimestampMixin, RevisionMixin
+from ..config import settings
 
 
 class ApplicationStatus(str, Enum):
@@ -49,7 +52,16 @@ class Signature(BaseModel):
     image_url: Optional[str] = Field(default=None, description="簽章圖片 URL 或 base64")
 
 
-class Application(Document, TimestampMixin):
+def _normalize_legacy_status(v: str) -> str:
+    """向後兼容：將舊的「透過」/「未透過」轉換為新的「通過」/「未通過」"""
+    if v == "透過":
+        return "通過"
+    if v == "未透過":
+        return "未通過"
+    return v
+
+
+class Application(Document, TimestampMixin, RevisionMixin):
     """自主學習申請表模型"""
 
     # 基本資訊
@@ -111,12 +123,7 @@ class Application(Document, TimestampMixin):
     @field_validator("status", mode="before")
     @classmethod
     def normalize_status(cls, v: str) -> str:
-        # 向後兼容：將舊的 "透過"/"未透過" 轉換為新的 "通過"/"未通過"
-        if v == "透過":
-            return "通過"
-        if v == "未透過":
-            return "未通過"
-        return v
+        return _normalize_legacy_status(v)
 
     class Settings:
         name = "applications"  # MongoDB 集合名稱
@@ -124,6 +131,7 @@ class Application(Document, TimestampMixin):
             "submitter_id",  # 提交者索引
             "submitter_student_id",  # 提交者學號索引
             "status",  # 狀態索引
+            "updated_at",  # 更新時間索引（申請表事件輪詢）
         ]
 
     class Config:
@@ -159,6 +167,64 @@ class Application(Document, TimestampMixin):
         }
 
 
+class ApplicationSummary(BaseModel):
+    """申請表摘要投影（列表用，不載入組員、簽章等大型欄位）"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    apply_date_start: str
+    apply_date_end: str
+    status: ApplicationStatus
+    comment: Optional[str] = ""
+    submitter_id: str
+    submitter_student_id: str
+    revision: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def normalize_status(cls, v: str) -> str:
+        return _normalize_legacy_status(v)
+
+
+class ApplicationVersion(BaseModel):
+    """申請表版本投影（用於 ETag 與權限檢查）"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    submitter_id: str
+    revision: int = 0
+    updated_at: datetime
+
+
+class ApplicationExportRow(BaseModel):
+    """申請表匯出投影（不載入簽章、參考資料等匯出不需要的欄位）"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    status: ApplicationStatus
+    members: List[Member] = []
+    motivation: str = ""
+    learning_categories: Dict[str, bool] = {}
+    learning_category_other: Optional[str] = ""
+    expected_outcome: Optional[str] = ""
+    env_needs: Dict[str, bool] = {}
+    env_other: Optional[str] = ""
+    plan_items: List[PlanItem] = []
+    presentation_formats: Optional[Dict[str, bool]] = None
+    presentation_other: Optional[str] = ""
+    phone_agreement: Optional[str] = ""
+    comment: Optional[str] = ""
+    submitter_student_id: str
+    created_at: datetime
+    updated_at: datetime
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def normalize_status(cls, v: str) -> str:
+        return _normalize_legacy_status(v)
+
+
 class ApplicationCreate(BaseModel):
     """建立申請表請求模型"""
 
@@ -207,6 +273,7 @@ class ApplicationUpdate(BaseModel):
     signatures: Optional[List[Signature]] = None
     status: Optional[ApplicationStatus] = None
     comment: Optional[str] = None
+    revision: Optional[int] = Field(default=None, description="預期版本號（提供時用於偵測並行修改）")
 
 
 class ApplicationResponse(BaseModel):
@@ -236,9 +303,51 @@ class ApplicationResponse(BaseModel):
     comment: str
     submitter_id: str
     submitter_student_id: str
+    revision: int = 0
     created_at: str
     updated_at: str
 
+    @classmethod
+    def from_application(cls, application: Application) -> "ApplicationResponse":
+        """
+        由申請表文件建立響應模型
+
+        Args:
+            application: 申請表文件
+
+        Returns:
+            ApplicationResponse: 響應模型
+        """
+        return cls(
+            id=str(application.id),
+            title=application.title,
+            apply_date_start=application.apply_date_start,
+            apply_date_end=application.apply_date_end,
+            status=application.status,
+            members=application.members,
+            motivation=application.motivation,
+            learning_categories=application.learning_categories,
+            learning_category_other=application.learning_category_other or "",
+            references=application.references or [],
+            expected_outcome=application.expected_outcome or "",
+            equipment_needs=application.equipment_needs or "",
+            env_needs=application.env_needs,
+            env_other=application.env_other or "",
+            plan_items=application.plan_items,
+            midterm_goal=application.midterm_goal or "",
+            final_goal=application.final_goal or "",
+            presentation_formats=application.presentation_formats or {},
+            presentation_other=application.presentation_other or "",
+            phone_agreement=application.phone_agreement or "",
+            signatures=application.signatures,
+            comment=application.comment or "",
+            submitter_id=application.submitter_id,
+            submitter_student_id=application.submitter_student_id,
+            revision=application.revision,
+            created_at=application.created_at.isoformat(),
+            updated_at=application.updated_at.isoformat(),
+        )
+
 
 class ApplicationListResponse(BaseModel):
     """申請表列表響應模型"""
@@ -252,3 +361,32 @@ class ApplicationListResponse(BaseModel):
     submitter_student_id: str
     created_at: str
     updated_at: str
+    # 第一頁縮圖網址（只在啟用預先生成時提供；含版本號，內容變更後網址隨之改變）
+    thumbnail_url: Optional[str] = None
+
+    @classmethod
+    def from_application(cls, application: Application | ApplicationSummary) -> "ApplicationListResponse":
+        """
+        由申請表文件或摘要投影建立列表響應模型
+
+        Args:
+            application: 申請表文件或摘要投影
+
+        Returns:
+            ApplicationListResponse: 列表響應模型
+        """
+        return cls(
+            id=str(application.id),
+            title=application.title,
+            apply_date_start=application.apply_date_start,
+            apply_date_end=application.apply_date_end,
+            status=application.status,
+            comment=application.comment or "",
+            submitter_student_id=application.submitter_student_id,
+            created_at=application.created_at.isoformat(),
+            updated_at=application.updated_at.isoformat(),
+            thumbnail_url=(
+                f"/applications/{application.id}/thumbnail?revision={application.revision}"
+                if settings.PDF_PRERENDER_ENABLED else None
+            ),
+        )
@@ -2,7 +2,7 @@
 基礎資料模型 - 使用 Beanie ODM
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from beanie import Document
 from pydantic import Field
 
@@ -13,5 +13,39 @@ class TimestampMixin:
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class RevisionMixin:
+    """版本號混入類（樂觀鎖，每次寫入遞增）"""
+    revision: int = Field(default=0, description="文件版本號")
+
+
+class RevisionConflictError(ValueError):
+    """文件已被其他請求修改（版本號不符）"""
+
+
+def revision_filter(expected_revision: Optional[int]) -> Dict[str, Any]:
+    """
+    產生樂觀鎖的版本號篩選條件
+
+    舊資料沒有 revision 欄位，視同版本 0。
+
+    Args:
+        expected_revision: 預期版本號，None 表示不檢查
+
+    Returns:
+        Dict: 附加到查詢的篩選條件
+    """
+    if expected_revision is None:
+        return {}
+    if expected_revision == 0:
+        return {"revision": {"$in": [0, None]}}
+    return {"revision": expected_revision}
+
+
 # 匯出 Document 供其他模型使用
-__all__ = ["Document", "TimestampMixin"]
+__all__ = [
+    "Document",
+    "TimestampMixin",
+    "RevisionMixin",
+    "RevisionConflictError",
+    "revision_filter",
+]
@@ -1,12 +1,12 @@
 """
 草稿資料模型 - 用於儲存學生填寫中的申請表進度
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field
-from .base import Document, TimestampMixin
+from .base import Document, TimestampMixin, RevisionMixin
 
 
-class Draft(Document, TimestampMixin):
+class Draft(Document, TimestampMixin, RevisionMixin):
     """草稿模型 - 儲存申請表填寫進度"""
 
     # 提交者資訊
@@ -16,6 +16,10 @@ class Draft(Document, TimestampMixin):
     # 表單資料 (儲存為 JSON 格式)
     form_data: Dict[str, Any] = Field(default={}, description="表單資料")
 
+    # 最後一次寫入內容的雜湊（用於略過重複的自動儲存）
+    content_hash: Optional[str] = Field(default=None, description="form_data 的雜湊值（增量儲存後為 None）")
+    patch_hash: Optional[str] = Field(default=None, description="最後一次增量操作的雜湊值（完整儲存後為 None）")
+
     class Settings:
         name = "drafts"  # MongoDB 集合名稱
         indexes = [
@@ -34,11 +38,33 @@ class DraftUpdate(BaseModel):
     form_data: Dict[str, Any]
 
 
+class DraftPatchOperation(BaseModel):
+    """草稿增量操作（JSON Patch 子集）"""
+    op: Literal["add", "replace", "remove"] = Field(..., description="操作型別")
+    path: str = Field(..., description="JSON Pointer 路徑，例如 /members/0/student_name")
+    value: Any = Field(default=None, description="新值（remove 時忽略）")
+
+
+class DraftPatch(BaseModel):
+    """草稿增量更新請求模型"""
+    operations: List[DraftPatchOperation] = Field(..., description="增量操作列表")
+
+
 class DraftResponse(BaseModel):
     """草稿響應模型"""
     id: str
     submitter_id: str
     submitter_student_id: str
     form_data: Dict[str, Any]
+    revision: int = 0
+    content_hash: Optional[str] = None
     created_at: str
     updated_at: str
+
+
+class DraftPatchResponse(BaseModel):
+    """草稿增量更新響應模型（不回傳 form_data）"""
+    revision: int
+    patch_hash: str = Field(..., description="本次增量操作的雜湊值")
+    updated_at: str
+    skipped: bool = Field(default=False, description="內容未變更而略過寫入")
@@ -0,0 +1,90 @@
+"""
+PDF 匯出工作資料模型 - 非同步生成 PDF 的工作狀態
+"""
+from datetime import datetime
+from enum import Enum, IntEnum
+from pathlib import Path
+from typing import Optional
+from pydantic import BaseModel, Field
+from .base import Document, TimestampMixin
+from ..config import settings
+from ..utils.download_links import sign_download
+
+
+class PdfJobStatus(str, Enum):
+    """PDF 匯出工作狀態"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class RenderPriority(IntEnum):
+    """PDF 生成優先順序（數字越小越優先）"""
+    INTERACTIVE = 0  # 使用者等待下載
+    NOTIFICATION = 1  # 審核通知郵件附件
+    BULK = 2  # 批次匯出與預先生成
+
+
+class PdfJob(Document, TimestampMixin):
+    """PDF 匯出工作"""
+
+    application_id: str = Field(..., description="申請表ID")
+    requested_by: str = Field(..., description="建立工作的使用者ID")
+    status: PdfJobStatus = Field(default=PdfJobStatus.QUEUED, description="工作狀態")
+    priority: RenderPriority = Field(default=RenderPriority.INTERACTIVE, description="生成優先順序")
+
+    attempts: int = Field(default=0, description="已執行次數")
+    error: Optional[str] = Field(default=None, description="失敗原因")
+    result_path: Optional[str] = Field(default=None, description="生成的 PDF 路徑")
+    filename: Optional[str] = Field(default=None, description="下載檔名")
+
+    started_at: Optional[datetime] = Field(default=None, description="開始執行時間")
+    finished_at: Optional[datetime] = Field(default=None, description="完成時間")
+    # 執行中的工作超過此時間仍未完成，視為執行的行程已終止，可由其他 worker 重新執行
+    lease_expires_at: Optional[datetime] = Field(default=None, description="執行租約到期時間")
+
+    class Settings:
+        name = "pdf_jobs"  # MongoDB 集合名稱
+        indexes = [
+            [("status", 1), ("priority", 1), ("created_at", 1)],
+            "requested_by",
+        ]
+
+
+class PdfJobResponse(BaseModel):
+    """PDF 匯出工作響應模型"""
+    job_id: str
+    application_id: str
+    status: PdfJobStatus
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    status_url: str
+    result_url: Optional[str] = Field(default=None, description="完成後的下載網址")
+    download_url: Optional[str] = Field(
+        default=None, description="完成後的簽章下載網址（不需登入，DOWNLOAD_URL_TTL_SECONDS 內有效）"
+    )
+
+    @classmethod
+    def from_job(cls, job: PdfJob) -> "PdfJobResponse":
+        job_id = str(job.id)
+        done = job.status == PdfJobStatus.DONE
+        download_url = None
+        if done and job.result_path:
+            download_url, _ = sign_download(
+                "pdf-jobs", Path(job.result_path).name, job.filename, settings.DOWNLOAD_URL_TTL_SECONDS
+            )
+        return cls(
+            job_id=job_id,
+            application_id=job.application_id,
+            status=job.status,
+            error=job.error,
+            created_at=job.created_at.isoformat(),
+            started_at=job.started_at.isoformat() if job.started_at else None,
+            finished_at=job.finished_at.isoformat() if job.finished_at else None,
+            status_url=f"/pdf-jobs/{job_id}",
+            result_url=f"/pdf-jobs/{job_id}/result" if done else None,
+            download_url=download_url,
+        )
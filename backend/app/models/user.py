@@ -4,7 +4,7 @@
 from typing import Optional
 from enum import Enum
 from pydantic import BaseModel, Field, EmailStr
-from .base import Document, TimestampMixin
+from .base import Document, TimestampMixin, RevisionMixin
 
 
 class UserRole(str, Enum):
@@ -13,7 +13,7 @@ class UserRole(str, Enum):
     TEACHER = "teacher"
 
 
-class User(Document, TimestampMixin):
+class User(Document, TimestampMixin, RevisionMixin):
     """使用者基礎模型"""
 
     username: str = Field(..., description="使用者名稱/賬號")
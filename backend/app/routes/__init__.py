@@ -6,6 +6,10 @@ from .applications import router as applications_router
 from .students import router as students_router
 from .drafts import router as drafts_router
 from .settings import router as settings_router
+from .profiles import router as profiles_router
+from .health import router as health_router
+from .pdf_jobs import router as pdf_jobs_router
+from .downloads import router as downloads_router
 
 __all__ = [
     "auth_router",
@@ -13,4 +17,8 @@ __all__ = [
     "students_router",
     "drafts_router",
     "settings_router",
+    "profiles_router",
+    "health_router",
+    "pdf_jobs_router",
+    "downloads_router",
 ]
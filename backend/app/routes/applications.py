@@ -1,23 +1,43 @@
 """
 申请表相关路由 - 使用 Beanie ODM
 """
+import asyncio
+import json
+import logging
+from datetime import date, datetime
 from typing import List, Optional
-from pathlib import Path
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from ..models.application import (
+    Application,
     ApplicationCreate,
     ApplicationUpdate,
     ApplicationResponse,
     ApplicationListResponse,
     ApplicationStatus,
 )
+from ..models.base import RevisionConflictError
+from ..models.pdf_job import PdfJobResponse, RenderPriority
 from ..models.user import User
 from ..services.application_service import ApplicationService
 from ..services.pdf_service import PDFService
+from ..services.pdf_job_service import PdfJobService
+from ..services.artifact_cache import artifact_cache
+from ..services.export_service import ApplicationExportService
 from ..services.email_service import EmailService
-from ..dependencies import get_current_user, get_current_teacher
+from ..services.draft_buffer import draft_write_buffer
+from ..services.application_events import application_event_hub, ALL_SUBMITTERS
+from ..config import settings
+from ..dependencies import get_current_user, get_current_teacher, get_current_user_for_stream
+from ..utils.auth import create_events_token
+from ..utils.download_links import sign_download
+from ..utils.http_cache import make_weak_etag, etag_matches, set_cache_headers, not_modified
+from ..utils.metrics import BACKGROUND_TASKS_PENDING
+from .pdf_jobs import get_pdf_job_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/applications", tags=["申请表"])
 
@@ -27,9 +47,27 @@ def get_application_service() -> ApplicationService:
     return ApplicationService()
 
 
+def schedule_pdf_prerender(background_tasks: BackgroundTasks, application: Application) -> None:
+    """启用预先生成时，在后台以低优先顺序生成 PDF 并存入快取"""
+    if not settings.PDF_PRERENDER_ENABLED:
+        return
+
+    async def prerender_pdf():
+        try:
+            await PDFService.prerender(application)
+        except Exception:
+            logger.exception("预先生成 PDF 失败 (application_id=%s)", application.id)
+        finally:
+            BACKGROUND_TASKS_PENDING.labels("pdf_prerender").dec()
+
+    BACKGROUND_TASKS_PENDING.labels("pdf_prerender").inc()
+    background_tasks.add_task(prerender_pdf)
+
+
 @router.post("/", response_model=ApplicationResponse, summary="创建申请表")
 async def create_application(
     application_data: ApplicationCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     application_service: ApplicationService = Depends(get_application_service)
 ):
@@ -38,46 +76,24 @@ async def create_application(
 
     学生登录后可以创建申请表
     """
+    # 提交前先寫入緩衝中的草稿
+    await draft_write_buffer.release(str(current_user.id))
+
     # 创建申请表
     application = await application_service.create_application(
         application_data=application_data,
         submitter_id=str(current_user.id),
         submitter_student_id=current_user.student_id or current_user.username
     )
+    schedule_pdf_prerender(background_tasks, application)
 
-    # 转换为响应模型
-    return ApplicationResponse(
-        id=str(application.id),
-        title=application.title,
-        apply_date_start=application.apply_date_start,
-        apply_date_end=application.apply_date_end,
-        status=application.status,
-        members=application.members,
-        motivation=application.motivation,
-        learning_categories=application.learning_categories,
-        learning_category_other=application.learning_category_other or "",
-        references=application.references or [],
-        expected_outcome=application.expected_outcome or "",
-        equipment_needs=application.equipment_needs or "",
-        env_needs=application.env_needs,
-        env_other=application.env_other or "",
-        plan_items=application.plan_items,
-        midterm_goal=application.midterm_goal or "",
-        final_goal=application.final_goal or "",
-        presentation_formats=application.presentation_formats or {},
-        presentation_other=application.presentation_other or "",
-        phone_agreement=application.phone_agreement or "",
-        signatures=application.signatures,
-        comment=application.comment or "",
-        submitter_id=application.submitter_id,
-        submitter_student_id=application.submitter_student_id,
-        created_at=application.created_at.isoformat(),
-        updated_at=application.updated_at.isoformat(),
-    )
+    return ApplicationResponse.from_application(application)
 
 
 @router.get("/", response_model=List[ApplicationListResponse], summary="获取申请表列表")
 async def get_applications(
+    request: Request,
+    response: Response,
     status: Optional[ApplicationStatus] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -89,41 +105,149 @@ async def get_applications(
 
     - 学生：返回自己的申请表
     - 教师：返回所有申请表
+    - 支援 If-None-Match：列表未变更时返回 304
     """
-    if current_user.role == "teacher":
+    is_teacher = current_user.role == "teacher"
+    submitter_id = None if is_teacher else str(current_user.id)
+    status_filter = status if is_teacher else None
+
+    # 列表版本計數器 + 查詢參數組成 ETag
+    version = await application_service.get_list_version(submitter_id=submitter_id)
+    etag = make_weak_etag("list", submitter_id, status_filter, skip, limit, version)
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return not_modified(etag)
+
+    if is_teacher:
         # 教师可以查看所有申请表
         applications = await application_service.get_all_applications(
             status=status,
             skip=skip,
-            limit=limit
+            limit=limit,
+            summary=True
         )
     else:
         # 学生只能查看自己的申请表
         applications = await application_service.get_applications_by_user(
             submitter_id=str(current_user.id),
             skip=skip,
-            limit=limit
+            limit=limit,
+            summary=True
         )
 
-    return [
-        ApplicationListResponse(
-            id=str(app.id),
-            title=app.title,
-            apply_date_start=app.apply_date_start,
-            apply_date_end=app.apply_date_end,
-            status=app.status,
-            comment=app.comment,
-            submitter_student_id=app.submitter_student_id,
-            created_at=app.created_at.isoformat(),
-            updated_at=app.updated_at.isoformat(),
+    set_cache_headers(response, etag)
+    return [ApplicationListResponse.from_application(app) for app in applications]
+
+
+class EventsTokenResponse(BaseModel):
+    """事件串流 token 响应模型"""
+    token: str
+    expires_in: int
+
+
+@router.post("/events/token", response_model=EventsTokenResponse, summary="获取事件串流 token")
+async def create_application_events_token(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    获取订阅申请表事件用的短效 token
+
+    EventSource 只能以 ?access_token= 传递 token，网址会出现在存取日志中，
+    因此不使用登入 token。token 只在建立连线时检查，重新连线前需重新获取。
+    """
+    return EventsTokenResponse(
+        token=create_events_token(str(current_user.id)),
+        expires_in=settings.SSE_TOKEN_EXPIRE_SECONDS,
+    )
+
+
+@router.get("/events", summary="订阅申请表状态变更（Server-Sent Events）")
+async def stream_application_events(
+    request: Request,
+    current_user: User = Depends(get_current_user_for_stream)
+):
+    """
+    以 Server-Sent Events 推送申请表审核状态与评语的变更
+
+    - 学生：只收到自己提交的申请表事件
+    - 教师：收到所有申请表事件
+    - EventSource 无法设定标头，可改用 ?access_token= 传递 POST /applications/events/token
+      获取的短效 token（不接受登入 token）
+    """
+    subscription_key = ALL_SUBMITTERS if current_user.role == "teacher" else str(current_user.id)
+    queue = application_event_hub.subscribe(subscription_key)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # 心跳，避免代理伺服器因閒置而中斷連線
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.dumps(event, ensure_ascii=False)
+                yield f"event: {event['type']}\nid: {event['id']}:{event['revision']}\ndata: {data}\n\n"
+        finally:
+            application_event_hub.unsubscribe(subscription_key, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 關閉 nginx 緩衝，事件立即送出
+        },
+    )
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@router.get("/export/xlsx", summary="匯出申請表為 Excel（教師）")
+async def export_applications_xlsx(
+    status_filter: Optional[ApplicationStatus] = Query(None, alias="status", description="審核狀態"),
+    student_class: Optional[str] = Query(None, description="班級（任一組員）"),
+    created_from: Optional[date] = Query(None, description="建立日期起（含）"),
+    created_to: Optional[date] = Query(None, description="建立日期迄（含）"),
+    current_teacher: User = Depends(get_current_teacher)
+):
+    """
+    將符合條件的申請表匯出為 XLSX（不含簽章）
+
+    - 僅限教師
+    - 逐批讀取並寫入，匯出全校申請表也不會一次載入記憶體
+    """
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="建立日期起不可晚於建立日期迄"
         )
-        for app in applications
-    ]
+
+    export_service = ApplicationExportService()
+    query = export_service.build_filter(status_filter, student_class, created_from, created_to)
+    path = await export_service.export_xlsx(query)
+
+    from urllib.parse import quote
+    filename = f"申請表匯出_{datetime.now().strftime('%Y%m%d%H%M')}.xlsx"
+    return FileResponse(
+        path=path,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+            "Cache-Control": "private, no-store",
+        },
+        background=BackgroundTask(path.unlink, missing_ok=True),
+    )
 
 
 @router.get("/{application_id}", response_model=ApplicationResponse, summary="获取申请表详情")
 async def get_application(
     application_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     application_service: ApplicationService = Depends(get_application_service)
 ):
@@ -132,7 +256,19 @@ async def get_application(
 
     - 学生：只能查看自己的申请表
     - 教师：可以查看所有申请表
+    - 支援 If-None-Match：申请表未变更时返回 304
     """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        # 只讀取版本資訊，符合時不需載入整份申請表
+        version = await application_service.get_application_version(application_id)
+        if version and (
+            current_user.role != "student" or version.submitter_id == str(current_user.id)
+        ):
+            etag = make_weak_etag(version.id, version.revision, version.updated_at.isoformat())
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
     application = await application_service.get_application_by_id(application_id)
 
     if not application:
@@ -148,40 +284,18 @@ async def get_application(
             detail="无权查看此申请表"
         )
 
-    return ApplicationResponse(
-        id=str(application.id),
-        title=application.title,
-        apply_date_start=application.apply_date_start,
-        apply_date_end=application.apply_date_end,
-        status=application.status,
-        members=application.members,
-        motivation=application.motivation,
-        learning_categories=application.learning_categories,
-        learning_category_other=application.learning_category_other or "",
-        references=application.references or [],
-        expected_outcome=application.expected_outcome or "",
-        equipment_needs=application.equipment_needs or "",
-        env_needs=application.env_needs,
-        env_other=application.env_other or "",
-        plan_items=application.plan_items,
-        midterm_goal=application.midterm_goal or "",
-        final_goal=application.final_goal or "",
-        presentation_formats=application.presentation_formats or {},
-        presentation_other=application.presentation_other or "",
-        phone_agreement=application.phone_agreement or "",
-        signatures=application.signatures,
-        comment=application.comment or "",
-        submitter_id=application.submitter_id,
-        submitter_student_id=application.submitter_student_id,
-        created_at=application.created_at.isoformat(),
-        updated_at=application.updated_at.isoformat(),
+    set_cache_headers(
+        response,
+        make_weak_etag(application.id, application.revision, application.updated_at.isoformat())
     )
+    return ApplicationResponse.from_application(application)
 
 
 @router.put("/{application_id}", response_model=ApplicationResponse, summary="更新申请表")
 async def update_application(
     application_id: str,
     application_data: ApplicationUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     application_service: ApplicationService = Depends(get_application_service)
 ):
@@ -191,74 +305,44 @@ async def update_application(
     学生只能更新自己的申请表
     更新後狀態會自動重設為「審核中」
     """
-    # 获取申请表
-    application = await application_service.get_application_by_id(application_id)
+    # 學生編輯時，強制將狀態重設為「審核中」
+    if current_user.role == "student":
+        application_data.status = ApplicationStatus.PENDING
+        application_data.comment = ""  # 清除之前的評語
 
-    if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="申请表不存在"
+    # 更新申请表（权限检查在同一次更新的筛选条件中）
+    try:
+        updated_application = await application_service.update_application(
+            application_id=application_id,
+            update_data=application_data,
+            user_id=str(current_user.id)
         )
-
-    # 权限检查
-    if application.submitter_id != str(current_user.id):
+    except PermissionError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="无权修改此申请表"
         )
-
-    # 學生編輯時，強制將狀態重設為「審核中」
-    if current_user.role == "student":
-        application_data.status = ApplicationStatus.PENDING
-        application_data.comment = ""  # 清除之前的評語
-
-    # 更新申请表
-    updated_application = await application_service.update_application(
-        application_id=application_id,
-        update_data=application_data,
-        user_id=str(current_user.id)
-    )
+    except RevisionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
 
     if not updated_application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="更新失败"
+            detail="申请表不存在"
         )
+    schedule_pdf_prerender(background_tasks, updated_application)
 
-    return ApplicationResponse(
-        id=str(updated_application.id),
-        title=updated_application.title,
-        apply_date_start=updated_application.apply_date_start,
-        apply_date_end=updated_application.apply_date_end,
-        status=updated_application.status,
-        members=updated_application.members,
-        motivation=updated_application.motivation,
-        learning_categories=updated_application.learning_categories,
-        learning_category_other=updated_application.learning_category_other or "",
-        references=updated_application.references or [],
-        expected_outcome=updated_application.expected_outcome or "",
-        equipment_needs=updated_application.equipment_needs or "",
-        env_needs=updated_application.env_needs,
-        env_other=updated_application.env_other or "",
-        plan_items=updated_application.plan_items,
-        midterm_goal=updated_application.midterm_goal or "",
-        final_goal=updated_application.final_goal or "",
-        presentation_formats=updated_application.presentation_formats or {},
-        presentation_other=updated_application.presentation_other or "",
-        phone_agreement=updated_application.phone_agreement or "",
-        signatures=updated_application.signatures,
-        comment=updated_application.comment or "",
-        submitter_id=updated_application.submitter_id,
-        submitter_student_id=updated_application.submitter_student_id,
-        created_at=updated_application.created_at.isoformat(),
-        updated_at=updated_application.updated_at.isoformat(),
-    )
+    return ApplicationResponse.from_application(updated_application)
 
 
 class ReviewRequest(BaseModel):
     """审核请求模型"""
     status: str
     comment: Optional[str] = None
+    revision: Optional[int] = None
 
 
 @router.patch("/{application_id}/review", response_model=ApplicationResponse, summary="审核申请表")
@@ -293,12 +377,19 @@ async def review_application(
         )
 
     # 更新申请表状态
-    updated_application = await application_service.update_application_status(
-        application_id=application_id,
-        status=status_enum,
-        reviewer_id=str(current_teacher.id),
-        comment=review_data.comment
-    )
+    try:
+        updated_application = await application_service.update_application_status(
+            application_id=application_id,
+            status=status_enum,
+            reviewer_id=str(current_teacher.id),
+            comment=review_data.comment,
+            expected_revision=review_data.revision
+        )
+    except RevisionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
 
     if not updated_application:
         raise HTTPException(
@@ -330,8 +421,28 @@ async def review_application(
             # 异步生成 PDF 并发送邮件
             async def send_email_with_pdf():
                 try:
-                    # 生成 PDF
-                    pdf_path = await PDFService.generate_pdf(updated_application)
+                    if settings.EMAIL_PDF_AS_LINK and settings.PUBLIC_API_URL:
+                        # 邮件只含签章下载链接，PDF 由 nginx 从快取目录传送
+                        pdf_key = await PDFService.publish_pdf(updated_application, RenderPriority.NOTIFICATION)
+                        download_url, _ = sign_download(
+                            "artifacts",
+                            pdf_key,
+                            PDFService.download_filename(updated_application),
+                            settings.EMAIL_DOWNLOAD_URL_TTL_SECONDS,
+                        )
+                        await EmailService.send_review_notification(
+                            recipient_email=submitter.username,  # 用户名即为 Email
+                            student_name=student_name,
+                            application_title=updated_application.title,
+                            status=status_text,
+                            comment=review_data.comment,
+                            download_url=settings.PUBLIC_API_URL.rstrip("/") + download_url,
+                            download_ttl_seconds=settings.EMAIL_DOWNLOAD_URL_TTL_SECONDS,
+                        )
+                        return
+
+                    # 生成 PDF（优先顺序低于使用者等待中的汇出）
+                    pdf_path = await PDFService.generate_pdf(updated_application, RenderPriority.NOTIFICATION)
 
                     # 发送邮件
                     await EmailService.send_review_notification(
@@ -347,42 +458,20 @@ async def review_application(
                     if pdf_path.exists():
                         pdf_path.unlink()
 
-                except Exception as e:
-                    print(f"发送邮件通知失败: {e}")
-                    import traceback
-                    traceback.print_exc()
+                except Exception:
+                    logger.exception("发送邮件通知失败 (application_id=%s)", application_id)
+                finally:
+                    BACKGROUND_TASKS_PENDING.labels("review_notification").dec()
 
             # 添加到后台任务
+            BACKGROUND_TASKS_PENDING.labels("review_notification").inc()
             background_tasks.add_task(send_email_with_pdf)
 
-    return ApplicationResponse(
-        id=str(updated_application.id),
-        title=updated_application.title,
-        apply_date_start=updated_application.apply_date_start,
-        apply_date_end=updated_application.apply_date_end,
-        status=updated_application.status,
-        members=updated_application.members,
-        motivation=updated_application.motivation,
-        learning_categories=updated_application.learning_categories,
-        learning_category_other=updated_application.learning_category_other or "",
-        references=updated_application.references or [],
-        expected_outcome=updated_application.expected_outcome or "",
-        equipment_needs=updated_application.equipment_needs or "",
-        env_needs=updated_application.env_needs,
-        env_other=updated_application.env_other or "",
-        plan_items=updated_application.plan_items,
-        midterm_goal=updated_application.midterm_goal or "",
-        final_goal=updated_application.final_goal or "",
-        presentation_formats=updated_application.presentation_formats or {},
-        presentation_other=updated_application.presentation_other or "",
-        phone_agreement=updated_application.phone_agreement or "",
-        signatures=updated_application.signatures,
-        comment=updated_application.comment or "",
-        submitter_id=updated_application.submitter_id,
-        submitter_student_id=updated_application.submitter_student_id,
-        created_at=updated_application.created_at.isoformat(),
-        updated_at=updated_application.updated_at.isoformat(),
-    )
+    # 审核通过后预先生成（若通知邮件正在生成同一版本，会共用该次生成）
+    if status_enum == ApplicationStatus.PASSED:
+        schedule_pdf_prerender(background_tasks, updated_application)
+
+    return ApplicationResponse.from_application(updated_application)
 
 
 @router.delete("/{application_id}", summary="删除申请表")
@@ -419,10 +508,164 @@ async def delete_application(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="删除失败"
         )
+    try:
+        await asyncio.to_thread(artifact_cache.delete, application_id)
+    except Exception as e:
+        # 未刪除的檔案依 ARTIFACT_TTL_DAYS 過期
+        logger.warning("刪除申请表的生成结果失败 (application_id=%s): %s", application_id, e)
 
     return {"message": "申请表已删除"}
 
 
+@router.post(
+    "/{application_id}/export-pdf/jobs",
+    response_model=PdfJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="建立 PDF 匯出工作",
+)
+async def create_pdf_export_job(
+    application_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    application_service: ApplicationService = Depends(get_application_service),
+    pdf_job_service: PdfJobService = Depends(get_pdf_job_service)
+):
+    """
+    建立非同步 PDF 匯出工作
+
+    - 立即返回 202 與工作 ID，PDF 在背景生成（不受 nginx 60 秒逾時限制）
+    - 以 status_url（GET /pdf-jobs/{job_id}）查詢狀態，完成後從 result_url 下載
+    - 權限與同步匯出相同：學生只能匯出自己的，教師可以匯出所有
+    """
+    application = await application_service.get_application_by_id(application_id)
+
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="申请表不存在"
+        )
+
+    if current_user.role == "student" and application.submitter_id != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="無權導出此申請表"
+        )
+
+    job = await pdf_job_service.create_job(application, str(current_user.id))
+    result = PdfJobResponse.from_job(job)
+    response.headers["Location"] = result.status_url
+    return result
+
+
+class DownloadLinkResponse(BaseModel):
+    """簽章下載網址響應模型"""
+    download_url: str
+    expires_at: int
+
+
+@router.get(
+    "/{application_id}/export-pdf/link",
+    response_model=DownloadLinkResponse,
+    summary="取得申請表 PDF 的簽章下載網址",
+)
+async def get_application_pdf_link(
+    application_id: str,
+    current_user: User = Depends(get_current_user),
+    application_service: ApplicationService = Depends(get_application_service)
+):
+    """
+    生成 PDF（內容未變更時使用快取）並返回簽章下載網址
+
+    - 網址不需登入，DOWNLOAD_URL_TTL_SECONDS 內有效（expires_at 為 Unix 時間戳）
+    - 設定 DOWNLOAD_X_ACCEL_PREFIX 時檔案由 nginx 傳送，不經過後端
+    - 權限與同步匯出相同：學生只能匯出自己的，教師可以匯出所有
+    """
+    application = await application_service.get_application_by_id(application_id)
+
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="申请表不存在"
+        )
+
+    if current_user.role == "student" and application.submitter_id != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="無權導出此申請表"
+        )
+
+    try:
+        pdf_key = await PDFService.publish_pdf(application)
+    except Exception as e:
+        # 完整堆疊已由 PDFService 記錄
+        logger.error("PDF 導出失敗 (application_id=%s): %s", application_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"生成 PDF 失敗: {str(e)}"
+        )
+
+    download_url, expires_at = sign_download(
+        "artifacts",
+        pdf_key,
+        PDFService.download_filename(application),
+        settings.DOWNLOAD_URL_TTL_SECONDS,
+    )
+    return DownloadLinkResponse(download_url=download_url, expires_at=expires_at)
+
+
+@router.get("/{application_id}/thumbnail", summary="申請表第一頁縮圖")
+async def get_application_thumbnail(
+    application_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    application_service: ApplicationService = Depends(get_application_service)
+):
+    """
+    取得預先生成的 PDF 第一頁縮圖（需啟用 PDF_PRERENDER_ENABLED）
+
+    只讀取快取，不會觸發 PDF 生成；尚未生成時返回 404。
+    只載入申請表的版本資訊（不載入內容與簽章），以 ID 與版本號查詢縮圖。
+    ETag 為 PDF 內容雜湊，內容未變更時返回 304。
+    """
+    application = await application_service.get_application_version(application_id)
+
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="申请表不存在"
+        )
+
+    if current_user.role == "student" and application.submitter_id != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="无权查看此申请表"
+        )
+
+    thumbnail_key = await asyncio.to_thread(
+        PDFService.cached_thumbnail, application_id, application.revision
+    )
+    if thumbnail_key is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="縮圖尚未生成"
+        )
+
+    etag = make_weak_etag(thumbnail_key)
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return not_modified(etag)
+
+    thumbnail_path = artifact_cache.local_path(thumbnail_key)
+    if thumbnail_path is not None:
+        response = FileResponse(path=thumbnail_path, media_type=PDFService.thumbnail_media_type())
+    else:
+        # 物件儲存：在執行緒中串流轉送（縮圖只有數十 KB）
+        response = StreamingResponse(
+            artifact_cache.open(thumbnail_key), media_type=PDFService.thumbnail_media_type()
+        )
+    set_cache_headers(response, etag)
+    return response
+
+
 @router.get("/{application_id}/export-pdf", summary="導出申請表為 PDF")
 async def export_application_pdf(
     application_id: str,
@@ -457,32 +700,29 @@ async def export_application_pdf(
 
         # 生成文件名（使用 URL 編碼處理中文）
         from urllib.parse import quote
-        filename = f"自主學習申請表_{application.title}_{application.submitter_student_id}.pdf"
+        filename = PDFService.download_filename(application)
         encoded_filename = quote(filename)
 
-        # 返回 PDF 文件
+        # 返回 PDF 文件（傳送完畢後刪除臨時檔案）
         return FileResponse(
             path=pdf_path,
             media_type="application/pdf",
             filename=filename,
             headers={
                 "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
-            }
+            },
+            background=BackgroundTask(pdf_path.unlink, missing_ok=True),
         )
 
     except FileNotFoundError as e:
-        import traceback
-        traceback.print_exc()
+        logger.error("PDF 模板不存在: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"模板文件不存在: {str(e)}"
         )
     except Exception as e:
-        import traceback
-        print("=" * 60)
-        print("PDF 導出錯誤 - 完整堆棧:")
-        traceback.print_exc()
-        print("=" * 60)
+        # 完整堆疊已由 PDFService 記錄
+        logger.error("PDF 導出失敗 (application_id=%s): %s", application_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"生成 PDF 失敗: {str(e)}"
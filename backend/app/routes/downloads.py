@@ -0,0 +1,85 @@
+"""
+簽章下載路由（不需登入，以網址中的簽章授權）
+
+網址由 sign_download 產生（PDF 匯出工作的 download_url、匯出連結與審核通知郵件）。
+設定 DOWNLOAD_X_ACCEL_PREFIX 時只驗證簽章，檔案由 nginx 以 X-Accel-Redirect 傳送。
+生成結果存放在物件儲存（ARTIFACT_STORAGE=s3）時，重新導向到儲存服務的預簽網址。
+"""
+import asyncio
+import mimetypes
+import time
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import FileResponse, RedirectResponse
+
+from ..config import settings
+from ..services.artifact_cache import artifact_cache
+from ..utils.download_links import download_path, verify_download
+from ..utils.metrics import SIGNED_DOWNLOADS
+
+router = APIRouter(prefix="/downloads", tags=["下載"])
+
+
+@router.get("/{kind}/{file_name}", summary="以簽章網址下載檔案")
+async def download_signed(
+    kind: str,
+    file_name: str,
+    filename: str,
+    expires: int,
+    signature: str
+):
+    """
+    下載生成的檔案
+
+    - 簽章錯誤返回 403，已過期返回 410
+    - 檔案已刪除（例如匯出結果已過期、申請表內容已變更）返回 404
+    """
+    reason = verify_download(kind, file_name, filename, expires, signature)
+    if reason == "invalid":
+        SIGNED_DOWNLOADS.labels("unknown", reason).inc()
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="下載連結無效"
+        )
+    if reason == "expired":
+        SIGNED_DOWNLOADS.labels(kind, reason).inc()
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="下載連結已過期"
+        )
+
+    if kind == "artifacts" and not artifact_cache.is_local:
+        if not await asyncio.to_thread(artifact_cache.exists, file_name):
+            SIGNED_DOWNLOADS.labels(kind, "missing").inc()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="檔案不存在或已失效"
+            )
+        SIGNED_DOWNLOADS.labels(kind, "ok").inc()
+        # 預簽網址的有效時間不超過簽章網址的剩餘時間
+        url = await asyncio.to_thread(
+            artifact_cache.presigned_url, file_name, filename, max(expires - int(time.time()), 1)
+        )
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    path = download_path(kind, file_name)
+    if path is None or not path.exists():
+        SIGNED_DOWNLOADS.labels(kind, "missing").inc()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="檔案不存在或已失效"
+        )
+    SIGNED_DOWNLOADS.labels(kind, "ok").inc()
+
+    media_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+    headers = {
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+        "Cache-Control": "private, no-store",
+    }
+    if settings.DOWNLOAD_X_ACCEL_PREFIX:
+        # nginx 保留 Content-Type 與 Content-Disposition，並從 internal location 傳送檔案
+        headers["X-Accel-Redirect"] = f"{settings.DOWNLOAD_X_ACCEL_PREFIX.rstrip('/')}/{kind}/{quote(file_name)}"
+        return Response(media_type=media_type, headers=headers)
+
+    return FileResponse(path=path, media_type=media_type, headers=headers)
@@ -1,11 +1,12 @@
 """
 草稿相關路由
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from ..models.draft import DraftCreate, DraftResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from ..models.draft import DraftCreate, DraftResponse, DraftPatch, DraftPatchResponse
 from ..models.user import User
 from ..services.draft_service import DraftService
-from ..dependencies import get_current_user
+from ..services.draft_buffer import draft_write_buffer
+from ..dependencies import get_current_user, get_current_teacher
 
 router = APIRouter(prefix="/drafts", tags=["草稿"])
 
@@ -26,7 +27,9 @@ async def get_draft(
     - 每個使用者只有一份草稿
     - 如果沒有草稿，返回 404
     """
-    draft = await draft_service.get_draft_by_user(str(current_user.id))
+    draft = draft_write_buffer.get_pending(str(current_user.id))
+    if draft is None:
+        draft = await draft_service.get_draft_by_user(str(current_user.id))
 
     if not draft:
         raise HTTPException(
@@ -39,6 +42,8 @@ async def get_draft(
         submitter_id=draft.submitter_id,
         submitter_student_id=draft.submitter_student_id,
         form_data=draft.form_data,
+        revision=draft.revision,
+        content_hash=draft.content_hash,
         created_at=draft.created_at.isoformat(),
         updated_at=draft.updated_at.isoformat(),
     )
@@ -47,19 +52,22 @@ async def get_draft(
 @router.post("/", response_model=DraftResponse, summary="儲存草稿")
 async def save_draft(
     draft_data: DraftCreate,
-    current_user: User = Depends(get_current_user),
-    draft_service: DraftService = Depends(get_draft_service)
+    flush: bool = Query(False, description="立即寫入資料庫（不經過寫入緩衝）"),
+    current_user: User = Depends(get_current_user)
 ):
     """
     儲存草稿
 
     - 如果已有草稿，會覆蓋更新
     - 如果沒有草稿，會建立新的
+    - 短時間內的多次儲存會先保留在伺服器記憶體中，
+      最遲 DRAFT_FLUSH_INTERVAL_SECONDS 秒後寫入資料庫
     """
-    draft = await draft_service.create_or_update_draft(
+    draft = await draft_write_buffer.save(
         draft_data=draft_data,
         submitter_id=str(current_user.id),
-        submitter_student_id=current_user.student_id or current_user.username
+        submitter_student_id=current_user.student_id or current_user.username,
+        flush=flush
     )
 
     return DraftResponse(
@@ -67,11 +75,49 @@ async def save_draft(
         submitter_id=draft.submitter_id,
         submitter_student_id=draft.submitter_student_id,
         form_data=draft.form_data,
+        revision=draft.revision,
+        content_hash=draft.content_hash,
         created_at=draft.created_at.isoformat(),
         updated_at=draft.updated_at.isoformat(),
     )
 
 
+@router.patch("/", response_model=DraftPatchResponse, summary="增量儲存草稿")
+async def patch_draft(
+    patch_data: DraftPatch,
+    current_user: User = Depends(get_current_user),
+    draft_service: DraftService = Depends(get_draft_service)
+):
+    """
+    以 JSON Patch 風格的增量操作儲存草稿
+
+    - 支援 add / replace / remove，路徑為 form_data 內的 JSON Pointer
+    - 只寫入變更的欄位，不回傳完整的 form_data
+    - 與上一次相同的增量內容會略過寫入（skipped=true）
+    """
+    # 先寫入緩衝中的完整草稿，避免之後覆蓋本次增量
+    await draft_write_buffer.release(str(current_user.id))
+
+    try:
+        state, skipped = await draft_service.patch_draft(
+            operations=patch_data.operations,
+            submitter_id=str(current_user.id),
+            submitter_student_id=current_user.student_id or current_user.username
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return DraftPatchResponse(
+        revision=state.get("revision", 0),
+        patch_hash=state.get("patch_hash") or "",
+        updated_at=state["updated_at"].isoformat(),
+        skipped=skipped,
+    )
+
+
 @router.delete("/", summary="刪除草稿")
 async def delete_draft(
     current_user: User = Depends(get_current_user),
@@ -80,6 +126,8 @@ async def delete_draft(
     """
     刪除當前使用者的草稿
     """
+    # 等待進行中的緩衝寫入完成後才刪除，避免草稿在刪除後被重新建立
+    await draft_write_buffer.discard(str(current_user.id))
     success = await draft_service.delete_draft(str(current_user.id))
 
     if not success:
@@ -89,3 +137,15 @@ async def delete_draft(
         )
 
     return {"message": "草稿已刪除"}
+
+
+@router.get("/buffer-stats", summary="草稿寫入緩衝統計")
+async def get_draft_buffer_stats(
+    current_teacher: User = Depends(get_current_teacher)
+):
+    """
+    草稿寫入緩衝統計（僅教師可用）
+
+    write_reduction_ratio 為被合併而省下的資料庫寫入比例
+    """
+    return draft_write_buffer.stats()
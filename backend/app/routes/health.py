@@ -0,0 +1,56 @@
+"""
+健康檢查路由
+"""
+from fastapi import APIRouter, Depends, Response, status
+
+from ..config import settings
+from ..services.health_service import HealthService
+
+router = APIRouter(prefix="/health", tags=["系統"])
+
+
+def get_health_service() -> HealthService:
+    """獲取健康檢查服務例項"""
+    return HealthService()
+
+
+@router.get("", summary="健康檢查")
+async def health_check(
+    health_service: HealthService = Depends(get_health_service)
+):
+    """
+    健康檢查（相容舊版格式；資料庫狀態以實際 ping 結果為準）
+    """
+    mongodb = await health_service.check_mongodb()
+    return {
+        "status": "healthy",
+        "database": "connected" if mongodb["status"] == "ok" else "disconnected",
+    }
+
+
+@router.get("/live", summary="存活檢查")
+async def liveness():
+    """
+    存活檢查：行程能處理請求即返回 200，不檢查外部依賴
+
+    供容器重新啟動判斷使用；依賴故障時不應重新啟動行程。
+    """
+    return {"status": "alive", "version": settings.APP_VERSION}
+
+
+@router.get("/ready", summary="就緒檢查")
+async def readiness(
+    response: Response,
+    health_service: HealthService = Depends(get_health_service)
+):
+    """
+    就緒檢查：檢查 MongoDB、Word 模板、LibreOffice 與 SMTP，並回報各自延遲
+
+    - MongoDB、模板或 LibreOffice 不可用時返回 503（負載平衡器應停止轉送）
+    - 只有 SMTP 不可用時返回 200，狀態為 degraded（僅影響郵件通知）
+    - LibreOffice 與 SMTP 的結果會快取 HEALTH_CACHE_SECONDS 秒
+    """
+    result = await health_service.readiness()
+    if result["status"] == "not_ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
@@ -0,0 +1,95 @@
+"""
+PDF 匯出工作路由（狀態查詢與下載）
+
+工作由 POST /applications/{application_id}/export-pdf/jobs 建立。
+完成後可從 download_url（簽章網址，見 downloads.py）或 result_url（需登入）下載。
+"""
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse
+
+from ..dependencies import get_current_user
+from ..models.pdf_job import PdfJob, PdfJobResponse, PdfJobStatus
+from ..models.user import User
+from ..services.pdf_job_service import PdfJobService
+
+router = APIRouter(prefix="/pdf-jobs", tags=["PDF 匯出"])
+
+# 工作尚未完成時建議的輪詢間隔（秒）
+RETRY_AFTER_SECONDS = 2
+
+
+def get_pdf_job_service() -> PdfJobService:
+    """獲取 PDF 匯出工作服務例項"""
+    return PdfJobService()
+
+
+async def _get_job(job_id: str, current_user: User, pdf_job_service: PdfJobService) -> PdfJob:
+    """獲取工作（只有建立者與教師可以存取，其他人視為不存在）"""
+    job = await pdf_job_service.get_job(job_id)
+    if job is None or (current_user.role != "teacher" and job.requested_by != str(current_user.id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="匯出工作不存在或已過期"
+        )
+    return job
+
+
+@router.get("/{job_id}", response_model=PdfJobResponse, summary="查詢 PDF 匯出工作狀態")
+async def get_pdf_job(
+    job_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    pdf_job_service: PdfJobService = Depends(get_pdf_job_service)
+):
+    """
+    查詢 PDF 匯出工作狀態
+
+    - queued / running：回應標頭 Retry-After 為建議的輪詢間隔
+    - done：從 result_url 下載 PDF
+    - failed：error 為失敗原因
+    """
+    job = await _get_job(job_id, current_user, pdf_job_service)
+    if job.status in (PdfJobStatus.QUEUED, PdfJobStatus.RUNNING):
+        response.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+    return PdfJobResponse.from_job(job)
+
+
+@router.get("/{job_id}/result", summary="下載 PDF 匯出結果")
+async def download_pdf_job_result(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    pdf_job_service: PdfJobService = Depends(get_pdf_job_service)
+):
+    """
+    下載已完成的 PDF（完成後保留 PDF_JOB_RESULT_TTL_SECONDS 秒）
+    """
+    job = await _get_job(job_id, current_user, pdf_job_service)
+    if job.status == PdfJobStatus.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"生成 PDF 失敗: {job.error}"
+        )
+    if job.status != PdfJobStatus.DONE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="PDF 尚未生成完成"
+        )
+
+    result_path = Path(job.result_path)
+    if not result_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="匯出工作不存在或已過期"
+        )
+
+    return FileResponse(
+        path=result_path,
+        media_type="application/pdf",
+        filename=job.filename,
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(job.filename)}"
+        },
+    )
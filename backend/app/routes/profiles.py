@@ -0,0 +1,81 @@
+"""
+請求剖析結果路由（教師專用）
+"""
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse, PlainTextResponse
+
+from ..dependencies import get_current_teacher
+from ..models.user import User
+from ..utils.profiling import RequestProfile, profile_store
+
+router = APIRouter(prefix="/profiles", tags=["效能剖析"])
+
+
+def _get_profile(profile_id: str) -> RequestProfile:
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="剖析結果不存在或已被淘汰"
+        )
+    return profile
+
+
+@router.get("/", summary="最近的請求剖析")
+async def list_profiles(
+    current_teacher: User = Depends(get_current_teacher)
+) -> List[Dict[str, Any]]:
+    """
+    列出最近的請求剖析摘要（由新到舊）
+    """
+    return [profile.summary() for profile in profile_store.list()]
+
+
+@router.get("/{profile_id}", summary="請求剖析詳情")
+async def get_profile(
+    profile_id: str,
+    current_teacher: User = Depends(get_current_teacher)
+) -> Dict[str, Any]:
+    """
+    獲取單一請求的剖析結果，包含 MongoDB 指令時間軸
+    """
+    return _get_profile(profile_id).detail()
+
+
+@router.get("/{profile_id}/cpu", summary="下載 CPU 剖析")
+async def download_cpu_profile(
+    profile_id: str,
+    format: str = Query("html", pattern="^(html|text|speedscope)$"),
+    current_teacher: User = Depends(get_current_teacher)
+):
+    """
+    下載 CPU 取樣結果
+
+    - html：pyinstrument 互動式報表
+    - text：文字呼叫樹
+    - speedscope：可匯入 https://www.speedscope.app 的 JSON
+    """
+    profile = _get_profile(profile_id)
+    if profile.session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="此請求沒有 CPU 剖析資料"
+        )
+
+    from pyinstrument import renderers
+
+    disposition = {"Content-Disposition": f'attachment; filename="profile-{profile.id}.{format if format != "speedscope" else "json"}"'}
+    if format == "html":
+        return HTMLResponse(renderers.HTMLRenderer().render(profile.session), headers=disposition)
+    if format == "speedscope":
+        return PlainTextResponse(
+            renderers.SpeedscopeRenderer().render(profile.session),
+            media_type="application/json",
+            headers=disposition,
+        )
+    return PlainTextResponse(
+        renderers.ConsoleRenderer(unicode=True, color=False).render(profile.session),
+        headers=disposition,
+    )
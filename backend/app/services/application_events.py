@@ -0,0 +1,220 @@
+"""
+申請表狀態變更推播
+
+監聽 applications 集合的變更（MongoDB change stream），將審核狀態與評語的
+變更分送給已連線的提交者（Server-Sent Events）。change stream 失敗時以退避
+間隔重試；只有 MongoDB 不是 replica set（不支援 change stream）時才改為定期
+輪詢 updated_at。
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from ..config import settings
+from ..models.application import Application
+from ..utils.metrics import SSE_SUBSCRIBERS
+
+logger = logging.getLogger(__name__)
+
+# 教師訂閱所有申請表的事件
+ALL_SUBMITTERS = "*"
+
+# change stream 不支援（非 replica set）的錯誤碼
+CHANGE_STREAM_UNSUPPORTED_CODES = {40573}
+
+# change stream 重試的退避間隔（秒）：第一次等待 BASE，每次加倍，最多 MAX
+CHANGE_STREAM_RETRY_BASE_SECONDS = 1.0
+CHANGE_STREAM_RETRY_MAX_SECONDS = 60.0
+
+# 事件只需要的欄位（避免帶出組員、簽章等大型欄位）
+EVENT_FIELDS = ("submitter_id", "title", "status", "comment", "revision", "updated_at")
+
+
+class ApplicationEventHub:
+    """申請表事件分送中心（單一行程內）"""
+
+    # 每個訂閱者最多保留的未讀事件數量，超過時丟棄最舊的
+    QUEUE_SIZE = 100
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.mode: str = "stopped"
+
+    def subscribe(self, submitter_id: str) -> asyncio.Queue:
+        """
+        訂閱指定提交者的申請表事件
+
+        Args:
+            submitter_id: 提交者使用者 ID，ALL_SUBMITTERS 表示全部
+
+        Returns:
+            asyncio.Queue: 事件佇列
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._subscribers.setdefault(submitter_id, set()).add(queue)
+        SSE_SUBSCRIBERS.inc()
+        return queue
+
+    def unsubscribe(self, submitter_id: str, queue: asyncio.Queue) -> None:
+        """
+        取消訂閱
+
+        Args:
+            submitter_id: 提交者使用者 ID
+            queue: subscribe 返回的佇列
+        """
+        queues = self._subscribers.get(submitter_id)
+        if queues is None:
+            return
+        if queue in queues:
+            queues.remove(queue)
+            SSE_SUBSCRIBERS.dec()
+        if not queues:
+            del self._subscribers[submitter_id]
+
+    @property
+    def subscriber_count(self) -> int:
+        """目前連線中的訂閱數量"""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """
+        分送事件給該提交者與訂閱全部事件的訂閱者
+
+        Args:
+            event: 事件內容（必須包含 submitter_id）
+        """
+        targets = [
+            *self._subscribers.get(event.get("submitter_id"), ()),
+            *self._subscribers.get(ALL_SUBMITTERS, ()),
+        ]
+        for queue in targets:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def start(self) -> None:
+        """啟動背景監聽"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止背景監聽"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.mode = "stopped"
+
+    @staticmethod
+    def _to_event(document: Dict[str, Any]) -> Dict[str, Any]:
+        """將申請表文件（部分欄位）轉換為事件"""
+        updated_at = document.get("updated_at")
+        return {
+            "type": "application.updated",
+            "id": str(document["_id"]),
+            "submitter_id": document.get("submitter_id"),
+            "title": document.get("title"),
+            "status": document.get("status"),
+            "comment": document.get("comment") or "",
+            "revision": document.get("revision", 0),
+            "updated_at": updated_at.isoformat() if isinstance(updated_at, datetime) else updated_at,
+        }
+
+    async def _run(self) -> None:
+        """優先使用 change stream，不支援時改為輪詢"""
+        try:
+            await self._watch_change_stream()
+        except asyncio.CancelledError:
+            raise
+        except (OperationFailure, NotImplementedError):
+            logger.info("不支援 change stream，申請表事件改用輪詢（每 %s 秒）", settings.APPLICATION_EVENTS_POLL_INTERVAL_SECONDS)
+            await self._poll()
+
+    async def _watch_change_stream(self) -> None:
+        """監聽 applications 集合的 change stream"""
+        collection = Application.get_motor_collection()
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"operationType": {"$in": ["insert", "replace"]}},
+                        {"updateDescription.updatedFields.status": {"$exists": True}},
+                        {"updateDescription.updatedFields.comment": {"$exists": True}},
+                    ]
+                }
+            },
+            {
+                "$project": {
+                    "operationType": 1,
+                    **{f"fullDocument.{field}": 1 for field in EVENT_FIELDS},
+                }
+            },
+        ]
+        resume_token = None
+        retry_delay = CHANGE_STREAM_RETRY_BASE_SECONDS
+
+        while True:
+            try:
+                async with collection.watch(
+                    pipeline,
+                    full_document="updateLookup",
+                    resume_after=resume_token,
+                ) as stream:
+                    self.mode = "change_stream"
+                    retry_delay = CHANGE_STREAM_RETRY_BASE_SECONDS
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        document = change.get("fullDocument")
+                        if document:
+                            self.publish(self._to_event(document))
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                    raise
+                # 其他伺服器錯誤（權限、選舉期間、resume token 已過期等）：
+                # resume token 可能已失效，重試時從目前時間點開始
+                logger.warning("申請表 change stream 失敗，%s 秒後重試: %s", retry_delay, e)
+                resume_token = None
+            except PyMongoError as e:
+                # 連線中斷等暫時性錯誤：稍後從 resume token 繼續
+                logger.warning("申請表 change stream 中斷，%s 秒後重試: %s", retry_delay, e)
+
+            self.mode = "reconnecting"
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, CHANGE_STREAM_RETRY_MAX_SECONDS)
+
+    async def _poll(self) -> None:
+        """定期查詢 updated_at 較新的申請表（非 replica set 時的備援）"""
+        self.mode = "polling"
+        collection = Application.get_motor_collection()
+        projection = {field: 1 for field in EVENT_FIELDS}
+        last_seen = datetime.utcnow()
+
+        while True:
+            await asyncio.sleep(settings.APPLICATION_EVENTS_POLL_INTERVAL_SECONDS)
+
+            # 沒有訂閱者時不查詢，只推進時間點
+            if not self._subscribers:
+                last_seen = datetime.utcnow()
+                continue
+
+            try:
+                cursor = collection.find(
+                    {"updated_at": {"$gt": last_seen}}, projection=projection
+                ).sort("updated_at", 1)
+                async for document in cursor:
+                    last_seen = max(last_seen, document["updated_at"])
+                    self.publish(self._to_event(document))
+            except PyMongoError as e:
+                logger.warning("申請表事件輪詢失敗: %s", e)
+
+
+# 全域申請表事件分送中心
+application_event_hub = ApplicationEventHub()
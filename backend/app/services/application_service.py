@@ -1,20 +1,43 @@
 """
 申請表服務層 - 使用 Beanie ODM
 """
-from typing import List, Optional, Dict
+import asyncio
+from typing import Any, List, Optional, Dict, Union
 from datetime import datetime
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.odm.utils.projection import get_projection
+from motor.motor_asyncio import AsyncIOMotorCollection
+from ..database import mongodb_client
 from ..models.application import (
     Application,
     ApplicationCreate,
     ApplicationUpdate,
     ApplicationStatus,
+    ApplicationSummary,
+    ApplicationVersion,
 )
+from ..models.base import RevisionConflictError, revision_filter
 
 
 class ApplicationService:
     """申請表服務 - 使用 Beanie ODM"""
 
+    # 列表版本計數器的鍵：所有申請表（教師列表）與各提交者的申請表（學生列表）
+    ALL_VERSION_KEY = "all"
+
+    @staticmethod
+    def _reporting_collection() -> AsyncIOMotorCollection:
+        """
+        教師列表與統計查詢使用的集合
+
+        依 MONGODB_LIST_READ_PREFERENCE 設定讀取偏好（例如 secondaryPreferred），
+        將大量唯讀查詢分散到副本節點；學生自己的列表與單筆讀取仍讀主節點，
+        確保提交後立即看得到。
+        """
+        return Application.get_motor_collection().with_options(
+            read_preference=mongodb_client.list_read_preference()
+        )
+
     async def create_application(
         self,
         application_data: ApplicationCreate,
@@ -44,6 +67,7 @@ class ApplicationService:
 
         # 插入資料庫
         await application.insert()
+        await self._bump_list_version(submitter_id)
         return application
 
     async def get_application_by_id(self, application_id: str) -> Optional[Application]:
@@ -58,12 +82,27 @@ class ApplicationService:
         """
         return await Application.get(PydanticObjectId(application_id))
 
+    async def get_application_version(self, application_id: str) -> Optional[ApplicationVersion]:
+        """
+        只讀取申請表的版本資訊（不載入內容）
+
+        Args:
+            application_id: 申請表 ID
+
+        Returns:
+            Optional[ApplicationVersion]: 版本投影，不存在返回 None
+        """
+        return await Application.find_one(
+            Application.id == PydanticObjectId(application_id)
+        ).project(ApplicationVersion)
+
     async def get_applications_by_user(
         self,
         submitter_id: str,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Application]:
+        limit: int = 100,
+        summary: bool = False
+    ) -> List[Union[Application, ApplicationSummary]]:
         """
         獲取使用者的所有申請表
 
@@ -71,22 +110,26 @@ class ApplicationService:
             submitter_id: 提交者 ID
             skip: 跳過數量
             limit: 限制數量
+            summary: 只載入列表需要的欄位
 
         Returns:
-            List[Application]: 申請表列表
+            List: 申請表列表（summary 時為 ApplicationSummary）
         """
-        applications = await Application.find(
+        query = Application.find(
             Application.submitter_id == submitter_id
-        ).sort(-Application.created_at).skip(skip).limit(limit).to_list()
+        ).sort(-Application.created_at).skip(skip).limit(limit)
 
-        return applications
+        if summary:
+            return await query.project(ApplicationSummary).to_list()
+        return await query.to_list()
 
     async def get_all_applications(
         self,
         status: Optional[ApplicationStatus] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Application]:
+        limit: int = 100,
+        summary: bool = False
+    ) -> List[Union[Application, ApplicationSummary]]:
         """
         獲取所有申請表（教師用）
 
@@ -94,17 +137,136 @@ class ApplicationService:
             status: 篩選狀態
             skip: 跳過數量
             limit: 限制數量
+            summary: 只載入列表需要的欄位
 
         Returns:
-            List[Application]: 申請表列表
+            List: 申請表列表（summary 時為 ApplicationSummary）
         """
+        if summary:
+            cursor = self._reporting_collection().find(
+                {"status": status.value} if status else {},
+                projection=get_projection(ApplicationSummary),
+            ).sort("created_at", -1).skip(skip).limit(limit)
+            return [ApplicationSummary.model_validate(document) async for document in cursor]
+
         if status:
             query = Application.find(Application.status == status)
         else:
             query = Application.find()
 
-        applications = await query.sort(-Application.created_at).skip(skip).limit(limit).to_list()
-        return applications
+        query = query.sort(-Application.created_at).skip(skip).limit(limit)
+        return await query.to_list()
+
+    @staticmethod
+    def _list_versions() -> AsyncIOMotorCollection:
+        """申請表列表版本計數器（每次新增、修改、刪除申請表時遞增）"""
+        return Application.get_motor_collection().database["application_list_versions"]
+
+    @staticmethod
+    def _submitter_version_key(submitter_id: str) -> str:
+        return f"submitter:{submitter_id}"
+
+    async def _bump_list_version(self, submitter_id: str) -> None:
+        """
+        遞增所有申請表與該提交者的列表版本
+
+        在寫入申請表之後呼叫：讀到新版本號時一定讀得到新資料。
+        """
+        versions = self._list_versions()
+        await asyncio.gather(*(
+            versions.update_one({"_id": key}, {"$inc": {"version": 1}}, upsert=True)
+            for key in (self.ALL_VERSION_KEY, self._submitter_version_key(submitter_id))
+        ))
+
+    async def get_list_version(self, submitter_id: Optional[str] = None) -> int:
+        """
+        取得申請表列表版本
+
+        只讀取一筆計數器文件，不掃描申請表；任何新增、刪除或修改都會改變版本。
+        教師列表（含狀態篩選）使用所有申請表的版本。
+
+        Args:
+            submitter_id: 只計算此提交者的申請表
+
+        Returns:
+            int: 版本號（尚未有任何申請表時為 0）
+        """
+        # 教師列表的版本與列表本身讀取同一種節點，學生的讀主節點
+        if submitter_id:
+            collection = self._list_versions()
+            key = self._submitter_version_key(submitter_id)
+        else:
+            collection = self._list_versions().with_options(
+                read_preference=mongodb_client.list_read_preference()
+            )
+            key = self.ALL_VERSION_KEY
+
+        document = await collection.find_one({"_id": key})
+        return document["version"] if document else 0
+
+    @staticmethod
+    def build_update_document(fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        組裝只包含變更欄位的 MongoDB 更新文件
+
+        Args:
+            fields: 要更新的欄位與值
+
+        Returns:
+            Dict: $set / $inc 更新文件
+        """
+        return {
+            "$set": {**fields, "updated_at": datetime.utcnow()},
+            "$inc": {"revision": 1},
+        }
+
+    async def _apply_update(
+        self,
+        application_id: str,
+        fields: Dict[str, Any],
+        expected_revision: Optional[int] = None,
+        submitter_id: Optional[str] = None
+    ) -> Optional[Application]:
+        """
+        以單次 find_one_and_update 原子更新申請表
+
+        權限與版本號都放在篩選條件中，不需要先讀取整份文件；沒有符合的
+        文件時才以版本投影區分不存在、無權限與版本衝突。
+
+        Args:
+            application_id: 申請表 ID
+            fields: 要 $set 的欄位
+            expected_revision: 預期版本號
+            submitter_id: 只允許更新此提交者的申請表
+
+        Returns:
+            Optional[Application]: 更新後的申請表，不存在返回 None
+
+        Raises:
+            PermissionError: 申請表不屬於 submitter_id
+            RevisionConflictError: 版本號不符（已被其他請求修改）
+        """
+        object_id = PydanticObjectId(application_id)
+        query = {"_id": object_id, **revision_filter(expected_revision)}
+        if submitter_id is not None:
+            query["submitter_id"] = submitter_id
+
+        application = await Application.find_one(query).update(
+            self.build_update_document(fields),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+        if application is None and (expected_revision is not None or submitter_id is not None):
+            # 區分「不存在」、「無權限」與「版本衝突」
+            current = await self.get_application_version(application_id)
+            if current is not None:
+                if submitter_id is not None and current.submitter_id != submitter_id:
+                    raise PermissionError("無權修改此申請表")
+                raise RevisionConflictError("申請表已被修改，請重新載入後再試")
+
+        if application is not None:
+            await self._bump_list_version(application.submitter_id)
+        return application
 
     async def update_application(
         self,
@@ -115,35 +277,40 @@ class ApplicationService:
         """
         更新申請表
 
+        只 $set 請求中提供的欄位，不重寫整份文件（含簽章）。只有提交者
+        本人可以更新，檢查與更新在同一次資料庫操作中完成。
+
         Args:
             application_id: 申請表 ID
-            update_data: 更新資料
-            user_id: 操作使用者 ID
+            update_data: 更新資料（revision 為預期版本號）
+            user_id: 操作使用者 ID（必須是提交者）
 
         Returns:
-            Optional[Application]: 更新後的申請表
-        """
-        application = await self.get_application_by_id(application_id)
-        if not application:
-            return None
+            Optional[Application]: 更新後的申請表，不存在返回 None
 
+        Raises:
+            PermissionError: 操作使用者不是提交者
+            RevisionConflictError: 版本號不符
+        """
         # 只更新提供的欄位
         update_dict = update_data.model_dump(exclude_unset=True)
+        expected_revision = update_dict.pop("revision", None)
 
-        for key, value in update_dict.items():
-            if hasattr(application, key):
-                setattr(application, key, value)
+        fields = {
+            key: value
+            for key, value in update_dict.items()
+            if key in Application.model_fields
+        }
 
-        application.updated_at = datetime.utcnow()
-        await application.save()
-        return application
+        return await self._apply_update(application_id, fields, expected_revision, submitter_id=user_id)
 
     async def update_application_status(
         self,
         application_id: str,
         status: ApplicationStatus,
         reviewer_id: str,
-        comment: Optional[str] = None
+        comment: Optional[str] = None,
+        expected_revision: Optional[int] = None
     ) -> Optional[Application]:
         """
         更新申請表狀態（教師稽覈）
@@ -153,22 +320,22 @@ class ApplicationService:
             status: 新狀態
             reviewer_id: 稽覈教師 ID
             comment: 評語
+            expected_revision: 預期版本號
 
         Returns:
             Optional[Application]: 更新後的申請表
-        """
-        application = await self.get_application_by_id(application_id)
-        if not application:
-            return None
 
-        application.status = status
-        application.reviewer_id = reviewer_id
+        Raises:
+            RevisionConflictError: 版本號不符
+        """
+        fields: Dict[str, Any] = {
+            "status": status,
+            "reviewer_id": reviewer_id,
+        }
         if comment is not None:
-            application.comment = comment
-        application.updated_at = datetime.utcnow()
+            fields["comment"] = comment
 
-        await application.save()
-        return application
+        return await self._apply_update(application_id, fields, expected_revision)
 
     async def delete_application(self, application_id: str) -> bool:
         """
@@ -185,6 +352,7 @@ class ApplicationService:
             return False
 
         await application.delete()
+        await self._bump_list_version(application.submitter_id)
         return True
 
     async def count_applications(self, status: Optional[ApplicationStatus] = None) -> int:
@@ -197,6 +365,6 @@ class ApplicationService:
         Returns:
             int: 申請表數量
         """
-        if status:
-            return await Application.find(Application.status == status).count()
-        return await Application.find().count()
+        return await self._reporting_collection().count_documents(
+            {"status": status.value} if status else {}
+        )
@@ -0,0 +1,169 @@
+"""
+生成結果快取（預先生成的 PDF 等）
+
+檔案存放在 ARTIFACT_STORAGE 選擇的儲存後端（見 artifact_storage.py，多個 worker 與副本共用），
+以「名稱 + 內容雜湊」命名：內容變更後雜湊不同，舊的快取自然失效，寫入新版本時一併刪除。
+每個名稱（例如申請表 ID）的每種副檔名只保留最新一份；超過 ARTIFACT_TTL_DAYS 的檔案
+由儲存後端刪除。
+
+方法皆為同步（可能有網路請求），在事件迴圈中需以 asyncio.to_thread 呼叫。
+"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from ..config import settings
+from ..utils.metrics import ARTIFACT_CACHE_REQUESTS
+from .artifact_storage import ArtifactStorage, create_artifact_storage
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactCache:
+    """以內容雜湊為鍵的檔案快取"""
+
+    # 套用過期設定的間隔（秒）
+    EXPIRE_INTERVAL = 3600.0
+
+    def __init__(self, storage: Optional[ArtifactStorage] = None):
+        self._storage = storage
+        self._expire_task: Optional[asyncio.Task] = None
+
+    @property
+    def storage(self) -> ArtifactStorage:
+        if self._storage is None:
+            self._storage = create_artifact_storage()
+        return self._storage
+
+    @property
+    def is_local(self) -> bool:
+        """檔案是否在本機（可由 nginx 直接傳送）"""
+        return self.storage.local
+
+    @staticmethod
+    def key(name: str, content_hash: str, suffix: str) -> str:
+        return f"{name}-{content_hash}{suffix}"
+
+    def get(self, name: str, content_hash: str, suffix: str) -> Optional[str]:
+        """
+        查詢快取
+
+        Args:
+            name: 名稱（例如申請表 ID）
+            content_hash: 生成內容的雜湊
+            suffix: 副檔名（例如 .pdf）
+
+        Returns:
+            Optional[str]: 快取的鍵，不存在返回 None
+        """
+        key = self.key(name, content_hash, suffix)
+        hit = self.storage.exists(key)
+        ARTIFACT_CACHE_REQUESTS.labels(suffix.lstrip("."), "hit" if hit else "miss").inc()
+        return key if hit else None
+
+    def put(self, name: str, content_hash: str, suffix: str, source: Path) -> str:
+        """
+        存入快取（不移動 source），並刪除同名稱的舊版本
+
+        Args:
+            name: 名稱
+            content_hash: 生成內容的雜湊
+            suffix: 副檔名
+            source: 生成的檔案
+
+        Returns:
+            str: 快取的鍵
+        """
+        key = self.key(name, content_hash, suffix)
+        self.storage.put_file(key, source)
+        self._delete_stale(name, suffix, key)
+        return key
+
+    def put_bytes(self, name: str, content_hash: str, suffix: str, data: bytes) -> str:
+        """
+        存入快取（二進位資料），並刪除同名稱的舊版本
+
+        Returns:
+            str: 快取的鍵
+        """
+        key = self.key(name, content_hash, suffix)
+        self.storage.put_bytes(key, data)
+        self._delete_stale(name, suffix, key)
+        return key
+
+    def _delete_stale(self, name: str, suffix: str, current: str) -> None:
+        for stale in self._keys(name):
+            if stale != current and stale.endswith(suffix):
+                self.storage.delete(stale)
+
+    def _keys(self, name: str) -> List[str]:
+        return self.storage.list_keys(f"{name}-")
+
+    def exists(self, key: str) -> bool:
+        return self.storage.exists(key)
+
+    def copy_to(self, key: str, destination: Path) -> bool:
+        """
+        將快取檔案複製到本機（本機儲存使用硬連結）
+
+        Returns:
+            bool: 是否存在
+        """
+        return self.storage.get_file(key, destination)
+
+    def read_bytes(self, key: str) -> Optional[bytes]:
+        """讀取小型快取檔案的內容（不存在返回 None）"""
+        try:
+            return b"".join(self.storage.iter_chunks(key))
+        except FileNotFoundError:
+            return None
+
+    def open(self, key: str) -> Iterator[bytes]:
+        """串流讀取快取檔案（不存在時拋出 FileNotFoundError）"""
+        return self.storage.iter_chunks(key)
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """本機儲存的檔案路徑（非本機儲存返回 None）"""
+        return self.storage.local_path(key)
+
+    def presigned_url(self, key: str, filename: str, ttl_seconds: int) -> Optional[str]:
+        """儲存服務的預簽下載網址（本機儲存返回 None）"""
+        return self.storage.presigned_url(key, filename, ttl_seconds)
+
+    def delete(self, name: str) -> int:
+        """
+        刪除名稱的所有快取檔案
+
+        Returns:
+            int: 刪除的檔案數量
+        """
+        keys = self._keys(name)
+        for key in keys:
+            self.storage.delete(key)
+        return len(keys)
+
+    async def start(self) -> None:
+        """啟動定期過期處理（ARTIFACT_TTL_DAYS 為 0 時不啟動）"""
+        if self._expire_task is None and settings.ARTIFACT_TTL_DAYS > 0:
+            self._expire_task = asyncio.create_task(self._expire_loop())
+
+    async def stop(self) -> None:
+        if self._expire_task is not None:
+            self._expire_task.cancel()
+            await asyncio.gather(self._expire_task, return_exceptions=True)
+            self._expire_task = None
+
+    async def _expire_loop(self) -> None:
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.storage.expire, settings.ARTIFACT_TTL_DAYS)
+                if removed:
+                    logger.info("已刪除 %d 個過期的生成結果", removed)
+            except Exception as e:
+                logger.warning("生成結果過期處理失敗: %s", e)
+            await asyncio.sleep(self.EXPIRE_INTERVAL)
+
+
+# 全域生成結果快取
+artifact_cache = ArtifactCache()
@@ -0,0 +1,346 @@
+"""
+生成結果的儲存後端
+
+ARTIFACT_STORAGE 選擇存放位置：
+- local：ARTIFACT_CACHE_DIR 目錄（同一台主機的 worker 共用）
+- s3：S3 相容的物件儲存（AWS S3、MinIO 等），多個後端副本共用，重新部署後仍保留
+
+鍵為不含目錄的檔名（{名稱}-{內容雜湊}{副檔名}）。讀寫皆以串流進行，不會把整個檔案載入記憶體。
+過期由 expire() 處理：local 刪除超過 ARTIFACT_TTL_DAYS 的檔案，s3 設定儲存桶的生命週期規則。
+
+boto3 在第一次使用 s3 時才載入。
+"""
+import logging
+import mimetypes
+import os
+import shutil
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# 串流讀取的區塊大小
+CHUNK_SIZE = 256 * 1024
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """建立硬連結，不支援時（例如跨檔案系統）改為複製"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def _media_type(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+class ArtifactStorage(ABC):
+    """
+    儲存後端介面（同步方法，在事件迴圈中需以 asyncio.to_thread 呼叫）
+
+    抽象方法未全部實作的後端在建立時即失敗，而非第一次使用時。
+    """
+
+    # 是否為本機檔案（可由 nginx 直接傳送）
+    local = False
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def put_file(self, key: str, source: Path) -> None:
+        """寫入檔案（不移動 source）；同一個鍵已存在時原子替換"""
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def get_file(self, key: str, destination: Path) -> bool:
+        """
+        讀取到本機檔案
+
+        Returns:
+            bool: 是否存在
+        """
+
+    @abstractmethod
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        """串流讀取（不存在時拋出 FileNotFoundError）"""
+
+    @abstractmethod
+    def list_keys(self, prefix: str) -> List[str]:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """本機檔案路徑（非本機儲存返回 None）"""
+        return None
+
+    def presigned_url(self, key: str, filename: str, ttl_seconds: int) -> Optional[str]:
+        """可直接下載的預簽網址（不支援時返回 None）"""
+        return None
+
+    @abstractmethod
+    def expire(self, ttl_days: int) -> int:
+        """
+        套用過期設定
+
+        Returns:
+            int: 刪除的數量（由儲存服務自行刪除時為 0）
+        """
+
+    @abstractmethod
+    def check(self) -> str:
+        """確認儲存可用（健康檢查），返回說明文字"""
+
+
+class LocalArtifactStorage(ArtifactStorage):
+    """本機目錄"""
+
+    local = True
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def local_path(self, key: str) -> Path:
+        return self.directory / key
+
+    def _tmp_path(self, key: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f".{key}-{uuid.uuid4().hex[:8]}.tmp"
+
+    def exists(self, key: str) -> bool:
+        return self.local_path(key).exists()
+
+    def put_file(self, key: str, source: Path) -> None:
+        # 先寫入暫存檔再原子替換，其他 worker 不會讀到寫入一半的檔案
+        tmp_path = self._tmp_path(key)
+        link_or_copy(source, tmp_path)
+        os.replace(tmp_path, self.local_path(key))
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        tmp_path = self._tmp_path(key)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.local_path(key))
+
+    def get_file(self, key: str, destination: Path) -> bool:
+        try:
+            link_or_copy(self.local_path(key), destination)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        with open(self.local_path(key), "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    def list_keys(self, prefix: str) -> List[str]:
+        if not self.directory.exists():
+            return []
+        return [path.name for path in self.directory.glob(f"{prefix}*")]
+
+    def delete(self, key: str) -> None:
+        self.local_path(key).unlink(missing_ok=True)
+
+    def expire(self, ttl_days: int) -> int:
+        if ttl_days <= 0 or not self.directory.exists():
+            return 0
+        cutoff = time.time() - ttl_days * 86400
+        removed = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def check(self) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not os.access(self.directory, os.W_OK):
+            raise RuntimeError(f"目錄不可寫入: {self.directory}")
+        return str(self.directory)
+
+
+class S3ArtifactStorage(ArtifactStorage):
+    """S3 相容的物件儲存（物件鍵為 S3_PREFIX + 鍵）"""
+
+    LIFECYCLE_RULE_ID = "fhsh-artifact-expiry"
+
+    def __init__(self):
+        self.bucket = settings.S3_BUCKET
+        self.prefix = settings.S3_PREFIX
+        self._client: Any = None
+        self._presign_client: Any = None
+        self._lifecycle_days: Optional[int] = None
+
+    def _create_client(self, endpoint_url: Optional[str]) -> Any:
+        import boto3
+        from botocore.config import Config
+
+        return boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=settings.S3_REGION,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            # 自訂端點（MinIO 等）使用路徑式網址，不需要萬用字元 DNS
+            config=Config(
+                signature_version="s3v4",
+                s3={"addressing_style": "path" if settings.S3_ENDPOINT_URL else "auto"},
+            ),
+        )
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            self._client = self._create_client(settings.S3_ENDPOINT_URL)
+        return self._client
+
+    @property
+    def presign_client(self) -> Any:
+        """預簽網址使用瀏覽器可存取的端點（S3_PUBLIC_ENDPOINT_URL）"""
+        if self._presign_client is None:
+            public_endpoint = settings.S3_PUBLIC_ENDPOINT_URL or settings.S3_ENDPOINT_URL
+            if public_endpoint == settings.S3_ENDPOINT_URL:
+                self._presign_client = self.client
+            else:
+                self._presign_client = self._create_client(public_endpoint)
+        return self._presign_client
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if self._is_not_found(e):
+                return False
+            raise
+        return True
+
+    def put_file(self, key: str, source: Path) -> None:
+        # upload_file 以分段上傳串流讀取檔案；物件在上傳完成後才可見
+        self.client.upload_file(
+            str(source), self.bucket, self._object_key(key),
+            ExtraArgs={"ContentType": _media_type(key)},
+        )
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=self._object_key(key), Body=data, ContentType=_media_type(key)
+        )
+
+    def get_file(self, key: str, destination: Path) -> bool:
+        from botocore.exceptions import ClientError
+
+        # 下載到暫存檔，完成後才出現在 destination
+        tmp_path = destination.with_name(f".{destination.name}-{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            self.client.download_file(self.bucket, self._object_key(key), str(tmp_path))
+        except ClientError as e:
+            tmp_path.unlink(missing_ok=True)
+            if self._is_not_found(e):
+                return False
+            raise
+        os.replace(tmp_path, destination)
+        return True
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if self._is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+        body = response["Body"]
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def list_keys(self, prefix: str) -> List[str]:
+        keys = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._object_key(prefix)):
+            keys.extend(item["Key"][len(self.prefix):] for item in page.get("Contents", []))
+        return keys
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def presigned_url(self, key: str, filename: str, ttl_seconds: int) -> str:
+        from urllib.parse import quote
+
+        return self.presign_client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._object_key(key),
+                "ResponseContentType": _media_type(key),
+                "ResponseContentDisposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+            },
+            ExpiresIn=ttl_seconds,
+        )
+
+    def expire(self, ttl_days: int) -> int:
+        """設定生成結果前置詞的生命週期規則（保留儲存桶中其他規則；每個行程只設定一次）"""
+        from botocore.exceptions import ClientError
+
+        if ttl_days <= 0 or self._lifecycle_days == ttl_days:
+            return 0
+
+        try:
+            rules = self.client.get_bucket_lifecycle_configuration(Bucket=self.bucket)["Rules"]
+        except ClientError as e:
+            if getattr(e, "response", {}).get("Error", {}).get("Code") != "NoSuchLifecycleConfiguration":
+                raise
+            rules = []
+        rules = [rule for rule in rules if rule.get("ID") != self.LIFECYCLE_RULE_ID]
+        rules.append({
+            "ID": self.LIFECYCLE_RULE_ID,
+            "Filter": {"Prefix": self.prefix},
+            "Status": "Enabled",
+            "Expiration": {"Days": ttl_days},
+        })
+        self.client.put_bucket_lifecycle_configuration(
+            Bucket=self.bucket, LifecycleConfiguration={"Rules": rules}
+        )
+        self._lifecycle_days = ttl_days
+        return 0
+
+    def check(self) -> str:
+        self.client.head_bucket(Bucket=self.bucket)
+        return f"s3://{self.bucket}/{self.prefix}"
+
+
+def create_artifact_storage() -> ArtifactStorage:
+    """依 ARTIFACT_STORAGE 建立儲存後端"""
+    if settings.ARTIFACT_STORAGE == "s3":
+        return S3ArtifactStorage()
+    if settings.ARTIFACT_STORAGE != "local":
+        raise ValueError(f"未知的 ARTIFACT_STORAGE: {settings.ARTIFACT_STORAGE}")
+    return LocalArtifactStorage(settings.ARTIFACT_CACHE_DIR)
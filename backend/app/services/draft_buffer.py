@@ -0,0 +1,272 @@
+"""
+草稿寫入緩衝（write-behind）
+
+將同一使用者短時間內的多次草稿儲存合併為一次資料庫寫入。
+
+耐久性保證：
+- 每位使用者的第一次儲存、以及距離上次寫入超過 DRAFT_FLUSH_INTERVAL_SECONDS
+  的儲存會立即寫入資料庫
+- 其餘儲存只保留在記憶體中（僅保留最新的 form_data），最遲在
+  DRAFT_FLUSH_INTERVAL_SECONDS 秒後寫入
+- 提交申請表、增量儲存（PATCH）、帶 flush=true 的儲存、以及應用正常關閉時
+  會立即寫入
+- 行程異常終止（OOM、SIGKILL）時，最多遺失最後 DRAFT_FLUSH_INTERVAL_SECONDS
+  秒內的草稿修改；已提交的申請表不受影響
+- 同一行程內讀取草稿會看到緩衝中的最新內容
+
+緩衝只存在於單一行程中：多個 worker 時，同一使用者的請求可能分散到不同
+worker，各自的緩衝會互相覆蓋或讀到過期內容，因此 WORKERS > 1 時停用緩衝。
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+from ..config import settings
+from ..models.draft import Draft, DraftCreate
+from ..utils.metrics import DRAFT_DATABASE_WRITES, DRAFT_SAVE_REQUESTS
+from .draft_service import DraftService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BufferedDraft:
+    """單一使用者的緩衝狀態"""
+    submitter_student_id: str
+    persisted: Optional[Draft] = None  # 最後一次寫入資料庫的草稿
+    pending: Optional[DraftCreate] = None  # 尚未寫入的最新內容
+    pending_at: Optional[datetime] = None
+    last_flush: float = 0.0  # time.monotonic()
+    timer: Optional[asyncio.Task] = field(default=None, repr=False)
+    # 寫入資料庫期間持有；刪除草稿前等待，避免進行中的寫入在刪除後才完成
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+class DraftWriteBuffer:
+    """草稿寫入緩衝（以 submitter_id 為鍵）"""
+
+    # 超過此數量時清除沒有待寫入內容的閒置項目
+    MAX_IDLE_ENTRIES = 4096
+
+    def __init__(self, flush_interval: Optional[float] = None):
+        self._flush_interval = flush_interval
+        self._entries: Dict[str, _BufferedDraft] = {}
+        self.save_requests = 0
+        self.database_writes = 0
+
+    @property
+    def flush_interval(self) -> float:
+        """每位使用者兩次寫入之間的最短間隔（秒），0 表示停用緩衝"""
+        if self._flush_interval is not None:
+            return self._flush_interval
+        if settings.worker_count > 1:
+            return 0.0
+        return settings.DRAFT_FLUSH_INTERVAL_SECONDS
+
+    async def save(
+        self,
+        draft_data: DraftCreate,
+        submitter_id: str,
+        submitter_student_id: str,
+        flush: bool = False
+    ) -> Draft:
+        """
+        儲存草稿（可能只寫入緩衝）
+
+        Args:
+            draft_data: 草稿資料
+            submitter_id: 提交者使用者 ID
+            submitter_student_id: 提交者學號
+            flush: 是否立即寫入資料庫
+
+        Returns:
+            Draft: 草稿（緩衝中時為反映最新內容、尚未寫入的副本）
+        """
+        self.save_requests += 1
+        DRAFT_SAVE_REQUESTS.inc()
+        entry = self._entries.get(submitter_id)
+        if entry is None:
+            self._prune_idle()
+            entry = self._entries[submitter_id] = _BufferedDraft(submitter_student_id)
+
+        # 與已寫入的內容相同：不需要寫入。寫入進行中時 persisted 尚未更新
+        # （資料庫即將變成寫入中的內容），不能以此判斷
+        if (
+            entry.persisted is not None
+            and not entry.lock.locked()
+            and entry.persisted.content_hash == DraftService.compute_content_hash(draft_data.form_data)
+        ):
+            entry.pending = None
+            entry.pending_at = None
+            return entry.persisted
+
+        entry.pending = draft_data
+        entry.pending_at = datetime.utcnow()
+
+        elapsed = time.monotonic() - entry.last_flush
+        if flush or entry.persisted is None or elapsed >= self.flush_interval:
+            return await self._flush_entry(submitter_id, entry)
+
+        if entry.timer is None or entry.timer.done():
+            entry.timer = asyncio.create_task(
+                self._delayed_flush(submitter_id, self.flush_interval - elapsed)
+            )
+
+        return self._overlay(entry)
+
+    def get_pending(self, submitter_id: str) -> Optional[Draft]:
+        """
+        取得緩衝中尚未寫入的草稿
+
+        Args:
+            submitter_id: 提交者使用者 ID
+
+        Returns:
+            Optional[Draft]: 緩衝中的草稿，沒有待寫入內容返回 None
+        """
+        entry = self._entries.get(submitter_id)
+        if entry is None or entry.pending is None or entry.persisted is None:
+            return None
+        return self._overlay(entry)
+
+    async def flush(self, submitter_id: str) -> Optional[Draft]:
+        """
+        立即寫入指定使用者緩衝中的草稿
+
+        Args:
+            submitter_id: 提交者使用者 ID
+
+        Returns:
+            Optional[Draft]: 寫入後的草稿，沒有待寫入內容返回 None
+        """
+        entry = self._entries.get(submitter_id)
+        if entry is None or entry.pending is None:
+            return None
+        return await self._flush_entry(submitter_id, entry)
+
+    async def flush_all(self) -> int:
+        """
+        寫入所有緩衝中的草稿（應用關閉時呼叫）
+
+        Returns:
+            int: 寫入的草稿數量
+        """
+        flushed = 0
+        for submitter_id in list(self._entries):
+            if await self.flush(submitter_id) is not None:
+                flushed += 1
+        return flushed
+
+    async def release(self, submitter_id: str) -> None:
+        """
+        寫入緩衝內容並移除該使用者的緩衝狀態
+
+        在繞過緩衝直接修改資料庫草稿之前呼叫（例如增量儲存），
+        避免之後以過期的快取判斷內容是否相同。
+
+        Args:
+            submitter_id: 提交者使用者 ID
+        """
+        await self.flush(submitter_id)
+        await self.discard(submitter_id)
+
+    async def discard(self, submitter_id: str) -> None:
+        """
+        丟棄指定使用者的緩衝內容（刪除草稿前呼叫）
+
+        取消延遲寫入，並等待進行中的寫入完成後才返回，之後刪除的草稿
+        不會被較早開始的寫入重新建立。
+
+        Args:
+            submitter_id: 提交者使用者 ID
+        """
+        entry = self._entries.pop(submitter_id, None)
+        if entry is None:
+            return
+        if entry.timer and not entry.timer.done():
+            entry.timer.cancel()
+        entry.pending = None
+        entry.pending_at = None
+        async with entry.lock:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """
+        緩衝統計
+
+        Returns:
+            Dict: 儲存請求數、資料庫寫入數、待寫入數與寫入減少比例
+        """
+        reduction = 0.0
+        if self.save_requests:
+            reduction = 1 - self.database_writes / self.save_requests
+        return {
+            "save_requests": self.save_requests,
+            "database_writes": self.database_writes,
+            "pending": sum(1 for entry in self._entries.values() if entry.pending is not None),
+            "write_reduction_ratio": round(reduction, 4),
+        }
+
+    async def _delayed_flush(self, submitter_id: str, delay: float) -> None:
+        """等待間隔後寫入"""
+        await asyncio.sleep(max(delay, 0))
+        entry = self._entries.get(submitter_id)
+        if entry is None or entry.pending is None:
+            return
+        entry.timer = None
+        try:
+            await self._flush_entry(submitter_id, entry)
+        except Exception:
+            # 寫入失敗時保留內容，等待下一次儲存或關閉時再寫入
+            logger.exception("草稿延遲寫入失敗 (submitter_id=%s)", submitter_id)
+
+    async def _flush_entry(self, submitter_id: str, entry: _BufferedDraft) -> Draft:
+        """寫入緩衝內容並更新狀態"""
+        # 在取得鎖之前取出內容：等待期間被丟棄（刪除草稿）時仍依請求順序寫入，
+        # 刪除會等待此寫入完成
+        draft_data = entry.pending
+        entry.pending = None
+        entry.pending_at = None
+        entry.last_flush = time.monotonic()
+
+        async with entry.lock:
+            try:
+                draft = await DraftService().create_or_update_draft(
+                    draft_data=draft_data,
+                    submitter_id=submitter_id,
+                    submitter_student_id=entry.submitter_student_id,
+                )
+            except Exception:
+                # 寫入失敗：若期間沒有更新的內容、且未被丟棄，放回緩衝
+                if entry.pending is None and self._entries.get(submitter_id) is entry:
+                    entry.pending = draft_data
+                raise
+
+            self.database_writes += 1
+            DRAFT_DATABASE_WRITES.inc()
+            entry.persisted = draft
+            return draft
+
+    def _overlay(self, entry: _BufferedDraft) -> Draft:
+        """以最後寫入的草稿為基礎，套用緩衝中的最新內容"""
+        return entry.persisted.model_copy(update={
+            "form_data": entry.pending.form_data,
+            "content_hash": DraftService.compute_content_hash(entry.pending.form_data),
+            "updated_at": entry.pending_at,
+        })
+
+    def _prune_idle(self) -> None:
+        """清除沒有待寫入內容、且已超過寫入間隔的項目"""
+        if len(self._entries) < self.MAX_IDLE_ENTRIES:
+            return
+        now = time.monotonic()
+        for submitter_id, entry in list(self._entries.items()):
+            if entry.pending is None and now - entry.last_flush >= self.flush_interval:
+                del self._entries[submitter_id]
+
+
+# 全域草稿寫入緩衝例項
+draft_write_buffer = DraftWriteBuffer()
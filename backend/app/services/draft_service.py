@@ -1,15 +1,125 @@
 """
 草稿服務層 - 處理草稿的 CRUD 操作
 """
-from typing import Optional
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
-from beanie import PydanticObjectId
-from ..models.draft import Draft, DraftCreate, DraftUpdate
+from beanie import UpdateResponse
+from pymongo import ReturnDocument
+from ..models.draft import Draft, DraftCreate, DraftPatchOperation
 
 
 class DraftService:
     """草稿服務"""
 
+    # 每位使用者最後一次寫入內容的雜湊（submitter_id -> content_hash，
+    # 增量儲存為 "patch:" + patch_hash）
+    # 僅作為「可能重複」的提示，實際是否略過以資料庫中的 content_hash / patch_hash 為準
+    _last_hashes: "OrderedDict[str, str]" = OrderedDict()
+    MAX_CACHED_HASHES = 4096
+
+    @staticmethod
+    def compute_content_hash(payload: Any) -> str:
+        """
+        計算內容雜湊（鍵排序後的 JSON 做 SHA-256）
+
+        Args:
+            payload: 可 JSON 序列化的內容
+
+        Returns:
+            str: 十六進位雜湊字串
+        """
+        canonical = json.dumps(
+            payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _remember_hash(cls, submitter_id: str, content_hash: str) -> None:
+        """記錄使用者最後寫入的雜湊（LRU，超過上限時淘汰最舊的）"""
+        cls._last_hashes[submitter_id] = content_hash
+        cls._last_hashes.move_to_end(submitter_id)
+        while len(cls._last_hashes) > cls.MAX_CACHED_HASHES:
+            cls._last_hashes.popitem(last=False)
+
+    @classmethod
+    def _is_probably_unchanged(cls, submitter_id: str, content_hash: str) -> bool:
+        """依記憶體中的雜湊判斷內容是否可能未變更"""
+        return cls._last_hashes.get(submitter_id) == content_hash
+
+    @staticmethod
+    def _pointer_to_path(pointer: str) -> str:
+        """
+        將 JSON Pointer 轉換為 form_data 下的 MongoDB 點號路徑
+
+        Args:
+            pointer: JSON Pointer，例如 /members/0/student_name
+
+        Returns:
+            str: 例如 form_data.members.0.student_name
+
+        Raises:
+            ValueError: 路徑格式不正確、包含 MongoDB 不允許的欄位名稱，或使用陣列附加位置 '-'
+        """
+        if pointer == "":
+            return "form_data"
+        if not pointer.startswith("/"):
+            raise ValueError(f"無效的路徑: {pointer}")
+
+        segments = []
+        for raw in pointer[1:].split("/"):
+            segment = raw.replace("~1", "/").replace("~0", "~")
+            if not segment or "." in segment or segment.startswith("$"):
+                raise ValueError(f"無效的路徑: {pointer}")
+            if segment == "-":
+                # JSON Pointer 的陣列附加位置，MongoDB 點號路徑沒有對應寫法
+                raise ValueError(f"不支援陣列附加路徑 '-': {pointer}")
+            segments.append(segment)
+
+        return "form_data." + ".".join(segments)
+
+    @classmethod
+    def build_patch_update(cls, operations: List[DraftPatchOperation]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        將增量操作轉換為 $set / $unset 內容
+
+        同一路徑出現多次時以最後一次為準；互相包含的路徑（如 /members
+        與 /members/0）會造成 MongoDB 路徑衝突，因此拒絕。
+
+        Args:
+            operations: 增量操作列表
+
+        Returns:
+            Tuple: ($set 內容, $unset 內容)
+
+        Raises:
+            ValueError: 路徑無效或互相衝突
+        """
+        latest: Dict[str, DraftPatchOperation] = {}
+        for operation in operations:
+            latest[cls._pointer_to_path(operation.path)] = operation
+
+        paths = sorted(latest)
+        for parent, child in zip(paths, paths[1:]):
+            if child.startswith(parent + "."):
+                raise ValueError(f"路徑互相衝突: {parent} 與 {child}")
+
+        set_fields: Dict[str, Any] = {}
+        unset_fields: Dict[str, str] = {}
+        for path, operation in latest.items():
+            if operation.op == "remove":
+                if path == "form_data":
+                    set_fields[path] = {}
+                else:
+                    # 注意：對陣列元素 $unset 會留下 null，而非移除該元素
+                    unset_fields[path] = ""
+            else:
+                set_fields[path] = operation.value
+
+        return set_fields, unset_fields
+
     async def get_draft_by_user(self, submitter_id: str) -> Optional[Draft]:
         """
         獲取使用者的草稿（每個使用者只有一份草稿）
@@ -31,6 +141,8 @@ class DraftService:
         """
         建立或更新草稿（每個使用者只保留一份草稿）
 
+        內容與上次寫入相同時不寫入資料庫，直接返回現有草稿。
+
         Args:
             draft_data: 草稿資料
             submitter_id: 提交者使用者 ID
@@ -39,24 +151,101 @@ class DraftService:
         Returns:
             Draft: 草稿物件
         """
-        # 檢查是否已有草稿
-        existing_draft = await self.get_draft_by_user(submitter_id)
-
-        if existing_draft:
-            # 更新現有草稿
-            existing_draft.form_data = draft_data.form_data
-            existing_draft.updated_at = datetime.utcnow()
-            await existing_draft.save()
-            return existing_draft
-        else:
-            # 建立新草稿
-            draft = Draft(
-                submitter_id=submitter_id,
-                submitter_student_id=submitter_student_id,
-                form_data=draft_data.form_data,
+        content_hash = self.compute_content_hash(draft_data.form_data)
+
+        if self._is_probably_unchanged(submitter_id, content_hash):
+            existing_draft = await Draft.find_one(
+                Draft.submitter_id == submitter_id,
+                Draft.content_hash == content_hash,
+            )
+            if existing_draft:
+                return existing_draft
+
+        # 單次原子 upsert：存在則只 $set form_data，不存在則建立
+        now = datetime.utcnow()
+        draft = await Draft.find_one(Draft.submitter_id == submitter_id).update(
+            {
+                "$set": {
+                    "form_data": draft_data.form_data,
+                    "content_hash": content_hash,
+                    "updated_at": now,
+                },
+                # 完整內容已覆蓋之前的增量，相同的增量不能再被略過
+                "$unset": {"patch_hash": ""},
+                "$inc": {"revision": 1},
+                "$setOnInsert": {
+                    "submitter_student_id": submitter_student_id,
+                    "created_at": now,
+                },
+            },
+            response_type=UpdateResponse.NEW_DOCUMENT,
+            upsert=True,
+        )
+        self._remember_hash(submitter_id, content_hash)
+        return draft
+
+    async def patch_draft(
+        self,
+        operations: List[DraftPatchOperation],
+        submitter_id: str,
+        submitter_student_id: str
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        以增量操作更新草稿
+
+        所有操作合併成一次 upsert，只 $set / $unset 變更的點號路徑，
+        不重寫整份 form_data（含簽名 base64）。與上一次相同的增量內容
+        （patch_hash）會略過寫入。寫入後 form_data 的雜湊未知，content_hash
+        會被清除。草稿不存在時會建立；此時數字路徑片段會建立物件
+        而非陣列，因此第一次儲存建議使用完整儲存。
+
+        Args:
+            operations: 增量操作列表
+            submitter_id: 提交者使用者 ID
+            submitter_student_id: 提交者學號
+
+        Returns:
+            Tuple: (包含 revision / patch_hash / updated_at 的字典, 是否略過寫入)
+
+        Raises:
+            ValueError: 路徑無效或互相衝突
+        """
+        set_fields, unset_fields = self.build_patch_update(operations)
+        patch_hash = self.compute_content_hash(
+            [operation.model_dump() for operation in operations]
+        )
+        collection = Draft.get_motor_collection()
+        projection = {"revision": 1, "patch_hash": 1, "updated_at": 1}
+
+        has_changes = bool(set_fields or unset_fields)
+
+        if not has_changes or self._is_probably_unchanged(submitter_id, f"patch:{patch_hash}"):
+            state = await collection.find_one(
+                {"submitter_id": submitter_id}, projection=projection
             )
-            await draft.insert()
-            return draft
+            if state and (not has_changes or state.get("patch_hash") == patch_hash):
+                return state, True
+
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {
+            "$set": {**set_fields, "patch_hash": patch_hash, "updated_at": now},
+            # content_hash 只代表完整 form_data 的雜湊；增量後不重新讀取 form_data 計算，改為清除
+            "$unset": {**unset_fields, "content_hash": ""},
+            "$inc": {"revision": 1},
+            "$setOnInsert": {
+                "submitter_student_id": submitter_student_id,
+                "created_at": now,
+            },
+        }
+        state = await collection.find_one_and_update(
+            {"submitter_id": submitter_id},
+            update,
+            projection=projection,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self._remember_hash(submitter_id, f"patch:{patch_hash}")
+        return state, False
 
     async def delete_draft(self, submitter_id: str) -> bool:
         """
@@ -73,4 +262,5 @@ class DraftService:
             return False
 
         await draft.delete()
+        self._last_hashes.pop(submitter_id, None)
         return True
@@ -1,21 +1,28 @@
 """
 郵件通知服務 - 使用 Gmail SMTP 發送審核結果通知
 """
+import html
+import logging
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from pathlib import Path
 from typing import Optional, Tuple
-import traceback
+
+from ..config import settings
+from ..utils.metrics import EMAIL_SEND_DURATION
+
+logger = logging.getLogger(__name__)
 
 
 class EmailService:
     """郵件通知服務"""
 
-    # Gmail SMTP 設定
-    SMTP_SERVER = "smtp.gmail.com"
-    SMTP_PORT = 587
+    # SMTP 設定（預設為 Gmail；壓力測試時可指向本機的 SMTP sink）
+    SMTP_SERVER = settings.SMTP_HOST
+    SMTP_PORT = settings.SMTP_PORT
 
     @classmethod
     async def _get_credentials(cls) -> Tuple[Optional[str], Optional[str]]:
@@ -38,6 +45,8 @@ class EmailService:
         status: str,
         comment: Optional[str] = None,
         sender_email: str = "",
+        download_url: Optional[str] = None,
+        download_ttl_seconds: int = 0,
     ) -> MIMEMultipart:
         """
         建立審核結果通知郵件
@@ -49,6 +58,8 @@ class EmailService:
             status: 審核狀態（通過/未通過）
             comment: 審核意見
             sender_email: 寄件人 Email
+            download_url: 申請表 PDF 的下載連結（取代附件，可選）
+            download_ttl_seconds: 下載連結的有效時間（秒）
 
         Returns:
             MIMEMultipart: 郵件物件
@@ -68,6 +79,18 @@ class EmailService:
             status_color = "#dc3545"
             next_step_text = ""
 
+        # 下載連結（以連結取代 PDF 附件時）
+        download_html = ""
+        if download_url:
+            if download_ttl_seconds >= 86400:
+                ttl_text = f"{download_ttl_seconds // 86400} 天"
+            else:
+                ttl_text = f"{max(download_ttl_seconds // 3600, 1)} 小時"
+            download_html = (
+                f"<p><strong>📄 申請表 PDF：</strong><a href=\"{html.escape(download_url)}\">點此下載</a>"
+                f"（連結 {ttl_text}內有效）</p>"
+            )
+
         # HTML 郵件內容
         html_content = f"""
 <!DOCTYPE html>
@@ -150,6 +173,8 @@ class EmailService:
 
         {"<div class='comment-box'><p><strong>💬 審核意見：</strong></p><p>" + comment + "</p></div>" if comment else ""}
 
+        {download_html}
+
         <p>若您有任何疑問，請洽詢指導教師。</p>
 
         <p>祝學習順利！</p>
@@ -193,6 +218,8 @@ class EmailService:
         status: str,
         comment: Optional[str] = None,
         pdf_path: Optional[Path] = None,
+        download_url: Optional[str] = None,
+        download_ttl_seconds: int = 0,
     ) -> bool:
         """
         發送審核結果通知郵件
@@ -204,6 +231,8 @@ class EmailService:
             status: 審核狀態（通過/未通過）
             comment: 審核意見
             pdf_path: PDF 檔案路徑（可選）
+            download_url: 申請表 PDF 的下載連結（可選，郵件中顯示連結而不附加檔案）
+            download_ttl_seconds: 下載連結的有效時間（秒）
 
         Returns:
             bool: 是否發送成功
@@ -214,7 +243,7 @@ class EmailService:
 
             # 檢查是否已設定
             if not sender_email or not app_password:
-                print("郵件發送跳過（未設定 Gmail 帳號）")
+                logger.info("郵件發送跳過（未設定 Gmail 帳號）")
                 return False
 
             # 建立郵件
@@ -225,6 +254,8 @@ class EmailService:
                 status=status,
                 comment=comment,
                 sender_email=sender_email,
+                download_url=download_url,
+                download_ttl_seconds=download_ttl_seconds,
             )
 
             # 附加 PDF（如果有）
@@ -233,18 +264,24 @@ class EmailService:
                 cls._attach_pdf(msg, pdf_path, filename)
 
             # 發送郵件
-            with smtplib.SMTP(cls.SMTP_SERVER, cls.SMTP_PORT) as server:
-                server.starttls()
-                server.login(sender_email, app_password)
-                server.send_message(msg)
+            start = time.perf_counter()
+            try:
+                with smtplib.SMTP(cls.SMTP_SERVER, cls.SMTP_PORT) as server:
+                    if settings.SMTP_STARTTLS:
+                        server.starttls()
+                    server.login(sender_email, app_password)
+                    server.send_message(msg)
+            except Exception:
+                EMAIL_SEND_DURATION.labels("failure").observe(time.perf_counter() - start)
+                raise
+            EMAIL_SEND_DURATION.labels("success").observe(time.perf_counter() - start)
 
-            print(f"郵件發送成功: {recipient_email}")
+            logger.info("郵件發送成功: %s", recipient_email)
             return True
 
-        except Exception as e:
+        except Exception:
             # 錯誤記錄但不中斷流程
-            print(f"郵件發送失敗: {e}")
-            traceback.print_exc()
+            logger.exception("郵件發送失敗: %s", recipient_email)
             return False
 
     @classmethod
@@ -0,0 +1,423 @@
+"""
+申請表匯出服務
+
+以非同步游標與投影逐批讀取申請表（不載入簽章等大型欄位，也不會一次載入所有申請表）：
+- Excel（行政用）：以 openpyxl 唯寫模式逐列寫入，工作表內容先寫入暫存檔，記憶體用量與筆數無關。
+  XLSX 為 zip 格式，需寫完所有列後才能產生，因此先存成暫存檔再傳送。
+- 分析用欄式資料：申請表、組員、學習計畫項次攤平為三個資料表，每批寫入一個 Parquet row group
+  （或 Arrow IPC record batch）；依 updated_at 增量匯出，每次只處理上次匯出後變更的申請表。
+
+openpyxl 與 pyarrow 在第一次匯出時才載入。
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from beanie.odm.utils.projection import get_projection
+
+from ..config import settings
+from ..models.application import ApplicationExportRow, ApplicationStatus
+from ..utils.metrics import APPLICATION_EXPORT_ROWS
+from .application_service import ApplicationService
+
+logger = logging.getLogger(__name__)
+
+# openpyxl 不接受的控制字元（與 openpyxl.cell.cell.ILLEGAL_CHARACTERS_RE 相同）
+ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+
+class ApplicationExportService:
+    """申請表匯出服務"""
+
+    XLSX_HEADERS = (
+        "申請表ID", "計畫名稱", "審核狀態", "提交者學號", "組員人數",
+        "班級", "座號", "學號", "姓名",
+        "學習類別", "學習環境需求", "計畫項次數", "總時數", "成果發表形式", "手機使用規範",
+        "學習動機", "預期成效", "教師評語", "建立時間（UTC）", "更新時間（UTC）",
+    )
+    # 欄寬（字元數），依 XLSX_HEADERS 順序
+    XLSX_COLUMN_WIDTHS = (26, 30, 10, 12, 10, 14, 10, 28, 24, 30, 30, 10, 10, 20, 12, 50, 50, 30, 20, 20)
+
+    @staticmethod
+    def build_filter(
+        status: Optional[ApplicationStatus] = None,
+        student_class: Optional[str] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        建立匯出條件
+
+        Args:
+            status: 審核狀態
+            student_class: 任一組員的班級
+            created_from: 建立日期起（含，UTC）
+            created_to: 建立日期迄（含，UTC）
+
+        Returns:
+            Dict: MongoDB 查詢條件
+        """
+        query: Dict[str, Any] = {}
+        if status:
+            query["status"] = status.value
+        if student_class:
+            query["members.student_class"] = student_class
+        created_at: Dict[str, datetime] = {}
+        if created_from:
+            created_at["$gte"] = datetime.combine(created_from, time.min)
+        if created_to:
+            created_at["$lt"] = datetime.combine(created_to + timedelta(days=1), time.min)
+        if created_at:
+            query["created_at"] = created_at
+        return query
+
+    async def iter_batches(
+        self,
+        query: Dict[str, Any],
+        sort_field: str = "created_at"
+    ) -> AsyncIterator[List[ApplicationExportRow]]:
+        """
+        依時間順序逐批讀取符合條件的申請表（每批 EXPORT_BATCH_SIZE 筆）
+
+        Args:
+            query: MongoDB 查詢條件
+            sort_field: 排序欄位（created_at 或 updated_at）
+
+        Yields:
+            List[ApplicationExportRow]: 一批申請表
+        """
+        batch_size = max(settings.EXPORT_BATCH_SIZE, 1)
+        cursor = ApplicationService._reporting_collection().find(
+            query,
+            projection=get_projection(ApplicationExportRow),
+            batch_size=batch_size,
+        ).sort([(sort_field, 1), ("_id", 1)])
+
+        batch: List[ApplicationExportRow] = []
+        async for document in cursor:
+            batch.append(ApplicationExportRow.model_validate(document))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def selected_names(options: Optional[Dict[str, bool]]) -> List[str]:
+        """勾選的選項名稱"""
+        return [name for name, checked in (options or {}).items() if checked]
+
+    @classmethod
+    def selected(cls, options: Optional[Dict[str, bool]], other: Optional[str] = None) -> str:
+        """勾選的選項（與其他說明），以頓號分隔"""
+        names = cls.selected_names(options)
+        if other:
+            names.append(f"其他：{other}")
+        return "、".join(names)
+
+    @staticmethod
+    def parse_hours(hours: Optional[str]) -> Optional[float]:
+        """時數（無法解析時返回 None）"""
+        try:
+            return float(hours)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def total_hours(cls, row: ApplicationExportRow) -> float:
+        """學習內容規劃的總時數（無法解析的時數不計入）"""
+        return sum(filter(None, (cls.parse_hours(item.hours) for item in row.plan_items)), 0.0)
+
+    @classmethod
+    def _xlsx_values(cls, row: ApplicationExportRow) -> List[Any]:
+        members = row.members
+
+        def join(field: str) -> str:
+            return "、".join(getattr(member, field) or "" for member in members)
+
+        return [
+            str(row.id),
+            row.title,
+            row.status.value,
+            row.submitter_student_id,
+            len(members),
+            join("student_class"),
+            join("student_seat"),
+            join("student_id"),
+            join("student_name"),
+            cls.selected(row.learning_categories, row.learning_category_other),
+            cls.selected(row.env_needs, row.env_other),
+            len(row.plan_items),
+            cls.total_hours(row),
+            cls.selected(row.presentation_formats, row.presentation_other),
+            row.phone_agreement or "",
+            row.motivation,
+            row.expected_outcome or "",
+            row.comment or "",
+            row.created_at,
+            row.updated_at,
+        ]
+
+    @staticmethod
+    def _xlsx_cell(sheet: Any, value: Any) -> Any:
+        """文字一律存為字串（開頭為 = 的內容不會被當成公式）"""
+        if not isinstance(value, str):
+            return value
+        from openpyxl.cell import WriteOnlyCell
+
+        cell = WriteOnlyCell(sheet, ILLEGAL_CHARACTERS_RE.sub("", value))
+        cell.data_type = "s"
+        return cell
+
+    @classmethod
+    def _append_rows(cls, sheet: Any, rows: List[ApplicationExportRow]) -> None:
+        for row in rows:
+            sheet.append([cls._xlsx_cell(sheet, value) for value in cls._xlsx_values(row)])
+
+    async def export_xlsx(self, query: Dict[str, Any]) -> Path:
+        """
+        匯出符合條件的申請表為 XLSX
+
+        Args:
+            query: MongoDB 查詢條件（build_filter）
+
+        Returns:
+            Path: XLSX 暫存檔路徑（使用後由呼叫者刪除）
+        """
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("申請表")
+        for index, width in enumerate(self.XLSX_COLUMN_WIDTHS, 1):
+            sheet.column_dimensions[get_column_letter(index)].width = width
+        sheet.freeze_panes = "A2"
+        sheet.append(list(self.XLSX_HEADERS))
+
+        async for batch in self.iter_batches(query):
+            # 寫入在執行緒中進行，讀取下一批時不阻塞事件迴圈
+            await asyncio.to_thread(self._append_rows, sheet, batch)
+            APPLICATION_EXPORT_ROWS.labels("xlsx").inc(len(batch))
+
+        fd, path = tempfile.mkstemp(prefix="applications-", suffix=".xlsx")
+        os.close(fd)
+        try:
+            await asyncio.to_thread(workbook.save, path)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return Path(path)
+
+    # ==================== 分析用欄式資料 ====================
+
+    ANALYTICS_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+    ANALYTICS_TABLES = ("applications", "members", "plan_items")
+    ANALYTICS_STATE_FILE = "_state.json"
+    # 只匯出此秒數之前更新的申請表：正在寫入的申請表留到下次匯出，不會因時間相同而遺漏
+    ANALYTICS_WATERMARK_LAG_SECONDS = 60
+
+    @staticmethod
+    def _analytics_schemas() -> Dict[str, Any]:
+        import pyarrow as pa
+
+        timestamp = pa.timestamp("ms")
+        selected = pa.list_(pa.string())
+        return {
+            "applications": pa.schema([
+                ("application_id", pa.string()),
+                ("title", pa.string()),
+                ("status", pa.string()),
+                ("submitter_student_id", pa.string()),
+                ("member_count", pa.int16()),
+                ("plan_item_count", pa.int16()),
+                ("total_hours", pa.float64()),
+                ("learning_categories", selected),
+                ("learning_category_other", pa.string()),
+                ("env_needs", selected),
+                ("env_other", pa.string()),
+                ("presentation_formats", selected),
+                ("presentation_other", pa.string()),
+                ("phone_agreement", pa.string()),
+                ("created_at", timestamp),
+                ("updated_at", timestamp),
+            ]),
+            "members": pa.schema([
+                ("application_id", pa.string()),
+                ("position", pa.int16()),
+                ("student_id", pa.string()),
+                ("student_class", pa.string()),
+                ("student_seat", pa.string()),
+                ("student_name", pa.string()),
+                ("updated_at", timestamp),
+            ]),
+            "plan_items": pa.schema([
+                ("application_id", pa.string()),
+                ("position", pa.int16()),
+                ("date", pa.string()),
+                ("content", pa.string()),
+                ("hours", pa.float64()),
+                ("hours_raw", pa.string()),
+                ("updated_at", timestamp),
+            ]),
+        }
+
+    @classmethod
+    def _analytics_rows(cls, rows: List[ApplicationExportRow]) -> Dict[str, List[Dict[str, Any]]]:
+        """將一批申請表攤平為三個資料表的列（組員與項次以 application_id 與 updated_at 對應）"""
+        tables: Dict[str, List[Dict[str, Any]]] = {name: [] for name in cls.ANALYTICS_TABLES}
+        for row in rows:
+            application_id = str(row.id)
+            tables["applications"].append({
+                "application_id": application_id,
+                "title": row.title,
+                "status": row.status.value,
+                "submitter_student_id": row.submitter_student_id,
+                "member_count": len(row.members),
+                "plan_item_count": len(row.plan_items),
+                "total_hours": cls.total_hours(row),
+                "learning_categories": cls.selected_names(row.learning_categories),
+                "learning_category_other": row.learning_category_other or None,
+                "env_needs": cls.selected_names(row.env_needs),
+                "env_other": row.env_other or None,
+                "presentation_formats": cls.selected_names(row.presentation_formats),
+                "presentation_other": row.presentation_other or None,
+                "phone_agreement": row.phone_agreement or None,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+            })
+            for position, member in enumerate(row.members, 1):
+                tables["members"].append({
+                    "application_id": application_id,
+                    "position": position,
+                    "student_id": member.student_id,
+                    "student_class": member.student_class,
+                    "student_seat": member.student_seat,
+                    "student_name": member.student_name,
+                    "updated_at": row.updated_at,
+                })
+            for position, item in enumerate(row.plan_items, 1):
+                tables["plan_items"].append({
+                    "application_id": application_id,
+                    "position": position,
+                    "date": item.date,
+                    "content": item.content,
+                    "hours": cls.parse_hours(item.hours),
+                    "hours_raw": item.hours,
+                    "updated_at": row.updated_at,
+                })
+        return tables
+
+    @classmethod
+    def read_analytics_watermark(cls, output_dir: Path) -> Optional[datetime]:
+        """上次匯出的 updated_at 上限（尚未匯出過返回 None）"""
+        try:
+            state = json.loads((output_dir / cls.ANALYTICS_STATE_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        return datetime.fromisoformat(state["watermark"])
+
+    @classmethod
+    def _write_analytics_watermark(cls, output_dir: Path, watermark: datetime, file_format: str) -> None:
+        state_path = output_dir / cls.ANALYTICS_STATE_FILE
+        tmp_path = state_path.with_name(f".{state_path.name}.tmp")
+        tmp_path.write_text(
+            json.dumps({"watermark": watermark.isoformat(), "format": file_format}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, state_path)
+
+    async def export_analytics(
+        self,
+        output_dir: Path,
+        file_format: str = "parquet",
+        full: bool = False
+    ) -> Dict[str, int]:
+        """
+        增量匯出分析用欄式資料
+
+        每次匯出在 {output_dir}/{資料表}/ 下新增一個檔案，只包含上次匯出後（依 updated_at）
+        變更的申請表；同一份申請表可能出現在多個檔案中，分析時以 application_id 取 updated_at
+        最新的一筆（組員與項次取 updated_at 相同的列）。刪除的申請表不會出現在增量檔案中。
+
+        Args:
+            output_dir: 輸出目錄（保存上次匯出的 updated_at）
+            file_format: parquet 或 arrow（Arrow IPC）
+            full: 忽略上次匯出的時間，匯出所有申請表
+
+        Returns:
+            Dict[str, int]: 各資料表匯出的列數
+        """
+        if file_format not in self.ANALYTICS_FORMATS:
+            raise ValueError(f"未知的匯出格式: {file_format}")
+        import pyarrow as pa
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        since = None if full else self.read_analytics_watermark(output_dir)
+        # Mongo 的時間精度為毫秒
+        until = datetime.utcnow().replace(microsecond=0) - timedelta(seconds=self.ANALYTICS_WATERMARK_LAG_SECONDS)
+        updated_at: Dict[str, datetime] = {"$lte": until}
+        if since is not None:
+            if since >= until:
+                return {name: 0 for name in self.ANALYTICS_TABLES}
+            updated_at["$gt"] = since
+
+        suffix = self.ANALYTICS_FORMATS[file_format]
+        file_name = f"{'full' if since is None else 'delta'}-{until.strftime('%Y%m%dT%H%M%S')}{suffix}"
+        schemas = self._analytics_schemas()
+        # 資料表名稱 -> (writer, 暫存檔, 目標檔案)；第一批有資料時才建立檔案
+        writers: Dict[str, Tuple[Any, Path, Path]] = {}
+        counts = {name: 0 for name in self.ANALYTICS_TABLES}
+
+        def open_writer(name: str) -> Tuple[Any, Path, Path]:
+            table_dir = output_dir / name
+            table_dir.mkdir(exist_ok=True)
+            path = table_dir / file_name
+            tmp_path = table_dir / f".{file_name}.tmp"
+            if file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                writer = pq.ParquetWriter(tmp_path, schemas[name], compression="zstd")
+            else:
+                writer = pa.ipc.new_file(str(tmp_path), schemas[name])
+            return writer, tmp_path, path
+
+        def write_batch(rows: List[ApplicationExportRow]) -> None:
+            for name, table_rows in self._analytics_rows(rows).items():
+                if not table_rows:
+                    continue
+                if name not in writers:
+                    writers[name] = open_writer(name)
+                # Parquet 每批一個 row group，Arrow IPC 每批一個 record batch
+                table = pa.Table.from_pylist(table_rows, schema=schemas[name])
+                writers[name][0].write_table(table)
+                counts[name] += len(table_rows)
+
+        try:
+            async for batch in self.iter_batches({"updated_at": updated_at}, sort_field="updated_at"):
+                await asyncio.to_thread(write_batch, batch)
+                APPLICATION_EXPORT_ROWS.labels(file_format).inc(len(batch))
+            for writer, tmp_path, path in writers.values():
+                writer.close()
+                os.replace(tmp_path, path)
+        except BaseException:
+            for writer, tmp_path, _ in writers.values():
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+                tmp_path.unlink(missing_ok=True)
+            raise
+
+        # 所有檔案寫入完成後才更新時間，中斷時下次重新匯出同一範圍
+        await asyncio.to_thread(self._write_analytics_watermark, output_dir, until, file_format)
+        logger.info(
+            "分析用資料匯出完成（%s，%s ~ %s）: %s",
+            file_format, since.isoformat() if since else "全部", until.isoformat(), counts
+        )
+        return counts
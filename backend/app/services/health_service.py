@@ -0,0 +1,188 @@
+"""
+健康檢查服務 - 檢查各項依賴是否可用並量測延遲
+"""
+import asyncio
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..config import settings
+from ..database import mongodb_client
+from .artifact_cache import artifact_cache
+from .pdf_service import PDFService
+
+# 檢查失敗時 readiness 返回 503 的依賴；其他依賴失敗只標示為 degraded
+CRITICAL_CHECKS = ("mongodb", "template", "libreoffice", "font")
+
+
+@dataclass
+class _CachedResult:
+    result: Dict[str, Any]
+    expires_at: float
+
+
+class HealthService:
+    """依賴檢查（LibreOffice 與 SMTP 的結果會快取，避免每次探測都啟動程序或連線）"""
+
+    _cache: Dict[str, _CachedResult] = {}
+
+    @staticmethod
+    async def _timed(check: Callable[[], Awaitable[Optional[str]]], timeout: float) -> Dict[str, Any]:
+        """
+        執行單項檢查並記錄延遲
+
+        Args:
+            check: 檢查函數，成功時可返回補充說明，失敗時拋出例外
+            timeout: 逾時秒數
+
+        Returns:
+            Dict: {"status": "ok" | "error", "latency_ms": ..., "detail"/"error": ...}
+        """
+        start = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(check(), timeout=timeout)
+            result: Dict[str, Any] = {"status": "ok"}
+            if detail:
+                result["detail"] = detail
+        except asyncio.TimeoutError:
+            result = {"status": "error", "error": f"逾時（{timeout} 秒）"}
+        except Exception as e:
+            result = {"status": "error", "error": str(e) or type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    @classmethod
+    async def _cached(cls, name: str, check: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """返回快取中的檢查結果，過期時重新檢查"""
+        now = time.monotonic()
+        cached = cls._cache.get(name)
+        if cached and cached.expires_at > now:
+            return {**cached.result, "cached": True}
+
+        result = await check()
+        cls._cache[name] = _CachedResult(result, now + settings.HEALTH_CACHE_SECONDS)
+        return {**result, "cached": False}
+
+    async def check_mongodb(self) -> Dict[str, Any]:
+        """以 ping 指令確認 MongoDB 可連線"""
+        async def ping() -> None:
+            if mongodb_client.client is None:
+                raise RuntimeError("尚未連線")
+            await mongodb_client.client.admin.command("ping")
+
+        return await self._timed(ping, settings.HEALTH_MONGODB_TIMEOUT_SECONDS)
+
+    async def check_template(self) -> Dict[str, Any]:
+        """確認 Word 模板存在"""
+        async def exists() -> str:
+            if not PDFService.TEMPLATE_PATH.exists():
+                raise FileNotFoundError(f"Word 模板不存在: {PDFService.TEMPLATE_PATH}")
+            return str(PDFService.TEMPLATE_PATH)
+
+        return await self._timed(exists, 1.0)
+
+    async def check_font(self) -> Dict[str, Any]:
+        """確認原生 PDF 生成使用的中文字型存在"""
+        async def exists() -> str:
+            if not Path(settings.PDF_FONT_PATH).exists():
+                raise FileNotFoundError(f"字型不存在: {settings.PDF_FONT_PATH}")
+            return settings.PDF_FONT_PATH
+
+        return await self._timed(exists, 1.0)
+
+    async def check_libreoffice(self) -> Dict[str, Any]:
+        """確認 LibreOffice 可執行（結果快取）"""
+        async def version() -> str:
+            binary = shutil.which("libreoffice")
+            if binary is None:
+                raise FileNotFoundError("找不到 libreoffice 執行檔")
+            result = await asyncio.to_thread(
+                subprocess.run,
+                [binary, "--headless", "--version"],
+                capture_output=True,
+                text=True,
+                timeout=settings.HEALTH_LIBREOFFICE_TIMEOUT_SECONDS,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or f"結束碼 {result.returncode}")
+            return result.stdout.strip()
+
+        return await self._cached(
+            "libreoffice",
+            lambda: self._timed(version, settings.HEALTH_LIBREOFFICE_TIMEOUT_SECONDS + 1),
+        )
+
+    async def check_smtp(self) -> Dict[str, Any]:
+        """確認 SMTP 伺服器可連線並回應 220（結果快取）"""
+        async def connect() -> str:
+            reader, writer = await asyncio.open_connection(settings.SMTP_HOST, settings.SMTP_PORT)
+            try:
+                banner = (await reader.readline()).decode("utf-8", "replace").strip()
+                if not banner.startswith("220"):
+                    raise RuntimeError(f"非預期的回應: {banner}")
+                writer.write(b"QUIT\r\n")
+                await writer.drain()
+                return f"{settings.SMTP_HOST}:{settings.SMTP_PORT}"
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    # 伺服器已先關閉連線
+                    pass
+
+        return await self._cached(
+            "smtp",
+            lambda: self._timed(connect, settings.HEALTH_SMTP_TIMEOUT_SECONDS),
+        )
+
+    async def check_artifact_storage(self) -> Dict[str, Any]:
+        """確認物件儲存的儲存桶可存取（結果快取）"""
+        async def head_bucket() -> str:
+            return await asyncio.to_thread(artifact_cache.storage.check)
+
+        return await self._cached(
+            "artifact_storage",
+            lambda: self._timed(head_bucket, settings.HEALTH_ARTIFACT_STORAGE_TIMEOUT_SECONDS),
+        )
+
+    async def readiness(self) -> Dict[str, Any]:
+        """
+        檢查所有依賴
+
+        Returns:
+            Dict: {"status": "ready" | "degraded" | "not_ready", "checks": {...}}
+        """
+        if settings.PDF_ENGINE == "native":
+            # 原生生成不需要 Word 模板與 LibreOffice
+            names = ("mongodb", "font", "smtp")
+            results = await asyncio.gather(
+                self.check_mongodb(),
+                self.check_font(),
+                self.check_smtp(),
+            )
+        else:
+            names = ("mongodb", "template", "libreoffice", "smtp")
+            results = await asyncio.gather(
+                self.check_mongodb(),
+                self.check_template(),
+                self.check_libreoffice(),
+                self.check_smtp(),
+            )
+        checks = dict(zip(names, results))
+        if settings.ARTIFACT_STORAGE == "s3":
+            # 物件儲存不可用時仍可生成 PDF（只是無法使用快取），只標示為 degraded
+            checks["artifact_storage"] = await self.check_artifact_storage()
+
+        failed = [name for name, result in checks.items() if result["status"] != "ok"]
+        if any(name in CRITICAL_CHECKS for name in failed):
+            overall = "not_ready"
+        elif failed:
+            overall = "degraded"
+        else:
+            overall = "ready"
+
+        return {"status": overall, "checks": checks}
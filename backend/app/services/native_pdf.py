@@ -0,0 +1,255 @@
+"""
+原生 PDF 生成（PDF_ENGINE=native）
+
+不經過 Word 模板與 LibreOffice，直接以 fpdf2 依 PDFService._prepare_template_data
+的資料繪製自主學習申請表。版面對應 Word 模板（附件一 復興自主學習申請表），
+中文字型嵌入 PDF（只嵌入用到的字）。
+
+fpdf2 在第一次生成時才載入，避免拖慢應用啟動。
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+
+class NativePdfRenderer:
+    """以 fpdf2 繪製申請表"""
+
+    FONT_FAMILY = "cjk"
+    FONT_SIZE = 10
+    TITLE_FONT_SIZE = 14
+
+    # A4，左右邊界 20mm、上下 15mm（與 Word 模板相同）
+    MARGIN_X = 20
+    MARGIN_Y = 15
+    # 表格欄寬（mm），合計為內容寬度 170mm
+    COL_WIDTHS = (30, 18, 18, 32, 42, 30)
+    # 學習內容規劃另成一個表格（項目多時可跨頁），欄位：項次、日期、時數、學習內容、檢核指標
+    PLAN_COL_WIDTHS = (14, 18, 14, 72, 52)
+    SIGNATURE_ROW_HEIGHT = 18
+    TABLE_PADDING = 1.2
+    # fpdf2 的表格列不能跨頁：長文字拆成多列，每列最多此行數（一頁約可容納 45 行）
+    MAX_ROW_LINES = 20
+
+    # 以下文字與 Word 模板相同，修改模板時需一併修改
+    HEADER_NOTE = "114學年度第一學期第二階段  □全組人員都已填寫Google表單"
+    TITLE = "臺北市立復興高級中學自主學習計畫\n學生申請表"
+    LEARNING_CATEGORIES = (
+        ("閱讀計畫", "志工服務", "專題研究", "藝文創作", "技藝學習", "競賽準備"),
+        ("實作體驗", "課程延伸"),
+    )
+    LIBRARY_ENVIRONMENTS = (
+        (("自習室", "自習室(低噪音，可自備筆電者)"), ("數位閱讀室", "數位閱讀室(需電腦操作者)")),
+        (("雲端教室", "雲端教室(需小組討論者)"), ("美力教室", "美力教室 (有實作或大桌面需求者，如服裝製作、繪畫等)")),
+    )
+    PRESENTATION_FORMATS = (
+        ("靜態展", "靜態展(PPT、書面報告、心得、自我省思…等)"),
+        ("動態展", "動態展 (直播、影片撥放、實際展示、演出…等)"),
+    )
+    PHONE_RULE = (
+        "自主學習時間能自我管理規範，並遵守學校之規定，在自主學習時間開始至結束前不使用個人手機。"
+        "若有需要搜尋網路資料，自行持學生證至圖書館借用平板電腦。"
+    )
+    PLAN_LABEL = "學習內容規劃(至少需18小時，表格不夠可自行增加)"
+    MIN_PLAN_ROWS = 9  # Word 模板的項次列數（原生版面不限列數）
+
+    @staticmethod
+    def _check(selected: Any) -> str:
+        return "☑" if selected else "□"
+
+    @classmethod
+    def _learning_categories_text(cls, context: Dict[str, Any]) -> str:
+        selected = context["learning_categories"] or {}
+        lines = [
+            " ".join(f"{cls._check(selected.get(name))}{name}" for name in line)
+            for line in cls.LEARNING_CATEGORIES
+        ]
+        other = context["learning_category_other"] or "_________________"
+        lines[-1] += f" □其他：{other}"
+        return "\n".join(lines)
+
+    @classmethod
+    def _env_needs_text(cls, context: Dict[str, Any]) -> str:
+        selected = context["env_needs"] or {}
+        lines = ["A. 圖書館場地:"]
+        for line in cls.LIBRARY_ENVIRONMENTS:
+            lines.append(" ".join(f"{cls._check(selected.get(key))}{label}" for key, label in line))
+        lines.append(f"B. 其他場地： (請寫出) {context['env_other'] or '_____________________'}")
+        lines.append(" (須徵得該場地管理者同意並簽名，如體育項目須獲得體育組長同意並簽名)")
+        return "\n".join(lines)
+
+    @classmethod
+    def _presentation_text(cls, context: Dict[str, Any]) -> str:
+        selected = context["presentation_format"]
+        lines = [f"{cls._check(selected == key)}{label}" for key, label in cls.PRESENTATION_FORMATS]
+        lines.append(f"{cls._check(selected == '其他')}其他{context['presentation_other'] or '__________'}")
+        return "\n".join(lines)
+
+    @classmethod
+    def _plan_rows(cls, context: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        rows = [
+            (str(item["number"]), item["date"] or "", str(item["hours"] or ""), item["content"] or "", item["metric"] or "")
+            for item in context["plan_items"]
+        ]
+        while len(rows) < cls.MIN_PLAN_ROWS:
+            rows.append((str(len(rows) + 1), "", "", "", ""))
+        return rows
+
+    @classmethod
+    def _wrap(cls, pdf: Any, text: str, width: float) -> List[str]:
+        """文字在欄寬內換行後的各行（欄寬扣除左右內距）"""
+        if not text:
+            return [""]
+        return pdf.multi_cell(
+            w=width - 2 * cls.TABLE_PADDING, text=text, dry_run=True, output="LINES"
+        ) or [""]
+
+    @classmethod
+    def _chunks(cls, lines: List[str]) -> List[str]:
+        """每 MAX_ROW_LINES 行為一段（每段為表格的一列）"""
+        return [
+            "\n".join(lines[start:start + cls.MAX_ROW_LINES])
+            for start in range(0, len(lines), cls.MAX_ROW_LINES)
+        ] or [""]
+
+    @classmethod
+    def _text_rows(cls, pdf: Any, table: Any, label: str, text: str, colspan: int = 5) -> None:
+        """標題欄 + 長文字欄；超過 MAX_ROW_LINES 行時拆成多列，可跨頁"""
+        width = sum(cls.COL_WIDTHS[-colspan:])
+        for index, chunk in enumerate(cls._chunks(cls._wrap(pdf, text, width))):
+            row = table.row()
+            row.cell(label if index == 0 else "")
+            row.cell(chunk, colspan=colspan)
+
+    @classmethod
+    def _plan_table_rows(cls, pdf: Any, table: Any, context: Dict[str, Any]) -> None:
+        """學習計畫項次；學習內容或檢核指標過長時拆成多列（項次、日期、時數只在第一列）"""
+        content_width, metric_width = cls.PLAN_COL_WIDTHS[3], cls.PLAN_COL_WIDTHS[4]
+        for number, date, hours, content, metric in cls._plan_rows(context):
+            content_chunks = cls._chunks(cls._wrap(pdf, content, content_width))
+            metric_chunks = cls._chunks(cls._wrap(pdf, metric, metric_width))
+            for index in range(max(len(content_chunks), len(metric_chunks))):
+                first = index == 0
+                row = table.row()
+                row.cell(number if first else "", align="CENTER")
+                row.cell(date if first else "", align="CENTER")
+                row.cell(hours if first else "", align="CENTER")
+                row.cell(content_chunks[index] if index < len(content_chunks) else "")
+                row.cell(metric_chunks[index] if index < len(metric_chunks) else "")
+
+    @staticmethod
+    def _image(value: Any) -> Optional[bytes]:
+        """簽名欄位：有簽名時為 PNG 二進位資料，否則為空字串"""
+        return value if isinstance(value, bytes) else None
+
+    @classmethod
+    def render(cls, context: Dict[str, Any], pdf_path: Path) -> None:
+        """
+        繪製申請表並寫入 PDF
+
+        Args:
+            context: PDFService._prepare_template_data 的資料（簽名為 PNG 二進位資料）
+            pdf_path: 輸出 PDF 路徑
+        """
+        from fpdf import FPDF
+        from fpdf.fonts import FontFace
+
+        pdf = FPDF(format="A4")
+        pdf.set_margins(cls.MARGIN_X, cls.MARGIN_Y, cls.MARGIN_X)
+        pdf.set_auto_page_break(True, margin=cls.MARGIN_Y)
+        pdf.add_font(
+            cls.FONT_FAMILY,
+            fname=settings.PDF_FONT_PATH,
+            collection_font_number=settings.PDF_FONT_INDEX,
+        )
+        pdf.set_font(cls.FONT_FAMILY, size=cls.FONT_SIZE)
+        pdf.add_page()
+
+        pdf.cell(text=cls.HEADER_NOTE, new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(1)
+
+        title_style = FontFace(size_pt=cls.TITLE_FONT_SIZE)
+        members = context["members"]
+
+        table_options = dict(
+            first_row_as_headings=False,
+            line_height=pdf.font_size * 1.6,
+            text_align="LEFT",
+            v_align="MIDDLE",
+            padding=cls.TABLE_PADDING,
+        )
+
+        with pdf.table(col_widths=cls.COL_WIDTHS, **table_options) as table:
+            table.row().cell(cls.TITLE, align="CENTER", style=title_style, colspan=6)
+
+            cls._text_rows(pdf, table, "自主學習計畫名稱", context["title"])
+
+            row = table.row()
+            for header in ("學生資料", "班級", "座號", "學號", "姓名 (小組至多3人，可共寫1份)", "是否繳交過自主學習成果？"):
+                row.cell(header, align="CENTER")
+            for index, member in enumerate(members[:3], 1):
+                row = table.row()
+                row.cell(f"學生{index}", align="CENTER")
+                for key in ("student_class", "student_seat", "student_id", "student_name", "has_submitted"):
+                    row.cell(str(member[key] or ""), align="CENTER")
+
+            for label, text in (
+                ("學習動機", context["motivation"]),
+                ("學習類別", cls._learning_categories_text(context)),
+                ("學習環境需求", cls._env_needs_text(context)),
+                ("學習設備需求", context["equipment_needs"]),
+                ("學習方法\n(參考資料)", context["references_str"]),
+                ("預期成效", context["expected_outcome"]),
+            ):
+                cls._text_rows(pdf, table, label, text or "")
+
+        with pdf.table(col_widths=cls.PLAN_COL_WIDTHS, **table_options) as table:
+            table.row().cell(cls.PLAN_LABEL, colspan=5)
+            row = table.row()
+            for header in ("項次", "日期", "時數", "學習內容", "學生自訂檢核指標\n(請自行填寫每周的檢核指標內容)"):
+                row.cell(header, align="CENTER")
+            cls._plan_table_rows(pdf, table, context)
+
+        with pdf.table(col_widths=cls.COL_WIDTHS, **table_options) as table:
+            for label, text in (
+                ("階段中(4周後)預計達成目標", context["midterm_goal"]),
+                ("階段末(8周後)預計達成目標", context["final_goal"]),
+                ("成果發表形式", cls._presentation_text(context)),
+            ):
+                cls._text_rows(pdf, table, label, text or "")
+
+            row = table.row()
+            row.cell("手機使用規範")
+            row.cell(cls.PHONE_RULE, colspan=3)
+            phone = context["phone_agreement"]
+            row.cell(f"{cls._check(phone == '同意')}同意\n{cls._check(phone == '不同意')}不同意", colspan=2)
+
+            for index in range(1, 4):
+                row = table.row(min_height=cls.SIGNATURE_ROW_HEIGHT)
+                row.cell(f"學生{index}簽名\n(請簽全名)")
+                row.cell(img=cls._image(context[f"student{index}_signature"]), colspan=2)
+                row.cell(f"父母或監護人{index}簽名\n(請簽全名)")
+                row.cell("", colspan=2)
+
+            table.row().cell("若使用非圖書館之其他處室或場地，請同學先行將申請書送給該場地負責人核章", colspan=6)
+            row = table.row()
+            for header in ("空間設備管理人簽章", "指導教師簽章", "導師簽章"):
+                row.cell(header, align="CENTER", colspan=2)
+            row = table.row(min_height=cls.SIGNATURE_ROW_HEIGHT)
+            row.cell(img=cls._image(context["space_manager_signature"]), colspan=2)
+            row.cell(img=cls._image(context["teacher_signature"]), colspan=2)
+            row.cell("", colspan=2)
+
+            table.row().cell("以下為審查填寫欄，申請者勿填", align="CENTER", colspan=6)
+            row = table.row()
+            row.cell("初審", align="CENTER")
+            row.cell(
+                f"{context['initial_passed_check']} 通過  {context['initial_not_passed_check']} 不通過",
+                colspan=5,
+            )
+            row = table.row()
+            row.cell("複審", align="CENTER")
+            row.cell("□通過  □修正後通過  □不通過\n審查意見：                          簽章：", colspan=5)
+
+        pdf.output(str(pdf_path))
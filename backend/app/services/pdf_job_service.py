@@ -0,0 +1,308 @@
+"""
+非同步 PDF 匯出工作
+
+請求只負責建立工作（202）與查詢狀態，PDF 由背景執行器生成後存入
+PDF_JOB_DIR，避免長時間佔用 HTTP 連線（nginx proxy_read_timeout 為 60 秒）。
+
+工作狀態儲存在 MongoDB（pdf_jobs 集合）：
+- 應用重新啟動後，排隊中的工作會繼續執行；正常關閉時執行中的工作會放回佇列
+- 執行期間定期延長租約（PDF_JOB_LEASE_SECONDS）；執行中的行程異常終止時，
+  租約到期後工作會被重新執行，最多 PDF_JOB_MAX_ATTEMPTS 次
+- 多個 worker 行程以 find_one_and_update 取得工作，同一工作只會由一個行程執行
+"""
+import asyncio
+import logging
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from ..config import settings
+from ..models.application import Application
+from ..models.pdf_job import PdfJob, PdfJobStatus, RenderPriority
+from ..utils.metrics import PDF_JOB_QUEUE_WAIT, PDF_JOBS_FINISHED, PDF_JOBS_RUNNING
+from .pdf_service import PDFService
+
+logger = logging.getLogger(__name__)
+
+
+class PdfJobService:
+    """PDF 匯出工作服務"""
+
+    async def create_job(
+        self,
+        application: Application,
+        requested_by: str,
+        priority: RenderPriority = RenderPriority.INTERACTIVE
+    ) -> PdfJob:
+        """
+        建立 PDF 匯出工作
+
+        Args:
+            application: 申請表
+            requested_by: 建立工作的使用者 ID
+            priority: 生成優先順序（同一優先順序內先到先執行）
+
+        Returns:
+            PdfJob: 排隊中的工作
+        """
+        job = PdfJob(application_id=str(application.id), requested_by=requested_by, priority=priority)
+        await job.insert()
+        pdf_job_runner.notify()
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[PdfJob]:
+        """
+        獲取工作
+
+        Args:
+            job_id: 工作 ID
+
+        Returns:
+            Optional[PdfJob]: 工作，不存在或 ID 格式錯誤返回 None
+        """
+        if not PydanticObjectId.is_valid(job_id):
+            return None
+        return await PdfJob.get(PydanticObjectId(job_id))
+
+
+class PdfJobRunner:
+    """
+    PDF 匯出工作執行器（每個 worker 行程固定 PDF_JOB_CONCURRENCY 個執行協程）
+
+    依優先順序取得工作；實際生成再經過 render_scheduler 與其他 PDF 生成排序。
+    """
+
+    # 清除過期結果的間隔（秒）
+    CLEANUP_INTERVAL = 60.0
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        """有新工作時喚醒閒置的執行協程"""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """啟動執行協程"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work())
+            for _ in range(max(settings.PDF_JOB_CONCURRENCY, 1))
+        ]
+        self._tasks.append(asyncio.create_task(self._cleanup_loop()))
+
+    async def stop(self) -> None:
+        """停止執行協程（執行中的工作放回佇列）"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except PyMongoError as e:
+                logger.warning("取得 PDF 匯出工作失敗: %s", e)
+                job = None
+            except Exception:
+                logger.exception("取得 PDF 匯出工作失敗")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.PDF_JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            PDF_JOBS_RUNNING.inc()
+            try:
+                await self._execute(job)
+            except Exception:
+                # 任何錯誤都不能結束執行協程，否則此行程不再處理匯出工作
+                logger.exception("PDF 匯出工作執行失敗 (job_id=%s)", job.id)
+                await self._release(job)
+            finally:
+                PDF_JOBS_RUNNING.dec()
+
+    async def _release(self, job: PdfJob) -> None:
+        """
+        非預期錯誤後釋放租約，放回佇列重試（計入執行次數，超過
+        PDF_JOB_MAX_ATTEMPTS 次時標記為失敗）
+        """
+        try:
+            await self._finish(job, PdfJobStatus.QUEUED)
+        except Exception:
+            # 無法更新時等待租約到期後由任一行程重新取得
+            logger.exception("釋放 PDF 匯出工作租約失敗 (job_id=%s)", job.id)
+
+    async def _claim(self) -> Optional[PdfJob]:
+        """取得最早的排隊中（或租約已過期）工作並標記為執行中"""
+        now = datetime.utcnow()
+        document = await PdfJob.get_motor_collection().find_one_and_update(
+            {
+                "$or": [
+                    {"status": PdfJobStatus.QUEUED.value},
+                    {"status": PdfJobStatus.RUNNING.value, "lease_expires_at": {"$lt": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": PdfJobStatus.RUNNING.value,
+                    "started_at": now,
+                    "updated_at": now,
+                    "lease_expires_at": now + timedelta(seconds=settings.PDF_JOB_LEASE_SECONDS),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", 1), ("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if document is None:
+            return None
+        return PdfJob.model_validate(document)
+
+    async def _finish(self, job: PdfJob, status: PdfJobStatus, **fields: Any) -> None:
+        """
+        記錄工作結果
+
+        以 attempts 作為條件：租約過期後已被其他行程重新取得的工作，
+        不會被原本的執行結果覆蓋。
+        """
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {
+            "status": status.value,
+            "updated_at": now,
+            "lease_expires_at": None,
+            **fields,
+        }
+        if status != PdfJobStatus.QUEUED:
+            update["finished_at"] = now
+            PDF_JOBS_FINISHED.labels(status.value).inc()
+
+        await PdfJob.get_motor_collection().update_one(
+            {"_id": job.id, "attempts": job.attempts},
+            {"$set": update},
+        )
+
+    async def _heartbeat(self, job: PdfJob) -> None:
+        """
+        執行期間每 1/3 租約時間延長一次租約
+
+        以 attempts 作為條件：工作已被其他行程重新取得時停止延長。
+        """
+        interval = settings.PDF_JOB_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            now = datetime.utcnow()
+            try:
+                result = await PdfJob.get_motor_collection().update_one(
+                    {"_id": job.id, "attempts": job.attempts, "status": PdfJobStatus.RUNNING.value},
+                    {"$set": {
+                        "updated_at": now,
+                        "lease_expires_at": now + timedelta(seconds=settings.PDF_JOB_LEASE_SECONDS),
+                    }},
+                )
+            except PyMongoError as e:
+                logger.warning("延長 PDF 匯出工作租約失敗 (job_id=%s): %s", job.id, e)
+                continue
+            if result.matched_count == 0:
+                logger.warning("PDF 匯出工作租約已被其他行程取得 (job_id=%s)", job.id)
+                return
+
+    async def _execute(self, job: PdfJob) -> None:
+        # 只記錄第一次執行的排隊時間（重新執行時 started_at 已不是第一次取得的時間）
+        if job.attempts == 1:
+            PDF_JOB_QUEUE_WAIT.observe((job.started_at - job.created_at).total_seconds())
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await self._run_job(job)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _run_job(self, job: PdfJob) -> None:
+        if job.attempts > settings.PDF_JOB_MAX_ATTEMPTS:
+            await self._finish(job, PdfJobStatus.FAILED, error="超過最大重試次數")
+            return
+
+        application = await Application.get(PydanticObjectId(job.application_id))
+        if application is None:
+            await self._finish(job, PdfJobStatus.FAILED, error="申請表不存在")
+            return
+
+        try:
+            pdf_path = await PDFService.generate_pdf(application, job.priority)
+            result_path = Path(settings.PDF_JOB_DIR) / f"{job.id}.pdf"
+            result_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(shutil.move, pdf_path, result_path)
+        except asyncio.CancelledError:
+            # 應用關閉：放回佇列，重新啟動後繼續（不計入執行次數）
+            await asyncio.shield(
+                self._finish(job, PdfJobStatus.QUEUED, started_at=None, attempts=job.attempts - 1)
+            )
+            raise
+        except Exception as e:
+            # 完整堆疊已由 PDFService 記錄
+            logger.error("PDF 匯出工作失敗 (job_id=%s): %s", job.id, e)
+            await self._finish(job, PdfJobStatus.FAILED, error=str(e))
+            return
+
+        await self._finish(
+            job,
+            PdfJobStatus.DONE,
+            result_path=str(result_path),
+            filename=PDFService.download_filename(application),
+        )
+        logger.info("PDF 匯出工作完成 (job_id=%s, application_id=%s)", job.id, job.application_id)
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.CLEANUP_INTERVAL)
+            try:
+                await self.cleanup_expired()
+            except PyMongoError as e:
+                logger.warning("清除過期 PDF 匯出工作失敗: %s", e)
+            except Exception:
+                logger.exception("清除過期 PDF 匯出工作失敗")
+
+    async def cleanup_expired(self) -> int:
+        """
+        刪除超過 PDF_JOB_RESULT_TTL_SECONDS 的已結束工作與其 PDF
+
+        Returns:
+            int: 刪除的工作數量
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.PDF_JOB_RESULT_TTL_SECONDS)
+        expired = await PdfJob.find(
+            {
+                "status": {"$in": [PdfJobStatus.DONE.value, PdfJobStatus.FAILED.value]},
+                "finished_at": {"$lt": cutoff},
+            }
+        ).to_list()
+        deleted = 0
+        for job in expired:
+            if job.result_path:
+                try:
+                    Path(job.result_path).unlink(missing_ok=True)
+                except OSError as e:
+                    # 保留工作記錄，下次清除時再試
+                    logger.warning("刪除 PDF 匯出結果失敗 (job_id=%s): %s", job.id, e)
+                    continue
+            await job.delete()
+            deleted += 1
+        return deleted
+
+
+# 全域 PDF 匯出工作執行器
+pdf_job_runner = PdfJobRunner()
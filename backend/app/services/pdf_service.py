@@ -1,19 +1,82 @@
 """
 PDF 生成服務
+
+docxtpl、Pillow 與 numpy 在第一次生成 PDF 時才載入，避免拖慢應用啟動。
+
+同一份申請表（同一版本）同時有多個生成請求時（例如審核通知郵件與學生匯出），
+只生成一次，每個呼叫者取得同一份 PDF 的各自副本。
+
+PDF_ENGINE 選擇生成方式：libreoffice（填入 Word 模板後以 LibreOffice 轉換）或
+native（以 fpdf2 直接繪製，見 native_pdf.py）。
+
+啟用 PDF_PRERENDER_ENABLED 時，申請表送出、更新與審核通過後會以低優先順序
+預先生成，結果依內容雜湊存入生成結果快取，之後的匯出直接使用快取。
+存入快取時一併產生第一頁的縮圖（與 PDF 使用相同的快取鍵），供審核列表預覽。
+以簽章網址下載的 PDF（publish_pdf）也存放在快取中，由 nginx 直接傳送。
 """
+import asyncio
 import os
 import subprocess
-import tempfile
-import traceback
+import threading
 import base64
 import io
+import json
+import hashlib
+import logging
+import uuid
 from pathlib import Path
-from typing import Dict, Any, Optional
-from docxtpl import DocxTemplate, InlineImage
-from docx.shared import Mm
-from PIL import Image
-import numpy as np
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+from jinja2 import Environment, Undefined
 from ..models.application import Application
+from ..models.pdf_job import RenderPriority
+from ..config import settings
+from ..utils.metrics import PDF_PRERENDERS, PDF_RENDERS_COALESCED, PDF_STAGE_DURATION, observe_duration
+from .artifact_cache import artifact_cache
+from .artifact_storage import link_or_copy
+from .native_pdf import NativePdfRenderer
+from .render_scheduler import RenderTicket, render_scheduler
+
+if TYPE_CHECKING:
+    from docxtpl import DocxTemplate, InlineImage
+
+logger = logging.getLogger(__name__)
+
+
+class SilentUndefined(Undefined):
+    """靜默處理未定義變數，返回空字串"""
+    def _fail_with_undefined_error(self, *args, **kwargs):
+        return ''
+
+    __add__ = __radd__ = __mul__ = __rmul__ = __div__ = __rdiv__ = \
+    __truediv__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = \
+    __mod__ = __rmod__ = __pos__ = __neg__ = \
+    lambda self, other: self._fail_with_undefined_error()
+
+    __lt__ = __le__ = __gt__ = __ge__ = __eq__ = __ne__ = \
+    __hash__ = lambda self, other: self._fail_with_undefined_error()
+
+    __getitem__ = lambda self, other: self._fail_with_undefined_error()
+
+    def __str__(self):
+        return ''
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter([])
+
+    def __bool__(self):
+        return False
+
+
+class _RenderFlight:
+    """生成中的 PDF 與等待結果的呼叫者數量"""
+
+    def __init__(self, task: "asyncio.Task[Path]", ticket: RenderTicket):
+        self.task = task
+        self.ticket = ticket
+        self.waiters = 0
 
 
 class PDFService:
@@ -23,6 +86,27 @@ class PDFService:
     TEMPLATE_PATH = Path("/app/templates/application_template.docx")
     TEMP_DIR = Path("/app/temp")
 
+    # 同一個 LibreOffice 設定目錄（每個生成槽位一個）同時只能有一個轉換
+    _convert_locks: Dict[int, threading.Lock] = {}
+    _convert_locks_guard = threading.Lock()
+
+    # 縮圖格式 -> (Pillow 格式, Content-Type)
+    THUMBNAIL_FORMATS = {"png": ("PNG", "image/png"), "webp": ("WEBP", "image/webp")}
+    # 申請表版本 -> 內容雜湊的記錄（快取鍵 {申請表 ID}-r{版本號}.thumbref）
+    THUMBNAIL_REF_SUFFIX = ".thumbref"
+
+    # 影響 PDF 內容的申請表欄位（_prepare_template_data 使用的欄位）；
+    # 提交者、審核教師 ID、版本號與時間戳不會印在 PDF 上，不計入內容雜湊
+    RENDERED_FIELDS = frozenset({
+        "title", "apply_date_start", "apply_date_end", "status", "members", "motivation",
+        "learning_categories", "learning_category_other", "references", "expected_outcome",
+        "equipment_needs", "env_needs", "env_other", "plan_items", "midterm_goal", "final_goal",
+        "presentation_formats", "presentation_other", "phone_agreement", "signatures", "comment",
+    })
+
+    # 生成中的 PDF（申請表 ID, 版本號） -> 共用的生成工作
+    _inflight: Dict[Tuple[str, int], _RenderFlight] = {}
+
     @classmethod
     def _decode_base64_image(cls, base64_string: str) -> Optional[bytes]:
         """
@@ -44,7 +128,7 @@ class PDFService:
 
             return base64.b64decode(base64_string)
         except Exception as e:
-            print(f"解碼 base64 圖片失敗: {e}")
+            logger.warning("解碼 base64 圖片失敗: %s", e)
             return None
 
     @classmethod
@@ -61,6 +145,9 @@ class PDFService:
         Returns:
             bytes: 轉換後的圖片二進位資料
         """
+        from PIL import Image
+        import numpy as np
+
         try:
             # 開啟圖片
             img = Image.open(io.BytesIO(image_bytes))
@@ -94,23 +181,20 @@ class PDFService:
             return output.getvalue()
 
         except Exception as e:
-            print(f"轉換簽名顏色失敗: {e}")
-            traceback.print_exc()
+            logger.warning("轉換簽名顏色失敗", exc_info=True)
             # 如果轉換失敗，返回原始圖片
             return image_bytes
 
     @classmethod
-    def _create_signature_image(cls, doc: DocxTemplate, signature_data: Optional[str], width_mm: int = 30) -> Optional[InlineImage]:
+    def _signature_png(cls, signature_data: Optional[str]) -> Optional[bytes]:
         """
-        建立簽名圖片物件
+        解碼簽名並將筆跡轉為黑色
 
         Args:
-            doc: DocxTemplate 物件
             signature_data: base64 編碼的簽名圖片
-            width_mm: 圖片寬度（毫米）
 
         Returns:
-            InlineImage 或 None
+            bytes: 圖片二進位資料，沒有簽名或解碼失敗返回 None
         """
         if not signature_data:
             return None
@@ -119,15 +203,35 @@ class PDFService:
         if not image_bytes:
             return None
 
-        try:
-            # 將白色簽名轉換為黑色（用於 PDF 顯示）
-            black_signature_bytes = cls._convert_signature_to_black(image_bytes)
+        # 將白色簽名轉換為黑色（用於 PDF 顯示）
+        return cls._convert_signature_to_black(image_bytes)
+
+    @classmethod
+    def _create_signature_image(cls, doc: "DocxTemplate", signature_data: Optional[str], width_mm: int = 30) -> Optional["InlineImage"]:
+        """
+        建立簽名圖片物件
 
+        Args:
+            doc: DocxTemplate 物件
+            signature_data: base64 編碼的簽名圖片
+            width_mm: 圖片寬度（毫米）
+
+        Returns:
+            InlineImage 或 None
+        """
+        black_signature_bytes = cls._signature_png(signature_data)
+        if not black_signature_bytes:
+            return None
+
+        try:
             # 建立 InlineImage 物件
+            from docxtpl import InlineImage
+            from docx.shared import Mm
+
             image_stream = io.BytesIO(black_signature_bytes)
             return InlineImage(doc, image_stream, width=Mm(width_mm))
         except Exception as e:
-            print(f"建立簽名圖片失敗: {e}")
+            logger.warning("建立簽名圖片失敗: %s", e)
             return None
 
     @classmethod
@@ -150,13 +254,23 @@ class PDFService:
         return ''
 
     @classmethod
-    def _prepare_template_data(cls, application: Application, doc: DocxTemplate) -> Dict[str, Any]:
+    def _create_jinja_env(cls) -> Environment:
+        """
+        建立模板渲染用的 Jinja2 環境（未定義變數顯示為空字串）
+
+        Returns:
+            Environment: Jinja2 環境
+        """
+        return Environment(undefined=SilentUndefined)
+
+    @classmethod
+    def _prepare_template_data(cls, application: Application, doc: Optional["DocxTemplate"] = None) -> Dict[str, Any]:
         """
         準備模板資料
 
         Args:
             application: 申請表資料
-            doc: DocxTemplate 物件（用於建立圖片物件）
+            doc: DocxTemplate 物件（用於建立圖片物件）；None 時簽名為 PNG 二進位資料
 
         Returns:
             Dict: 模板變數字典
@@ -324,27 +438,40 @@ class PDFService:
         for sig in application.signatures:
             if sig.type in signature_types and sig.image_url:
                 field_name = signature_types[sig.type]
-                signature_image = cls._create_signature_image(doc, sig.image_url, width_mm=35)
+                if doc is None:
+                    signature_image = cls._signature_png(sig.image_url)
+                else:
+                    signature_image = cls._create_signature_image(doc, sig.image_url, width_mm=35)
                 if signature_image:
                     template_data[field_name] = signature_image
 
         return template_data
 
     @classmethod
-    def _convert_docx_to_pdf(cls, docx_path: Path, pdf_path: Path) -> None:
+    def _convert_lock(cls, slot: int) -> threading.Lock:
+        with cls._convert_locks_guard:
+            return cls._convert_locks.setdefault(slot, threading.Lock())
+
+    @classmethod
+    def _convert_docx_to_pdf(cls, docx_path: Path, pdf_path: Path, slot: int = 0) -> None:
         """
         使用 LibreOffice 將 Word 檔案轉換為 PDF
 
         Args:
             docx_path: Word 檔案路徑
             pdf_path: 輸出 PDF 路徑
+            slot: 生成槽位（決定使用的 LibreOffice 設定目錄）
         """
         # 確保輸出目錄存在
         pdf_path.parent.mkdir(parents=True, exist_ok=True)
 
         # 使用 LibreOffice headless mode 轉換
+        # 每個行程的每個槽位使用各自的使用者設定目錄：同時轉換時，
+        # 共用同一個設定目錄會因鎖定而失敗
+        profile_dir = cls.TEMP_DIR / f"libreoffice-profile-{os.getpid()}-{slot}"
         cmd = [
             'libreoffice',
+            f'-env:UserInstallation={profile_dir.resolve().as_uri()}',
             '--headless',
             '--convert-to', 'pdf',
             '--outdir', str(pdf_path.parent),
@@ -352,13 +479,14 @@ class PDFService:
         ]
 
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                timeout=30
-            )
+            with cls._convert_lock(slot):
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    encoding='utf-8',
+                    timeout=30
+                )
 
             if result.returncode != 0:
                 raise Exception(f"LibreOffice 轉換失敗: {result.stderr}")
@@ -375,80 +503,408 @@ class PDFService:
         except Exception as e:
             raise Exception(f"PDF 轉換錯誤: {str(e)}")
 
+    @staticmethod
+    def download_filename(application: Application) -> str:
+        """下載時使用的檔名"""
+        return f"自主學習申請表_{application.title}_{application.submitter_student_id}.pdf"
+
     @classmethod
-    async def generate_pdf(cls, application: Application) -> Path:
+    async def generate_pdf(
+        cls,
+        application: Application,
+        priority: RenderPriority = RenderPriority.INTERACTIVE
+    ) -> Path:
         """
-        生成 PDF 檔案
+        生成 PDF 檔案（依優先順序取得生成槽位後在執行緒中執行，不阻塞事件迴圈）
+
+        同一份申請表、同一版本已在生成中時，等待該次生成並取得其副本，
+        不會重複生成（沿用第一個呼叫者的優先順序）。啟用預先生成時，
+        內容未變更則直接使用快取。
 
         Args:
             application: 申請表資料
+            priority: 生成優先順序
 
         Returns:
-            Path: 生成的 PDF 檔案路徑
+            Path: 生成的 PDF 檔案路徑（每個呼叫者各一份，使用後由呼叫者刪除）
         """
-        # 確保臨時目錄存在
+        content_hash = None
+        if settings.PDF_PRERENDER_ENABLED:
+            content_hash = cls.content_hash(application)
+            cached_pdf = await asyncio.to_thread(cls._copy_cached, str(application.id), content_hash)
+            if cached_pdf is not None:
+                return cached_pdf
+        return await cls._generate_coalesced(application, priority, content_hash)
+
+    @classmethod
+    async def _generate_coalesced(
+        cls,
+        application: Application,
+        priority: RenderPriority,
+        content_hash: Optional[str]
+    ) -> Path:
+        """生成 PDF，同一份申請表、同一版本只生成一次；content_hash 不為 None 時存入快取"""
+        key = (str(application.id), application.revision)
+        flight = cls._inflight.get(key)
+        if flight is None:
+            ticket = RenderTicket(priority)
+            flight = _RenderFlight(
+                asyncio.create_task(cls._render_scheduled(application, ticket, content_hash)),
+                ticket
+            )
+            cls._inflight[key] = flight
+            flight.task.add_done_callback(lambda task: cls._finish_flight(key, flight))
+        else:
+            PDF_RENDERS_COALESCED.inc()
+            # 較優先的呼叫者併入尚在排隊的生成時，提高整個生成的優先順序
+            flight.ticket.raise_priority(priority)
+
+        flight.waiters += 1
+        try:
+            # shield：單一呼叫者被取消時不影響其他等待同一次生成的呼叫者
+            shared_pdf = await asyncio.shield(flight.task)
+            return await asyncio.to_thread(cls._copy_result, shared_pdf)
+        finally:
+            flight.waiters -= 1
+            # 所有呼叫者都已取消時不取消生成：LibreOffice 轉換在執行緒中無法中斷，
+            # 取消只會提早歸還生成槽位並留下暫存檔；生成完成後由 _finish_flight 刪除結果
+            if flight.waiters == 0 and flight.task.done():
+                cls._discard_result(flight.task)
+
+    @classmethod
+    def _finish_flight(cls, key: Tuple[str, int], flight: _RenderFlight) -> None:
+        """生成結束：移除記錄；已沒有等待的呼叫者時刪除結果"""
+        cls._inflight.pop(key, None)
+        if flight.waiters == 0:
+            cls._discard_result(flight.task)
+
+    @staticmethod
+    def _discard_result(task: "asyncio.Task[Path]") -> None:
+        """刪除共用的生成結果（各呼叫者已取得副本）"""
+        if not task.cancelled() and task.exception() is None:
+            task.result().unlink(missing_ok=True)
+
+    @classmethod
+    async def _render_scheduled(
+        cls,
+        application: Application,
+        ticket: RenderTicket,
+        content_hash: Optional[str]
+    ) -> Path:
+        async with render_scheduler.slot(ticket) as slot:
+            pdf_path = await asyncio.to_thread(cls.render_pdf, application, slot)
+
+        if content_hash is not None:
+            try:
+                await asyncio.to_thread(
+                    artifact_cache.put, str(application.id), content_hash, ".pdf", pdf_path
+                )
+            except Exception as e:
+                logger.warning("PDF 存入快取失敗 (application_id=%s): %s", application.id, e)
+            # 縮圖只供預先生成的預覽使用
+            if settings.PDF_PRERENDER_ENABLED:
+                await asyncio.to_thread(cls._store_thumbnail, str(application.id), content_hash, pdf_path)
+        return pdf_path
+
+    @classmethod
+    def thumbnail_suffix(cls) -> str:
+        return f".{settings.PDF_THUMBNAIL_FORMAT}"
+
+    @classmethod
+    def thumbnail_media_type(cls) -> str:
+        return cls.THUMBNAIL_FORMATS[settings.PDF_THUMBNAIL_FORMAT][1]
+
+    @classmethod
+    def render_thumbnail(cls, pdf_path: Path) -> bytes:
+        """
+        將 PDF 第一頁轉為縮圖（寬度 PDF_THUMBNAIL_WIDTH 像素）
+
+        Args:
+            pdf_path: PDF 檔案路徑
+
+        Returns:
+            bytes: PDF_THUMBNAIL_FORMAT 格式的圖片
+        """
+        import pypdfium2 as pdfium
+
+        document = pdfium.PdfDocument(str(pdf_path))
+        try:
+            page = document[0]
+            image = page.render(scale=settings.PDF_THUMBNAIL_WIDTH / page.get_width()).to_pil()
+        finally:
+            document.close()
+
+        output = io.BytesIO()
+        image.save(output, format=cls.THUMBNAIL_FORMATS[settings.PDF_THUMBNAIL_FORMAT][0], optimize=True)
+        return output.getvalue()
+
+    @classmethod
+    def _store_thumbnail(cls, application_id: str, content_hash: str, pdf_path: Path) -> None:
+        """產生縮圖並存入快取（失敗只記錄警告，不影響 PDF）"""
+        try:
+            with observe_duration(PDF_STAGE_DURATION, stage="thumbnail"):
+                thumbnail = cls.render_thumbnail(pdf_path)
+            artifact_cache.put_bytes(application_id, content_hash, cls.thumbnail_suffix(), thumbnail)
+        except Exception:
+            logger.warning("產生 PDF 縮圖失敗 (application_id=%s)", application_id, exc_info=True)
+
+    @classmethod
+    def _store_thumbnail_from_cache(cls, application_id: str, content_hash: str, pdf_key: str) -> None:
+        """以快取中的 PDF 產生縮圖"""
+        pdf_path = cls._temp_copy_path(pdf_key)
+        try:
+            if artifact_cache.copy_to(pdf_key, pdf_path):
+                cls._store_thumbnail(application_id, content_hash, pdf_path)
+        finally:
+            pdf_path.unlink(missing_ok=True)
+
+    @classmethod
+    def _store_thumbnail_ref(cls, application_id: str, revision: int, content_hash: str) -> None:
+        """記錄申請表版本對應的內容雜湊，查詢縮圖時不必載入整份申請表計算雜湊"""
+        artifact_cache.put_bytes(
+            application_id, f"r{revision}", cls.THUMBNAIL_REF_SUFFIX, content_hash.encode("ascii")
+        )
+
+    @classmethod
+    def cached_thumbnail(cls, application_id: str, revision: int) -> Optional[str]:
+        """
+        取得快取中的縮圖（不會觸發生成）
+
+        以申請表 ID 與版本號查詢（預先生成時記錄的內容雜湊），不需要申請表內容。
+
+        Args:
+            application_id: 申請表 ID
+            revision: 申請表版本號
+
+        Returns:
+            Optional[str]: 縮圖的快取鍵，尚未生成或未啟用預先生成時返回 None
+        """
+        if not settings.PDF_PRERENDER_ENABLED:
+            return None
+        ref = artifact_cache.read_bytes(
+            artifact_cache.key(application_id, f"r{revision}", cls.THUMBNAIL_REF_SUFFIX)
+        )
+        if ref is None:
+            return None
+        return artifact_cache.get(application_id, ref.decode("ascii"), cls.thumbnail_suffix())
+
+    @classmethod
+    def _temp_copy_path(cls, source_name: str) -> Path:
         cls.TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        return cls.TEMP_DIR / f"{Path(source_name).stem}_{uuid.uuid4().hex[:8]}.pdf"
 
-        # 檢查模板是否存在
-        if not cls.TEMPLATE_PATH.exists():
-            raise FileNotFoundError(f"Word 模板不存在: {cls.TEMPLATE_PATH}")
+    @classmethod
+    def _copy_result(cls, shared_pdf: Path) -> Path:
+        """為呼叫者建立共用 PDF 的副本（優先使用硬連結）"""
+        copy_path = cls._temp_copy_path(shared_pdf.name)
+        link_or_copy(shared_pdf, copy_path)
+        return copy_path
+
+    @classmethod
+    def _copy_cached(cls, application_id: str, content_hash: str) -> Optional[Path]:
+        """
+        將快取中的 PDF 複製到臨時目錄
+
+        Returns:
+            Optional[Path]: 副本路徑（使用後由呼叫者刪除），沒有快取返回 None
+        """
+        pdf_key = artifact_cache.get(application_id, content_hash, ".pdf")
+        if pdf_key is None:
+            return None
+        copy_path = cls._temp_copy_path(pdf_key)
+        # 查詢後到複製前可能已被刪除（內容變更或過期）
+        if not artifact_cache.copy_to(pdf_key, copy_path):
+            return None
+        return copy_path
+
+    @classmethod
+    def content_hash(cls, application: Application) -> str:
+        """
+        計算影響 PDF 內容的雜湊（RENDERED_FIELDS、生成方式與 Word 模板）
+
+        只計入印在 PDF 上的欄位：只變更版本號、時間戳或審核教師 ID 時仍使用快取。
+        """
+        payload = application.model_dump(mode="json", include=set(cls.RENDERED_FIELDS))
+        template_stat = cls.TEMPLATE_PATH.stat() if cls.TEMPLATE_PATH.exists() else None
+        digest = hashlib.sha256(
+            json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        )
+        digest.update(settings.PDF_ENGINE.encode())
+        if template_stat is not None:
+            digest.update(f"{template_stat.st_mtime_ns}:{template_stat.st_size}".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    async def prerender(cls, application: Application) -> bool:
+        """
+        預先生成 PDF 並存入快取（低優先順序）
+
+        Args:
+            application: 申請表資料
+
+        Returns:
+            bool: 是否實際生成（內容未變更、已有快取時返回 False）
+        """
+        application_id = str(application.id)
+        content_hash = cls.content_hash(application)
+        cached_pdf = await asyncio.to_thread(artifact_cache.get, application_id, content_hash, ".pdf")
+        if cached_pdf is not None:
+            # 補上快取中缺少的縮圖（例如啟用縮圖前已快取的 PDF）
+            cached_thumbnail = await asyncio.to_thread(
+                artifact_cache.get, application_id, content_hash, cls.thumbnail_suffix()
+            )
+            if cached_thumbnail is None:
+                await asyncio.to_thread(cls._store_thumbnail_from_cache, application_id, content_hash, cached_pdf)
+            await asyncio.to_thread(cls._store_thumbnail_ref, application_id, application.revision, content_hash)
+            PDF_PRERENDERS.labels("skipped").inc()
+            return False
 
         try:
-            # 1. 載入 Word 模板
-            doc = DocxTemplate(cls.TEMPLATE_PATH)
+            pdf_path = await cls._generate_coalesced(application, RenderPriority.BULK, content_hash)
+        except Exception:
+            PDF_PRERENDERS.labels("failed").inc()
+            raise
+        pdf_path.unlink(missing_ok=True)
+        await asyncio.to_thread(cls._store_thumbnail_ref, application_id, application.revision, content_hash)
+        PDF_PRERENDERS.labels("rendered").inc()
+        return True
 
-            # 2. 準備模板資料（傳入 doc 以便建立簽名圖片）
-            context = cls._prepare_template_data(application, doc)
+    @classmethod
+    async def publish_pdf(
+        cls,
+        application: Application,
+        priority: RenderPriority = RenderPriority.INTERACTIVE
+    ) -> str:
+        """
+        生成 PDF 並存入生成結果快取（不論是否啟用預先生成），供簽章下載網址使用
 
-            # 3. 渲染模板
-            # 先列印資料以便除錯（排除圖片物件）
-            print("=" * 60)
-            print("PDF 模板資料:")
-            import json
-            debug_context = {k: v if not isinstance(v, InlineImage) else f"<InlineImage>" for k, v in context.items()}
-            print(json.dumps(debug_context, ensure_ascii=False, indent=2, default=str))
-            print("=" * 60)
+        快取鍵含內容雜湊：申請表內容變更或刪除後，舊的下載網址隨之失效。
 
-            # 使用自定義 Jinja2 環境，將未定義變數設為空字串
-            from jinja2 import Environment, Undefined
+        Args:
+            application: 申請表資料
+            priority: 生成優先順序
 
-            class SilentUndefined(Undefined):
-                """靜默處理未定義變數，返回空字串"""
-                def _fail_with_undefined_error(self, *args, **kwargs):
-                    return ''
+        Returns:
+            str: PDF 的快取鍵
+        """
+        application_id = str(application.id)
+        content_hash = cls.content_hash(application)
+        cached_pdf = await asyncio.to_thread(artifact_cache.get, application_id, content_hash, ".pdf")
+        if cached_pdf is not None:
+            return cached_pdf
+
+        # 生成時即存入快取（只存一次）；未啟用預先生成時不產生縮圖
+        pdf_path = await cls._generate_coalesced(application, priority, content_hash)
+        try:
+            cached_pdf = await asyncio.to_thread(artifact_cache.get, application_id, content_hash, ".pdf")
+            if cached_pdf is None:
+                # 併入了不存入快取的生成，或存入失敗
+                cached_pdf = await asyncio.to_thread(
+                    artifact_cache.put, application_id, content_hash, ".pdf", pdf_path
+                )
+            return cached_pdf
+        finally:
+            pdf_path.unlink(missing_ok=True)
+
+    @classmethod
+    def render_pdf(cls, application: Application, slot: int = 0) -> Path:
+        """
+        生成 PDF 檔案（同步執行，依 PDF_ENGINE 選擇生成方式）
+
+        Args:
+            application: 申請表資料
+            slot: 生成槽位（決定使用的 LibreOffice 設定目錄）
+
+        Returns:
+            Path: 生成的 PDF 檔案路徑（使用後由呼叫者刪除）
+        """
+        if settings.PDF_ENGINE == "native":
+            return cls.render_pdf_native(application)
+        return cls.render_pdf_libreoffice(application, slot)
+
+    @classmethod
+    def render_pdf_native(cls, application: Application) -> Path:
+        """
+        以 fpdf2 直接繪製 PDF（不需要 Word 模板與 LibreOffice）
+
+        Args:
+            application: 申請表資料
+
+        Returns:
+            Path: 生成的 PDF 檔案路徑（使用後由呼叫者刪除）
+        """
+        cls.TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        temp_pdf = cls.TEMP_DIR / f"application_{application.id}_{uuid.uuid4().hex[:8]}.pdf"
 
-                __add__ = __radd__ = __mul__ = __rmul__ = __div__ = __rdiv__ = \
-                __truediv__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = \
-                __mod__ = __rmod__ = __pos__ = __neg__ = \
-                lambda self, other: self._fail_with_undefined_error()
+        try:
+            with observe_duration(PDF_STAGE_DURATION, stage="prepare"):
+                context = cls._prepare_template_data(application)
+
+            with observe_duration(PDF_STAGE_DURATION, stage="render"):
+                NativePdfRenderer.render(context, temp_pdf)
+
+            return temp_pdf
 
-                __lt__ = __le__ = __gt__ = __ge__ = __eq__ = __ne__ = \
-                __hash__ = lambda self, other: self._fail_with_undefined_error()
+        except Exception as e:
+            logger.exception("PDF 生成失敗 (application_id=%s)", application.id)
+            temp_pdf.unlink(missing_ok=True)
+            raise Exception(f"生成 PDF 失敗: {str(e)}")
+
+    @classmethod
+    def render_pdf_libreoffice(cls, application: Application, slot: int = 0) -> Path:
+        """
+        填入 Word 模板後以 LibreOffice 轉換為 PDF
+
+        Args:
+            application: 申請表資料
+            slot: 生成槽位（決定使用的 LibreOffice 設定目錄）
 
-                __getitem__ = lambda self, other: self._fail_with_undefined_error()
+        Returns:
+            Path: 生成的 PDF 檔案路徑（使用後由呼叫者刪除）
+        """
+        from docxtpl import DocxTemplate, InlineImage
 
-                def __str__(self):
-                    return ''
+        # 確保臨時目錄存在
+        cls.TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
-                def __len__(self):
-                    return 0
+        # 檢查模板是否存在
+        if not cls.TEMPLATE_PATH.exists():
+            raise FileNotFoundError(f"Word 模板不存在: {cls.TEMPLATE_PATH}")
 
-                def __iter__(self):
-                    return iter([])
+        # 每次生成使用不重複的檔名，同一份申請表同時匯出（或在不同 worker）時
+        # 不會互相覆蓋或刪除對方的檔案
+        temp_stem = f"application_{application.id}_{uuid.uuid4().hex[:8]}"
+        temp_docx = cls.TEMP_DIR / f"{temp_stem}.docx"
+        temp_pdf = cls.TEMP_DIR / f"{temp_stem}.pdf"
 
-                def __bool__(self):
-                    return False
+        try:
+            with observe_duration(PDF_STAGE_DURATION, stage="prepare"):
+                # 1. 載入 Word 模板
+                doc = DocxTemplate(cls.TEMPLATE_PATH)
 
-            jinja_env = Environment(undefined=SilentUndefined)
-            doc.render(context, jinja_env=jinja_env)
+                # 2. 準備模板資料（傳入 doc 以便建立簽名圖片）
+                context = cls._prepare_template_data(application, doc)
 
-            # 4. 儲存填充好的 Word 檔案到臨時目錄
-            temp_docx = cls.TEMP_DIR / f"application_{application.id}.docx"
-            doc.save(temp_docx)
+            # 3. 渲染模板
+            # 模板資料只在啟用 DEBUG 時序列化（排除圖片物件），避免每次匯出的額外耗時
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_context = {k: v if not isinstance(v, InlineImage) else "<InlineImage>" for k, v in context.items()}
+                logger.debug(
+                    "PDF 模板資料 (application_id=%s): %s",
+                    application.id,
+                    json.dumps(debug_context, ensure_ascii=False, default=str),
+                )
+
+            jinja_env = cls._create_jinja_env()
+            with observe_duration(PDF_STAGE_DURATION, stage="render"):
+                doc.render(context, jinja_env=jinja_env)
+
+                # 4. 儲存填充好的 Word 檔案到臨時目錄
+                doc.save(temp_docx)
 
             # 5. 轉換為 PDF
-            temp_pdf = cls.TEMP_DIR / f"application_{application.id}.pdf"
-            cls._convert_docx_to_pdf(temp_docx, temp_pdf)
+            with observe_duration(PDF_STAGE_DURATION, stage="convert"):
+                cls._convert_docx_to_pdf(temp_docx, temp_pdf, slot)
 
             # 6. 清理臨時 Word 檔案
             if temp_docx.exists():
@@ -457,14 +913,9 @@ class PDFService:
             return temp_pdf
 
         except Exception as e:
-            # 列印完整的錯誤堆疊以便除錯
-            print(f"PDF生成錯誤詳情:")
-            traceback.print_exc()
+            logger.exception("PDF 生成失敗 (application_id=%s)", application.id)
 
             # 清理可能產生的臨時檔案
-            temp_docx = cls.TEMP_DIR / f"application_{application.id}.docx"
-            temp_pdf = cls.TEMP_DIR / f"application_{application.id}.pdf"
-
             if temp_docx.exists():
                 temp_docx.unlink()
             if temp_pdf.exists():
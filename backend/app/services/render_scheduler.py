@@ -0,0 +1,144 @@
+"""
+PDF 生成排程
+
+所有 PDF 生成（同步匯出、匯出工作、審核通知郵件附件、預先生成）都經過此排程，
+依優先順序取得生成槽位：使用者等待下載的匯出最優先，其次是通知郵件，最後是
+批次與預先生成。
+
+- 每個行程共 PDF_RENDER_CONCURRENCY 個槽位，每個槽位使用各自的 LibreOffice
+  設定目錄，可同時轉換
+- 通知與批次各有上限（PDF_RENDER_NOTIFICATION_CONCURRENCY、
+  PDF_RENDER_BULK_CONCURRENCY），大量審核或預先生成不會佔滿所有槽位
+- 同一優先順序內先到先服務
+- 尚未取得槽位的請求可提高優先順序（RenderTicket.raise_priority），例如使用者
+  併入正在排隊的批次生成時，不必等待批次上限
+"""
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from ..config import settings
+from ..models.pdf_job import RenderPriority
+from ..utils.metrics import PDF_RENDER_QUEUE_WAIT, PDF_RENDER_QUEUED, PDF_RENDER_RUNNING
+
+
+class RenderTicket:
+    """一個生成請求的優先順序；取得槽位前可提高"""
+
+    def __init__(self, priority: RenderPriority):
+        self.priority = priority
+        self._scheduler: Optional["RenderScheduler"] = None
+        self._future: Optional[asyncio.Future] = None
+
+    def raise_priority(self, priority: RenderPriority) -> None:
+        """
+        提高優先順序（數字越小越優先）；已取得槽位或不比目前優先時不變
+
+        Args:
+            priority: 新的優先順序
+        """
+        if priority >= self.priority or (self._future is not None and self._future.done()):
+            return
+        if self._future is not None:
+            PDF_RENDER_QUEUED.labels(self.priority.name.lower()).dec()
+            PDF_RENDER_QUEUED.labels(priority.name.lower()).inc()
+        self.priority = priority
+        if self._scheduler is not None:
+            self._scheduler._dispatch()
+
+
+class RenderScheduler:
+    """PDF 生成槽位的優先順序排程（單一行程內）"""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self._concurrency = concurrency
+        self._free_slots: Optional[List[int]] = None
+        self._running: Dict[RenderPriority, int] = {priority: 0 for priority in RenderPriority}
+        self._waiters: List[Tuple[int, RenderTicket, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def concurrency(self) -> int:
+        if self._concurrency is not None:
+            return self._concurrency
+        return max(settings.PDF_RENDER_CONCURRENCY, 1)
+
+    def _limit(self, priority: RenderPriority) -> int:
+        """該優先順序最多同時使用的槽位數量"""
+        if priority == RenderPriority.NOTIFICATION:
+            return min(max(settings.PDF_RENDER_NOTIFICATION_CONCURRENCY, 1), self.concurrency)
+        if priority == RenderPriority.BULK:
+            return min(max(settings.PDF_RENDER_BULK_CONCURRENCY, 1), self.concurrency)
+        return self.concurrency
+
+    def _dispatch(self) -> None:
+        """將空出的槽位分配給優先順序最高、且未超過上限的等待者"""
+        if self._free_slots is None:
+            self._free_slots = list(range(self.concurrency))
+
+        # 優先順序可能在排隊期間提高，每次依目前的優先順序排序
+        for _, ticket, future in sorted(self._waiters, key=lambda entry: (entry[1].priority, entry[0])):
+            if not self._free_slots:
+                break
+            priority = ticket.priority
+            if future.done() or self._running[priority] >= self._limit(priority):
+                continue
+            self._running[priority] += 1
+            future.set_result(self._free_slots.pop())
+
+        # 移除已分配槽位與已取消的等待者
+        self._waiters = [entry for entry in self._waiters if not entry[2].done()]
+
+    def _release(self, slot: int, priority: RenderPriority) -> None:
+        self._running[priority] -= 1
+        self._free_slots.append(slot)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Union[RenderPriority, RenderTicket]) -> AsyncIterator[int]:
+        """
+        取得生成槽位
+
+        Args:
+            priority: 優先順序；傳入 RenderTicket 時可在等待期間提高
+
+        Yields:
+            int: 槽位編號（決定使用的 LibreOffice 設定目錄）
+        """
+        ticket = priority if isinstance(priority, RenderTicket) else RenderTicket(priority)
+        future = asyncio.get_running_loop().create_future()
+        ticket._scheduler = self
+        ticket._future = future
+        self._waiters.append((next(self._sequence), ticket, future))
+        enqueued = time.perf_counter()
+        PDF_RENDER_QUEUED.labels(ticket.priority.name.lower()).inc()
+        self._dispatch()
+
+        try:
+            slot = await future
+        except asyncio.CancelledError:
+            # 已分配槽位但等待者被取消：歸還槽位
+            if future.done() and not future.cancelled():
+                self._release(future.result(), ticket.priority)
+            else:
+                self._dispatch()
+            raise
+        finally:
+            PDF_RENDER_QUEUED.labels(ticket.priority.name.lower()).dec()
+
+        # 取得槽位後優先順序不再改變
+        priority = ticket.priority
+        label = priority.name.lower()
+        PDF_RENDER_QUEUE_WAIT.labels(label).observe(time.perf_counter() - enqueued)
+        PDF_RENDER_RUNNING.labels(label).inc()
+        try:
+            yield slot
+        finally:
+            PDF_RENDER_RUNNING.labels(label).dec()
+            self._release(slot, priority)
+
+
+# 全域 PDF 生成排程
+render_scheduler = RenderScheduler()
@@ -0,0 +1,154 @@
+"""
+初始資料匯入服務 - 從全校名單 Excel 匯入學生資料並建立帳號
+
+應用啟動時若資料庫沒有學生資料，會自動匯入 SEED_STUDENTS_FILE。
+多個 worker 同時啟動時，以 MongoDB 中的鎖確保只有一個 worker 執行匯入。
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Set
+
+from pymongo.errors import DuplicateKeyError
+
+from ..config import settings
+from ..database import mongodb_client
+from ..models.student import Student
+from ..models.user import User
+from ..utils.auth import get_password_hash
+
+logger = logging.getLogger(__name__)
+
+# 預設教師帳號（密碼請於正式部署後修改）
+DEFAULT_TEACHER_USERNAME = "fhshbook@fhsh.tp.edu.tw"
+DEFAULT_TEACHER_PASSWORD = "fhshbook"
+
+
+class SeedService:
+    """學生名單匯入服務"""
+
+    LOCK_ID = "student_seed"
+    # 持有鎖的 worker 異常終止時，超過此時間的鎖視為失效
+    LOCK_TIMEOUT = timedelta(minutes=10)
+
+    @staticmethod
+    def _locks():
+        return mongodb_client.client[settings.MONGODB_DB_NAME]["startup_locks"]
+
+    async def _acquire_lock(self) -> bool:
+        """取得匯入鎖，已被其他 worker 持有時返回 False"""
+        locks = self._locks()
+        now = datetime.utcnow()
+        await locks.delete_one({"_id": self.LOCK_ID, "acquired_at": {"$lt": now - self.LOCK_TIMEOUT}})
+        try:
+            await locks.insert_one({"_id": self.LOCK_ID, "acquired_at": now})
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def _release_lock(self) -> None:
+        await self._locks().delete_one({"_id": self.LOCK_ID})
+
+    @staticmethod
+    def _build_users(rows: List[dict], existing_usernames: Set[str]) -> List[User]:
+        """建立學生帳號（bcrypt 雜湊耗時，在執行緒中呼叫）"""
+        users = []
+        for row in rows:
+            student_id = str(row["學號"])
+            username = f"{student_id}@fhsh.tp.edu.tw"
+            if username in existing_usernames:
+                continue
+            users.append(User(
+                username=username,
+                hashed_password=get_password_hash(student_id),
+                role="student",
+                student_id=student_id,
+                student_name=str(row["姓名"]),
+                class_name=str(row["班級"]),
+                seat_number=int(row["座號"]),
+            ))
+        return users
+
+    async def import_students(self, excel_path: str) -> int:
+        """
+        從 Excel 匯入學生資料（取代現有學生資料），並建立學生帳號與預設教師帳號
+
+        已存在的帳號不會重建；學生資料最後寫入，作為匯入完成的標記。
+
+        Args:
+            excel_path: Excel 檔案路徑（欄位：學號、班級、座號、姓名）
+
+        Returns:
+            int: 匯入的學生數量
+        """
+        import pandas as pd
+
+        df = await asyncio.to_thread(pd.read_excel, excel_path)
+        rows = df.to_dict("records")
+        logger.info("讀取學生名單 %s：%d 筆", excel_path, len(rows))
+
+        existing_usernames = {
+            document["username"]
+            async for document in User.get_motor_collection().find({}, {"username": 1})
+        }
+
+        users = await asyncio.to_thread(self._build_users, rows, existing_usernames)
+        if users:
+            await User.insert_many(users)
+        logger.info("已建立 %d 個學生帳號（略過 %d 個已存在的帳號）", len(users), len(rows) - len(users))
+
+        if DEFAULT_TEACHER_USERNAME not in existing_usernames:
+            teacher = User(
+                username=DEFAULT_TEACHER_USERNAME,
+                hashed_password=get_password_hash(DEFAULT_TEACHER_PASSWORD),
+                role="teacher",
+                teacher_name="圖書館",
+                teacher_title="預設帳號",
+            )
+            await teacher.insert()
+            logger.info("已建立預設教師帳號 %s", DEFAULT_TEACHER_USERNAME)
+
+        await Student.delete_all()
+        students = [
+            Student(
+                student_id=str(row["學號"]),
+                class_name=str(row["班級"]),
+                seat_number=int(row["座號"]),
+                name=str(row["姓名"]),
+            )
+            for row in rows
+        ]
+        if students:
+            await Student.insert_many(students)
+        logger.info("已匯入 %d 筆學生資料", len(students))
+        return len(students)
+
+    async def seed_if_empty(self) -> bool:
+        """
+        資料庫沒有學生資料時匯入 SEED_STUDENTS_FILE
+
+        Returns:
+            bool: 是否執行了匯入
+        """
+        excel_path = settings.SEED_STUDENTS_FILE
+        if not excel_path:
+            return False
+        if await Student.find_one() is not None:
+            return False
+        if not Path(excel_path).exists():
+            logger.warning("資料庫沒有學生資料，但學生名單不存在: %s", excel_path)
+            return False
+
+        if not await self._acquire_lock():
+            logger.info("其他 worker 正在匯入學生名單，略過")
+            return False
+
+        try:
+            # 取得鎖後再確認一次（其他 worker 可能剛完成匯入）
+            if await Student.find_one() is not None:
+                return False
+            await self.import_students(excel_path)
+            return True
+        finally:
+            await self._release_lock()
@@ -2,7 +2,9 @@
 使用者服務層 - 使用 Beanie ODM
 """
 from typing import Optional
-from beanie import PydanticObjectId
+from datetime import datetime
+from beanie import PydanticObjectId, UpdateResponse
+from ..models.base import RevisionConflictError, revision_filter
 from ..models.user import User, UserCreate, UserRole
 from ..utils.auth import get_password_hash, verify_password
 
@@ -95,27 +97,48 @@ class UserService:
             return None
         return user
 
-    async def update_user(self, user_id: str, update_data: dict) -> Optional[User]:
+    async def update_user(
+        self,
+        user_id: str,
+        update_data: dict,
+        expected_revision: Optional[int] = None
+    ) -> Optional[User]:
         """
         更新使用者資訊
 
+        以單次 find_one_and_update 只 $set 變更的欄位。
+
         Args:
             user_id: 使用者 ID
             update_data: 更新的資料
+            expected_revision: 預期版本號，None 表示不檢查
 
         Returns:
             Optional[User]: 更新後的使用者物件
+
+        Raises:
+            RevisionConflictError: 版本號不符
         """
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            return None
+        object_id = PydanticObjectId(user_id)
+
+        # 只更新模型中存在的欄位
+        fields = {
+            key: value
+            for key, value in update_data.items()
+            if key in User.model_fields and key not in ("id", "revision")
+        }
+        fields["updated_at"] = datetime.utcnow()
+
+        query = {"_id": object_id, **revision_filter(expected_revision)}
+        user = await User.find_one(query).update(
+            {"$set": fields, "$inc": {"revision": 1}},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
 
-        # 更新欄位
-        for key, value in update_data.items():
-            if hasattr(user, key):
-                setattr(user, key, value)
+        if user is None and expected_revision is not None:
+            if await User.find_one(User.id == object_id).count():
+                raise RevisionConflictError("使用者資料已被修改，請重新載入後再試")
 
-        await user.save()
         return user
 
     async def delete_user(self, user_id: str) -> bool:
@@ -155,7 +178,9 @@ class UserService:
         if not verify_password(old_password, user.hashed_password):
             raise ValueError("舊密碼錯誤")
 
-        # 加密新密碼
-        user.hashed_password = get_password_hash(new_password)
-        await user.save()
+        # 加密新密碼（只 $set 密碼欄位）
+        await user.set({
+            User.hashed_password: get_password_hash(new_password),
+            User.updated_at: datetime.utcnow(),
+        })
         return True
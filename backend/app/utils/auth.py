@@ -8,10 +8,14 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from ..config import settings
+from .metrics import PASSWORD_HASH_DURATION, observe_duration
 
 # 密碼加密上下文（使用較快的rounds以加速批次初始化）
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=8)
 
+# 事件串流 token 的 scope：只能用於訂閱申請表事件，不能呼叫其他 API
+EVENTS_TOKEN_SCOPE = "application_events"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -24,7 +28,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: 密碼是否匹配
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with observe_duration(PASSWORD_HASH_DURATION, operation="verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -37,7 +42,8 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: 加密後的密碼
     """
-    return pwd_context.hash(password)
+    with observe_duration(PASSWORD_HASH_DURATION, operation="hash"):
+        return pwd_context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -62,21 +68,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[dict]:
+def create_events_token(user_id: str) -> str:
+    """
+    建立事件串流用的短效 token
+
+    EventSource 只能以查詢參數傳遞 token，網址可能被記錄在存取日誌中，
+    因此不使用登入 token，改用有效時間短、只能訂閱事件的 token。
+
+    Args:
+        user_id: 使用者 ID
+
+    Returns:
+        str: JWT token（SSE_TOKEN_EXPIRE_SECONDS 秒後過期）
+    """
+    return create_access_token(
+        data={"user_id": user_id, "scope": EVENTS_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=settings.SSE_TOKEN_EXPIRE_SECONDS),
+    )
+
+
+def decode_access_token(token: str, scope: Optional[str] = None) -> Optional[dict]:
     """
     解碼 JWT token
 
     Args:
         token: JWT token
+        scope: 要求的 scope；None 表示登入 token（帶有 scope 的 token 不接受）
 
     Returns:
-        Optional[dict]: 解碼後的資料，失敗返回 None
+        Optional[dict]: 解碼後的資料，失敗或 scope 不符返回 None
     """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    if payload.get("scope") != scope:
+        return None
+    return payload
 
 
 # HTTP Bearer 安全方案
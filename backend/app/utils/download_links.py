@@ -0,0 +1,83 @@
+"""
+簽章下載網址（HMAC-SHA256）
+
+網址包含檔案、下載檔名與到期時間，以 SECRET_KEY 簽章：
+持有網址即可下載（不需登入），到期或內容被竄改時無效。
+
+    /downloads/{kind}/{file_name}?filename=...&expires=...&signature=...
+
+kind 對應可下載的目錄（見 DOWNLOAD_DIRS），file_name 為目錄下的檔名
+（artifacts 為生成結果快取的鍵，使用物件儲存時不在本機目錄）。
+"""
+import hashlib
+import hmac
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from ..config import settings
+
+# 可下載的目錄（設定可在執行時修改，因此以函式取得）
+DOWNLOAD_DIRS: Dict[str, Callable[[], str]] = {
+    "artifacts": lambda: settings.ARTIFACT_CACHE_DIR,
+    "pdf-jobs": lambda: settings.PDF_JOB_DIR,
+}
+
+
+def _signature(kind: str, file_name: str, filename: str, expires: int) -> str:
+    message = "\n".join((kind, file_name, filename, str(expires))).encode("utf-8")
+    key = f"download:{settings.SECRET_KEY}".encode("utf-8")
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def sign_download(kind: str, file_name: str, filename: str, ttl_seconds: int) -> Tuple[str, int]:
+    """
+    產生簽章下載網址
+
+    Args:
+        kind: 目錄種類（DOWNLOAD_DIRS 的鍵）
+        file_name: 目錄下的檔名
+        filename: 下載時使用的檔名
+        ttl_seconds: 有效時間（秒）
+
+    Returns:
+        Tuple[str, int]: (相對於 API 根目錄的網址, 到期時間的 Unix 時間戳)
+    """
+    if kind not in DOWNLOAD_DIRS:
+        raise ValueError(f"未知的下載目錄: {kind}")
+    expires = int(time.time()) + ttl_seconds
+    query = urlencode({
+        "filename": filename,
+        "expires": expires,
+        "signature": _signature(kind, file_name, filename, expires),
+    })
+    return f"/downloads/{kind}/{quote(file_name)}?{query}", expires
+
+
+def verify_download(kind: str, file_name: str, filename: str, expires: int, signature: str) -> Optional[str]:
+    """
+    驗證簽章下載網址
+
+    Returns:
+        Optional[str]: 無效的原因（invalid：簽章錯誤、expired：已過期），有效時返回 None
+    """
+    if kind not in DOWNLOAD_DIRS or not hmac.compare_digest(
+        _signature(kind, file_name, filename, expires), signature
+    ):
+        return "invalid"
+    if expires < time.time():
+        return "expired"
+    return None
+
+
+def download_path(kind: str, file_name: str) -> Optional[Path]:
+    """
+    取得下載檔案的路徑（只允許目錄下的一般檔名）
+
+    Returns:
+        Optional[Path]: 檔案路徑，檔名不合法返回 None
+    """
+    if Path(file_name).name != file_name or file_name.startswith("."):
+        return None
+    return Path(DOWNLOAD_DIRS[kind]()) / file_name
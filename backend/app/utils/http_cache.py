@@ -0,0 +1,75 @@
+"""
+HTTP 條件式請求（ETag / If-None-Match）工具函式
+"""
+import hashlib
+from typing import Any, Optional
+from fastapi import Response, status
+
+# 回應含個人資料：只允許瀏覽器快取，且每次使用前必須以 ETag 重新驗證
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_weak_etag(*parts: Any) -> str:
+    """
+    由版本資訊產生弱 ETag
+
+    Args:
+        parts: 組成版本的各項資訊（ID、版本號、更新時間等）
+
+    Returns:
+        str: 例如 W/"3f2a..."
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    以弱比較判斷 If-None-Match 是否符合目前的 ETag
+
+    Args:
+        if_none_match: 請求中的 If-None-Match 標頭
+        etag: 目前的 ETag
+
+    Returns:
+        bool: 是否符合（可返回 304）
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        if candidate.strip().removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """
+    設定 ETag 與快取相關標頭
+
+    Args:
+        response: 回應物件
+        etag: ETag
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(etag: str) -> Response:
+    """
+    建立 304 Not Modified 回應
+
+    Args:
+        etag: ETag
+
+    Returns:
+        Response: 304 回應
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag)
+    return response
@@ -0,0 +1,97 @@
+"""
+日誌設定
+
+- 以 LOG_LEVEL 設定整體等級，LOG_LEVELS 可針對個別模組覆寫
+  （例如 "app.services.pdf_service=DEBUG,pymongo=WARNING"）
+- 每筆日誌帶有請求 ID（由 RequestIdMiddleware 設定），方便串起同一請求的紀錄
+- LOG_FORMAT=json 時每行輸出一個 JSON 物件；text 適合本地開發閱讀
+
+各模組使用 logging.getLogger(__name__) 並以 % 參數傳入變數（例如
+logger.debug("資料: %s", data)），等級未啟用時不會進行字串格式化。
+"""
+import json
+import logging
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict
+
+from ..config import settings
+
+# 目前請求的 ID（請求以外的背景工作為 "-"）
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# LogRecord 的內建屬性；其他屬性視為透過 extra 傳入的結構化欄位
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """將目前的請求 ID 加到每筆日誌"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """每筆日誌輸出為一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """
+    解析個別模組的日誌等級設定
+
+    Args:
+        spec: 例如 "app.services.pdf_service=DEBUG,pymongo=WARNING"
+
+    Returns:
+        Dict: 模組名稱 -> 日誌等級
+
+    Raises:
+        ValueError: 格式或等級名稱不正確
+    """
+    levels: Dict[str, int] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, level_name = item.partition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not sep or not name.strip() or not isinstance(level, int):
+            raise ValueError(f"無效的 LOG_LEVELS 設定: {item}")
+        levels[name.strip()] = level
+    return levels
+
+
+def setup_logging() -> None:
+    """依設定初始化根 logger（應用啟動時呼叫一次）"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(RequestIdFilter())
+    if settings.LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name, level in parse_module_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
@@ -0,0 +1,330 @@
+"""
+Prometheus 效能指標
+
+集中定義所有指標，讓各模組只需匯入對應的指標物件並記錄耗時。
+指標名稱統一使用 fhsh_ 前綴與秒為單位。
+
+多個 worker 行程時，啟動指令碼會設定 PROMETHEUS_MULTIPROC_DIR，各行程將指標
+寫入該目錄，/metrics 匯出所有行程的合計（Gauge 為存活行程的加總）。
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pymongo import monitoring
+
+from ..config import settings
+
+# HTTP 請求耗時（大多數 API 在毫秒級，PDF 匯出可達數秒）
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 外部程序 / 網路操作耗時（LibreOffice、SMTP）
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+# MongoDB 指令耗時
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "fhsh_http_request_duration_seconds",
+    "HTTP 請求耗時（依路由樣板）",
+    ["method", "route", "status"],
+    buckets=HTTP_BUCKETS,
+)
+
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "fhsh_http_requests_in_progress",
+    "處理中的 HTTP 請求數量",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "fhsh_mongodb_command_duration_seconds",
+    "MongoDB 指令耗時（驅動程式量測）",
+    ["command", "collection"],
+    buckets=MONGO_BUCKETS,
+)
+
+MONGO_COMMAND_FAILURES = Counter(
+    "fhsh_mongodb_command_failures_total",
+    "MongoDB 指令失敗次數",
+    ["command", "collection"],
+)
+
+MONGO_POOL_CONNECTIONS = Gauge(
+    "fhsh_mongodb_pool_connections",
+    "MongoDB 連線池中已建立的連線數量",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "fhsh_mongodb_pool_checked_out",
+    "MongoDB 連線池中使用中的連線數量（接近 MONGODB_MAX_POOL_SIZE 表示連線池不足）",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+
+MONGO_POOL_MAX_SIZE = Gauge(
+    "fhsh_mongodb_pool_max_size",
+    "MongoDB 連線池上限（MONGODB_MAX_POOL_SIZE，多個 worker 時為加總）",
+    multiprocess_mode="livesum",
+)
+
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "fhsh_mongodb_pool_checkout_wait_seconds",
+    "取得 MongoDB 連線的等待時間",
+    buckets=MONGO_BUCKETS,
+)
+
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "fhsh_mongodb_pool_checkout_failures_total",
+    "取得 MongoDB 連線失敗次數（例如等待逾時）",
+    ["reason"],
+)
+
+PDF_STAGE_DURATION = Histogram(
+    "fhsh_pdf_stage_duration_seconds",
+    "PDF 生成各階段耗時（prepare: 準備資料與簽名、render: 模板渲染與存檔、convert: LibreOffice 轉換、thumbnail: 第一頁縮圖）",
+    ["stage"],
+    buckets=SLOW_BUCKETS,
+)
+
+PDF_RENDER_QUEUE_WAIT = Histogram(
+    "fhsh_pdf_render_queue_wait_seconds",
+    "PDF 生成等待槽位的時間（依優先順序：interactive / notification / bulk）",
+    ["priority"],
+    buckets=SLOW_BUCKETS,
+)
+
+PDF_RENDER_QUEUED = Gauge(
+    "fhsh_pdf_render_queued",
+    "等待生成槽位的 PDF 數量",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+
+PDF_RENDER_RUNNING = Gauge(
+    "fhsh_pdf_render_running",
+    "生成中的 PDF 數量",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+
+PDF_RENDERS_COALESCED = Counter(
+    "fhsh_pdf_renders_coalesced_total",
+    "併入同一份申請表（同一版本）生成中的 PDF、未重新生成的次數",
+)
+
+PDF_PRERENDERS = Counter(
+    "fhsh_pdf_prerenders_total",
+    "PDF 預先生成次數（rendered：已生成、skipped：內容未變更、failed：失敗）",
+    ["result"],
+)
+
+ARTIFACT_CACHE_REQUESTS = Counter(
+    "fhsh_artifact_cache_requests_total",
+    "生成結果快取查詢次數",
+    ["kind", "result"],
+)
+
+SIGNED_DOWNLOADS = Counter(
+    "fhsh_signed_downloads_total",
+    "簽章下載網址的請求次數（ok、invalid：簽章錯誤、expired：已過期、missing：檔案已刪除）",
+    ["kind", "result"],
+)
+
+PDF_JOBS_FINISHED = Counter(
+    "fhsh_pdf_jobs_finished_total",
+    "已結束的 PDF 匯出工作數量",
+    ["status"],
+)
+
+APPLICATION_EXPORT_ROWS = Counter(
+    "fhsh_application_export_rows_total",
+    "匯出的申請表筆數",
+    ["format"],
+)
+
+PDF_JOB_QUEUE_WAIT = Histogram(
+    "fhsh_pdf_job_queue_wait_seconds",
+    "PDF 匯出工作從建立到第一次開始執行的等待時間",
+    buckets=SLOW_BUCKETS,
+)
+
+PDF_JOBS_RUNNING = Gauge(
+    "fhsh_pdf_jobs_running",
+    "執行中的 PDF 匯出工作數量",
+    multiprocess_mode="livesum",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "fhsh_password_hash_duration_seconds",
+    "bcrypt 雜湊 / 驗證耗時",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+EMAIL_SEND_DURATION = Histogram(
+    "fhsh_email_send_duration_seconds",
+    "SMTP 郵件發送耗時",
+    ["result"],
+    buckets=SLOW_BUCKETS,
+)
+
+BACKGROUND_TASKS_PENDING = Gauge(
+    "fhsh_background_tasks_pending",
+    "已排入但尚未完成的背景任務數量",
+    ["task"],
+    multiprocess_mode="livesum",
+)
+
+DRAFT_BUFFER_PENDING = Gauge(
+    "fhsh_draft_buffer_pending",
+    "草稿寫入緩衝中尚未寫入資料庫的草稿數量",
+    multiprocess_mode="livesum",
+)
+
+# 寫入減少比例 = 1 - rate(fhsh_draft_database_writes_total) / rate(fhsh_draft_save_requests_total)
+DRAFT_SAVE_REQUESTS = Counter(
+    "fhsh_draft_save_requests_total",
+    "經過草稿寫入緩衝的儲存請求次數",
+)
+
+DRAFT_DATABASE_WRITES = Counter(
+    "fhsh_draft_database_writes_total",
+    "草稿寫入緩衝實際寫入資料庫的次數",
+)
+
+SSE_SUBSCRIBERS = Gauge(
+    "fhsh_sse_subscribers",
+    "申請表事件串流的連線數量",
+    multiprocess_mode="livesum",
+)
+
+
+@contextmanager
+def observe_duration(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """
+    量測區塊耗時並記錄到指定的 Histogram
+
+    Args:
+        histogram: 指標物件
+        **labels: 指標標籤
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    記錄每個 MongoDB 指令耗時的 PyMongo 監聽器
+
+    在建立 Motor 客戶端時以 event_listeners 傳入；耗時由驅動程式量測
+    （不含排隊等待連線的時間）。
+    """
+
+    def __init__(self):
+        # request_id -> 集合名稱（完成事件不含指令內容）
+        self._collections: Dict[int, str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = event.command.get(event.command_name)
+        self._collections[event.request_id] = collection if isinstance(collection, str) else ""
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._collections.pop(event.request_id, "")
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection).observe(
+            event.duration_micros / 1_000_000
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._collections.pop(event.request_id, "")
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection).observe(
+            event.duration_micros / 1_000_000
+        )
+        MONGO_COMMAND_FAILURES.labels(event.command_name, collection).inc()
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """記錄 MongoDB 連線池使用量的 PyMongo 監聽器"""
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def pool_created(self, event) -> None:
+        MONGO_POOL_MAX_SIZE.set(settings.MONGODB_MAX_POOL_SIZE)
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        address = self._address(event)
+        MONGO_POOL_CONNECTIONS.labels(address).set(0)
+        MONGO_POOL_CHECKED_OUT.labels(address).set(0)
+
+    def connection_created(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).inc()
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).dec()
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        MONGO_POOL_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+
+    def connection_checked_out(self, event) -> None:
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).inc()
+        MONGO_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_checked_in(self, event) -> None:
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).dec()
+
+
+def render_metrics() -> bytes:
+    """
+    匯出所有指標（Prometheus 文字格式）
+
+    Returns:
+        bytes: 指標內容
+    """
+    # 收集時才讀取的狀態量（多個 worker 時草稿緩衝停用，恆為 0）
+    from ..services.draft_buffer import draft_write_buffer
+
+    DRAFT_BUFFER_PENDING.set(draft_write_buffer.stats()["pending"])
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def mark_process_dead() -> None:
+    """worker 行程結束時移除其 Gauge 數值（僅多行程模式）"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
@@ -0,0 +1,231 @@
+"""
+單一請求的效能剖析
+
+被選中剖析的請求（帶有正確的 X-Profile 密鑰，或依 PROFILING_SAMPLE_RATE 抽樣）
+會記錄：
+- CPU 取樣（pyinstrument，async 模式只計入該請求自己的協程）
+- 請求期間每個 MongoDB 指令的時間軸（相對請求開始的時間與耗時）
+
+最近 PROFILING_MAX_PROFILES 筆寫入 PROFILING_DIR（所有 worker 行程共用），
+由教師專用端點下載。
+"""
+import json
+import os
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pymongo import monitoring
+
+from ..config import settings
+
+
+@dataclass
+class MongoCall:
+    """一次 MongoDB 指令"""
+    command: str
+    collection: str
+    start_ms: float  # 相對請求開始
+    duration_ms: Optional[float] = None
+    ok: Optional[bool] = None
+
+
+@dataclass
+class RequestProfile:
+    """單一請求的剖析結果"""
+    id: str
+    method: str
+    path: str
+    query: str
+    request_id: str
+    trigger: str  # header 或 sample
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    start: float = field(default_factory=time.perf_counter)
+    status_code: Optional[int] = None
+    duration_ms: Optional[float] = None
+    cpu_ms: Optional[float] = None
+    mongo_calls: List[MongoCall] = field(default_factory=list)
+    session: Any = field(default=None, repr=False)  # pyinstrument Session
+    _pending: Dict[int, MongoCall] = field(default_factory=dict, repr=False)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        """列表用的摘要"""
+        mongo_total = sum(call.duration_ms or 0 for call in self.mongo_calls)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "request_id": self.request_id,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "cpu_ms": self.cpu_ms,
+            "mongo_calls": len(self.mongo_calls),
+            "mongo_ms": round(mongo_total, 3),
+        }
+
+    def detail(self) -> Dict[str, Any]:
+        """包含 MongoDB 時間軸的完整內容"""
+        return {
+            **self.summary(),
+            "mongo_timeline": [
+                {
+                    "command": call.command,
+                    "collection": call.collection,
+                    "start_ms": round(call.start_ms, 3),
+                    "duration_ms": None if call.duration_ms is None else round(call.duration_ms, 3),
+                    "ok": call.ok,
+                }
+                for call in self.mongo_calls
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RequestProfile":
+        """由 ProfileStore 儲存的內容還原"""
+        session = None
+        if data.get("session") is not None:
+            from pyinstrument.session import Session
+            session = Session.from_json(data["session"])
+
+        return cls(
+            id=data["id"],
+            method=data["method"],
+            path=data["path"],
+            query=data["query"],
+            request_id=data["request_id"],
+            trigger=data["trigger"],
+            started_at=datetime.fromisoformat(data["started_at"]),
+            status_code=data["status_code"],
+            duration_ms=data["duration_ms"],
+            cpu_ms=data["cpu_ms"],
+            mongo_calls=[MongoCall(**call) for call in data["mongo_timeline"]],
+            session=session,
+        )
+
+
+# 目前請求的剖析（未剖析的請求為 None）；Motor 會把 context 複製到執行緒池，
+# 因此 MongoDB 監聽器也讀得到
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+class MongoProfileListener(monitoring.CommandListener):
+    """將 MongoDB 指令記錄到目前請求的剖析時間軸"""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        profile = current_profile.get()
+        if profile is None:
+            return
+        collection = event.command.get(event.command_name)
+        call = MongoCall(
+            command=event.command_name,
+            collection=collection if isinstance(collection, str) else "",
+            start_ms=profile.elapsed_ms(),
+        )
+        profile._pending[event.request_id] = call
+        profile.mongo_calls.append(call)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, ok=True)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, ok=False)
+
+    @staticmethod
+    def _finish(event, ok: bool) -> None:
+        profile = current_profile.get()
+        if profile is None:
+            return
+        call = profile._pending.pop(event.request_id, None)
+        if call is not None:
+            call.duration_ms = event.duration_micros / 1000
+            call.ok = ok
+
+
+class ProfileStore:
+    """
+    保存最近的剖析結果（超過上限時淘汰最舊的）
+
+    每筆結果（含 CPU 取樣）寫成目錄中的一個 JSON 檔，多個 worker 行程時
+    任何一個 worker 都能讀到其他 worker 記錄的剖析。
+    """
+
+    _ID_PATTERN = re.compile(r"^[0-9a-f]{12}$")
+
+    def __init__(self, directory: Optional[str] = None, max_profiles: Optional[int] = None):
+        self._directory = directory
+        self._max_profiles = max_profiles
+
+    @property
+    def directory(self) -> Path:
+        return Path(self._directory or settings.PROFILING_DIR)
+
+    @property
+    def max_profiles(self) -> int:
+        if self._max_profiles is not None:
+            return self._max_profiles
+        return settings.PROFILING_MAX_PROFILES
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex[:12]
+
+    def _path(self, profile_id: str) -> Path:
+        return self.directory / f"{profile_id}.json"
+
+    def _files(self) -> List[Path]:
+        """由新到舊"""
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # 已被其他 worker 淘汰
+        return [path for _, path in sorted(files, reverse=True)]
+
+    def add(self, profile: RequestProfile) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = profile.detail()
+        data["session"] = profile.session.to_json() if profile.session is not None else None
+
+        # 先寫入暫存檔再改名，避免其他 worker 讀到寫到一半的檔案
+        temp_path = self.directory / f".{profile.id}.tmp"
+        temp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, self._path(profile.id))
+
+        for path in self._files()[self.max_profiles:]:
+            path.unlink(missing_ok=True)
+
+    def _load(self, path: Path) -> Optional[RequestProfile]:
+        try:
+            return RequestProfile.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        if not self._ID_PATTERN.match(profile_id):
+            return None
+        return self._load(self._path(profile_id))
+
+    def list(self) -> List[RequestProfile]:
+        """由新到舊"""
+        profiles = (self._load(path) for path in self._files())
+        return [profile for profile in profiles if profile is not None]
+
+    def clear(self) -> None:
+        for path in self._files():
+            path.unlink(missing_ok=True)
+
+
+# 全域剖析結果儲存
+profile_store = ProfileStore()
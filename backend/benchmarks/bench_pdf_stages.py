@@ -0,0 +1,260 @@
+"""
+PDFService 各階段耗時與記憶體量測
+
+以一組合成申請表（多位組員、長篇學習計畫、多個簽名與大量參考資料）
+分別量測 PDF 生成的每個階段：
+
+- load_template       DocxTemplate 載入 Word 模板
+- signature_decode    簽名 base64 解碼
+- signature_recolor   簽名白色筆跡轉黑色（PIL + numpy）
+- prepare             _prepare_template_data（含上面兩個簽名步驟與 InlineImage 建立）
+- render              DocxTemplate.render
+- save                doc.save 寫出 .docx
+- convert             _convert_docx_to_pdf（LibreOffice；未安裝時略過）
+
+每個階段先量測耗時，再以 tracemalloc 另外跑一輪量測 Python 端的峰值記憶體
+（LibreOffice 是子行程，記憶體以子行程最大 RSS 表示）。
+
+使用方法:
+    python benchmarks/bench_pdf_stages.py
+    python benchmarks/bench_pdf_stages.py --corpus 10 --iterations 3 --plan-items 60
+    python benchmarks/bench_pdf_stages.py --profile cprofile --profile-dir /tmp/pdf-profiles
+    python benchmarks/bench_pdf_stages.py --profile pyinstrument   # 需要安裝 pyinstrument
+"""
+import argparse
+import cProfile
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from beanie import PydanticObjectId
+from docxtpl import DocxTemplate
+
+# 新增父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.application import Application, ApplicationCreate, ApplicationStatus
+from app.services.pdf_service import PDFService
+from fixtures import make_application_payload
+
+STAGES = [
+    "load_template",
+    "signature_decode",
+    "signature_recolor",
+    "prepare",
+    "render",
+    "save",
+    "convert",
+]
+
+# 開發環境的模板位置（Docker 映像內為 PDFService.TEMPLATE_PATH）
+REPO_TEMPLATE = Path(__file__).parent.parent / "附件一 復興自主學習申請表-新版.docx"
+
+
+def build_application(args: argparse.Namespace, seed: int) -> Application:
+    """建立不需資料庫連線的合成申請表"""
+    payload = ApplicationCreate(**make_application_payload(
+        members=args.members,
+        plan_items=args.plan_items,
+        references=args.references,
+        signatures=args.signatures,
+        text_length=args.text_length,
+        seed=seed,
+    ))
+    return Application.model_construct(
+        **dict(payload),
+        id=PydanticObjectId(),
+        status=ApplicationStatus.PASSED,
+        comment="合成測試評語",
+        submitter_id="0" * 24,
+        submitter_student_id=payload.members[0].student_id,
+    )
+
+
+class StageRunner:
+    """依序執行各階段並記錄耗時、峰值記憶體與（選用）profile"""
+
+    def __init__(self, profile: Optional[str]):
+        self.profile = profile
+        self.timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.peak_memory: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.profilers: Dict[str, object] = {}
+        self.trace_memory = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        profiler = self._profiler(name) if not self.trace_memory else None
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        if profiler is not None:
+            profiler.start() if self.profile == "pyinstrument" else profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.stop() if self.profile == "pyinstrument" else profiler.disable()
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                self.peak_memory[name] = max(self.peak_memory[name], peak)
+            else:
+                self.timings[name].append(elapsed)
+
+    def _profiler(self, name: str):
+        if self.profile is None:
+            return None
+        if name not in self.profilers:
+            if self.profile == "pyinstrument":
+                from pyinstrument import Profiler
+                self.profilers[name] = Profiler()
+            else:
+                self.profilers[name] = cProfile.Profile()
+        return self.profilers[name]
+
+    def dump_profiles(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, profiler in self.profilers.items():
+            if self.profile == "pyinstrument":
+                path = directory / f"{name}.html"
+                path.write_text(profiler.output_html(), encoding="utf-8")
+            else:
+                path = directory / f"{name}.prof"
+                profiler.dump_stats(str(path))
+            print(f"  {path}")
+
+
+def run_once(runner: StageRunner, application: Application, template: Path, workdir: Path, convert: bool) -> None:
+    """對一份申請表執行所有階段"""
+    signatures = [sig.image_url for sig in application.signatures if sig.image_url]
+
+    with runner.stage("signature_decode"):
+        decoded = [PDFService._decode_base64_image(data) for data in signatures]
+
+    with runner.stage("signature_recolor"):
+        for image_bytes in decoded:
+            if image_bytes:
+                PDFService._convert_signature_to_black(image_bytes)
+
+    with runner.stage("load_template"):
+        doc = DocxTemplate(template)
+        # DocxTemplate 延遲到 render 時才解析 .docx，這裡先載入以便分開量測
+        doc.init_docx()
+
+    with runner.stage("prepare"):
+        context = PDFService._prepare_template_data(application, doc)
+
+    jinja_env = PDFService._create_jinja_env()
+    with runner.stage("render"):
+        doc.render(context, jinja_env=jinja_env)
+
+    docx_path = workdir / f"application_{application.id}.docx"
+    with runner.stage("save"):
+        doc.save(docx_path)
+
+    if convert:
+        pdf_path = workdir / f"application_{application.id}.pdf"
+        with runner.stage("convert"):
+            PDFService._convert_docx_to_pdf(docx_path, pdf_path)
+        pdf_path.unlink(missing_ok=True)
+
+    docx_path.unlink(missing_ok=True)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    p95_index = max(int(round(0.95 * len(ordered) + 0.5)) - 1, 0)
+    return {
+        "mean": statistics.fmean(ordered) * 1000,
+        "p50": statistics.median(ordered) * 1000,
+        "p95": ordered[min(p95_index, len(ordered) - 1)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="量測 PDFService 各階段耗時與記憶體")
+    parser.add_argument("--template", type=Path, help="Word 模板路徑（預設自動尋找）")
+    parser.add_argument("--corpus", type=int, default=5, help="合成申請表數量")
+    parser.add_argument("--iterations", type=int, default=3, help="每份申請表重複次數")
+    parser.add_argument("--members", type=int, default=3)
+    parser.add_argument("--plan-items", type=int, default=40)
+    parser.add_argument("--references", type=int, default=20)
+    parser.add_argument("--signatures", type=int, default=5)
+    parser.add_argument("--text-length", type=int, default=1200)
+    parser.add_argument("--skip-convert", action="store_true", help="不執行 LibreOffice 轉換")
+    parser.add_argument("--skip-memory", action="store_true", help="不量測峰值記憶體")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], help="輸出各階段 profile")
+    parser.add_argument("--profile-dir", type=Path, default=Path("benchmarks/results/pdf-profiles"))
+    args = parser.parse_args()
+
+    template = args.template
+    if template is None:
+        template = PDFService.TEMPLATE_PATH if PDFService.TEMPLATE_PATH.exists() else REPO_TEMPLATE
+    if not template.exists():
+        parser.error(f"找不到 Word 模板: {template}")
+
+    convert = not args.skip_convert and shutil.which("libreoffice") is not None
+    if not args.skip_convert and not convert:
+        print("未安裝 LibreOffice，略過 convert 階段")
+
+    corpus = [build_application(args, seed) for seed in range(args.corpus)]
+    runner = StageRunner(args.profile)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+
+        # 暖身（模組載入、LibreOffice 首次啟動），不計入結果
+        warmup = StageRunner(None)
+        run_once(warmup, corpus[0], template, workdir, convert)
+
+        for _ in range(args.iterations):
+            for application in corpus:
+                run_once(runner, application, template, workdir, convert)
+
+        if not args.skip_memory:
+            runner.trace_memory = True
+            tracemalloc.start()
+            for application in corpus:
+                run_once(runner, application, template, workdir, convert=False)
+            tracemalloc.stop()
+
+    samples = args.corpus * args.iterations
+    print(
+        f"\n{args.corpus} 份申請表 × {args.iterations} 次（組員 {args.members}、計畫 {args.plan_items} 項、"
+        f"參考資料 {args.references} 筆、簽名 {args.signatures} 個、長文字 {args.text_length} 字）"
+    )
+    print(f"\n{'階段':<20}{'次數':>6}{'mean (ms)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}{'峰值記憶體 (KB)':>18}")
+    print("-" * 82)
+    for stage in STAGES:
+        values = runner.timings[stage]
+        if not values:
+            continue
+        stats = summarize(values)
+        memory = "-" if args.skip_memory or stage == "convert" else f"{runner.peak_memory[stage] / 1024:,.0f}"
+        print(
+            f"{stage:<20}{len(values):>6}{stats['mean']:>12,.1f}{stats['p50']:>12,.1f}"
+            f"{stats['p95']:>12,.1f}{memory:>18}"
+        )
+
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\n本行程最大 RSS: {usage:,.0f} MB（{samples} 次）")
+    if convert:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        print(f"LibreOffice 子行程最大 RSS: {children:,.0f} MB")
+
+    if args.profile:
+        print("\nProfile 輸出:")
+        runner.dump_profiles(args.profile_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+比較申請表響應的 JSON 序列化與壓縮耗時
+
+量測單一 ApplicationResponse 在以下方式下的每次耗時與輸出大小：
+- JSONResponse（標準函式庫 json）
+- ORJSONResponse（orjson）
+- 以上結果再經 GZip 壓縮
+
+使用方法:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --plan-items 30 --iterations 2000
+"""
+import argparse
+import gzip
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# 新增父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.models.application import ApplicationResponse, ApplicationStatus
+from fixtures import make_application_payload
+
+
+def timed(func, iterations: int) -> float:
+    """執行多次並返回平均耗時（微秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較 JSON 序列化與壓縮耗時")
+    parser.add_argument("--members", type=int, default=3)
+    parser.add_argument("--plan-items", type=int, default=16)
+    parser.add_argument("--references", type=int, default=5)
+    parser.add_argument("--signatures", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    payload = make_application_payload(
+        members=args.members,
+        plan_items=args.plan_items,
+        references=args.references,
+        signatures=args.signatures,
+    )
+    now = datetime.utcnow().isoformat()
+    response = ApplicationResponse(
+        id="0" * 24,
+        status=ApplicationStatus.PENDING,
+        comment="",
+        submitter_id="0" * 24,
+        submitter_student_id=payload["members"][0]["student_id"],
+        created_at=now,
+        updated_at=now,
+        **payload,
+    )
+
+    # FastAPI 先以 response_model 轉成 JSON 相容的資料，再交給回應類別 render
+    content = response.model_dump(mode="json")
+    level = settings.GZIP_COMPRESS_LEVEL
+
+    json_body = JSONResponse(content).body
+    orjson_body = ORJSONResponse(content).body
+
+    rows = [
+        ("model_dump(mode=json)", timed(lambda: response.model_dump(mode="json"), args.iterations), None),
+        ("JSONResponse", timed(lambda: JSONResponse(content), args.iterations), len(json_body)),
+        ("ORJSONResponse", timed(lambda: ORJSONResponse(content), args.iterations), len(orjson_body)),
+        (
+            f"ORJSONResponse + gzip({level})",
+            timed(lambda: gzip.compress(ORJSONResponse(content).body, compresslevel=level), args.iterations),
+            len(gzip.compress(orjson_body, compresslevel=level)),
+        ),
+    ]
+
+    print(f"{'步驟':<30}{'每次耗時 (µs)':>16}{'輸出 bytes':>14}")
+    print("-" * 60)
+    for name, micros, size in rows:
+        size_text = f"{size:,}" if size is not None else "-"
+        print(f"{name:<30}{micros:>16,.1f}{size_text:>14}")
+
+
+if __name__ == "__main__":
+    main()
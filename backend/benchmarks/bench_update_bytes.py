@@ -0,0 +1,134 @@
+"""
+比較「整份文件 save()」與「$set 部分更新」每次寫入的位元組數
+
+不需要連線資料庫：直接以 BSON 編碼計算送往 MongoDB 的更新文件大小。
+
+使用方法:
+    python benchmarks/bench_update_bytes.py
+    python benchmarks/bench_update_bytes.py --plan-items 30 --signatures 5
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import bson
+from bson import ObjectId
+from beanie.odm.utils.encoder import Encoder
+
+# 新增父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.application import ApplicationStatus
+from app.services.application_service import ApplicationService
+from fixtures import make_application_payload
+
+
+def encoded_size(document: dict) -> int:
+    """計算文件經 Beanie 編碼後的 BSON 位元組數"""
+    return len(bson.encode(Encoder().encode(document)))
+
+
+def build_full_application(payload: dict) -> dict:
+    """組裝資料庫中完整的申請表文件"""
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        **payload,
+        "status": ApplicationStatus.PENDING,
+        "comment": "",
+        "reviewer_id": None,
+        "submitter_id": str(ObjectId()),
+        "submitter_student_id": payload["members"][0]["student_id"],
+        "revision": 3,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較 save() 與 $set 的寫入位元組數")
+    parser.add_argument("--members", type=int, default=3)
+    parser.add_argument("--plan-items", type=int, default=16)
+    parser.add_argument("--references", type=int, default=5)
+    parser.add_argument("--signatures", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_application_payload(
+        members=args.members,
+        plan_items=args.plan_items,
+        references=args.references,
+        signatures=args.signatures,
+    )
+    application = build_full_application(payload)
+    object_id = application["_id"]
+
+    user = {
+        "_id": ObjectId(),
+        "username": "11430001@fhsh.tp.edu.tw",
+        "hashed_password": "$2b$08$" + "x" * 53,
+        "role": "student",
+        "is_active": True,
+        "student_id": "11430001",
+        "student_name": "測試學生",
+        "class_name": "101",
+        "seat_number": 1,
+        "revision": 0,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+
+    # (情境, save() 寫入位元組, $set 寫入位元組)
+    scenarios = [
+        (
+            "教師審核（狀態 + 評語）",
+            encoded_size(application),
+            encoded_size({"_id": object_id, "revision": 3}) + encoded_size(
+                ApplicationService.build_update_document({
+                    "status": ApplicationStatus.PASSED,
+                    "reviewer_id": str(ObjectId()),
+                    "comment": "計畫內容完整，准予通過。",
+                })
+            ),
+        ),
+        (
+            "學生修改計畫名稱",
+            encoded_size(application),
+            encoded_size({"_id": object_id}) + encoded_size(
+                ApplicationService.build_update_document({
+                    "title": "修改後的計畫名稱",
+                    "status": ApplicationStatus.PENDING,
+                    "comment": "",
+                })
+            ),
+        ),
+        (
+            "學生修改學習計畫項次",
+            encoded_size(application),
+            encoded_size({"_id": object_id}) + encoded_size(
+                ApplicationService.build_update_document({
+                    "plan_items": payload["plan_items"],
+                    "status": ApplicationStatus.PENDING,
+                    "comment": "",
+                })
+            ),
+        ),
+        (
+            "使用者資料更新（單一欄位）",
+            encoded_size(user),
+            encoded_size({"_id": user["_id"]}) + encoded_size({
+                "$set": {"student_name": "新姓名", "updated_at": datetime.utcnow()},
+                "$inc": {"revision": 1},
+            }),
+        ),
+    ]
+
+    print(f"{'情境':<24}{'save() bytes':>14}{'$set bytes':>14}{'比例':>10}")
+    print("-" * 62)
+    for name, full_bytes, partial_bytes in scenarios:
+        ratio = partial_bytes / full_bytes
+        print(f"{name:<24}{full_bytes:>14,}{partial_bytes:>14,}{ratio:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+PDF 生成方式比較（libreoffice 與 native）
+
+以同一組合成申請表分別用兩種生成方式產生 PDF（另含長內容的申請表：大量參考資料、
+跨頁的學習動機與預期成效、超長的學習計畫項次，確認兩種方式都能生成多頁的申請表）：
+
+- 耗時：每種方式的 mean / p50 / p95（不含暖身）
+- 視覺差異：把兩份 PDF 的每一頁轉成灰階點陣圖，計算明顯不同的像素比例，
+  並輸出疊圖（紅色為只有 libreoffice 有的筆畫、藍色為只有 native 有的筆畫）
+  供人工檢查版面；--max-diff 可作為回歸檢查（超過時結束碼為 1）
+
+    python benchmarks/compare_pdf_engines.py
+    python benchmarks/compare_pdf_engines.py --corpus 3 --iterations 5 --out-dir /tmp/pdf-diff
+    python benchmarks/compare_pdf_engines.py --max-diff 0.08
+    python benchmarks/compare_pdf_engines.py --no-long-content
+
+需要 LibreOffice、Word 模板與 PDF_FONT_PATH 的中文字型（Docker 映像內皆已安裝）；
+視覺差異使用 pypdfium2（後端依賴，產生縮圖用），未安裝時只比較耗時。
+"""
+import argparse
+import copy
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 新增父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.pdf_service import PDFService
+from bench_pdf_stages import REPO_TEMPLATE, build_application, summarize
+
+ENGINES = ("libreoffice", "native")
+
+# 灰階差異超過此值的像素視為不同（0-255）
+PIXEL_THRESHOLD = 64
+
+# 長內容的申請表（覆寫命令列參數），版面需跨頁
+LONG_CONTENT_CASES = (
+    {"references": 30},
+    {"text_length": 3000},
+    {"plan_items": 40, "references": 60, "text_length": 1500},
+)
+# 單一學習計畫項次的超長學習內容（字數）
+LONG_PLAN_CONTENT_LENGTH = 2000
+
+
+def build_corpus(args: argparse.Namespace) -> List:
+    """一般的合成申請表，加上（除非 --no-long-content）長內容的申請表"""
+    corpus = [build_application(args, seed) for seed in range(args.corpus)]
+    if args.long_content:
+        for index, overrides in enumerate(LONG_CONTENT_CASES):
+            case_args = copy.copy(args)
+            vars(case_args).update(overrides)
+            corpus.append(build_application(case_args, args.corpus + index))
+        corpus[-1].plan_items[0].content = ("長內容學習計畫" * LONG_PLAN_CONTENT_LENGTH)[:LONG_PLAN_CONTENT_LENGTH]
+    return corpus
+
+
+def render(engine: str, application) -> Path:
+    settings.PDF_ENGINE = engine
+    return PDFService.render_pdf(application)
+
+
+def rasterize(pdf_path: Path, scale: float):
+    """把 PDF 每一頁轉成灰階 PIL 圖片"""
+    import pypdfium2 as pdfium
+
+    document = pdfium.PdfDocument(str(pdf_path))
+    try:
+        return [page.render(scale=scale).to_pil().convert("L") for page in document]
+    finally:
+        document.close()
+
+
+def visual_diff(reference: Path, candidate: Path, scale: float, out_prefix: Optional[Path]) -> Dict[str, float]:
+    """
+    比較兩份 PDF 的點陣圖
+
+    Returns:
+        Dict: pages（兩份的頁數）與 diff（所有頁中不同像素的比例；頁數不同時缺少的頁全部計為不同）
+    """
+    import numpy as np
+    from PIL import Image
+
+    reference_pages = rasterize(reference, scale)
+    candidate_pages = rasterize(candidate, scale)
+    differing = 0
+    total = 0
+    for index in range(max(len(reference_pages), len(candidate_pages))):
+        if index >= len(reference_pages) or index >= len(candidate_pages):
+            page = reference_pages[index] if index < len(reference_pages) else candidate_pages[index]
+            differing += page.width * page.height
+            total += page.width * page.height
+            continue
+
+        left = np.asarray(reference_pages[index], dtype=np.int16)
+        right = np.asarray(candidate_pages[index].resize(reference_pages[index].size), dtype=np.int16)
+        mask = np.abs(left - right) > PIXEL_THRESHOLD
+        differing += int(mask.sum())
+        total += mask.size
+
+        if out_prefix is not None:
+            # 疊圖：共同的筆畫為黑色，只在 libreoffice 出現為紅色，只在 native 出現為藍色
+            overlay = np.full((*left.shape, 3), 255, dtype=np.uint8)
+            left_ink = left < 128
+            right_ink = right < 128
+            overlay[left_ink & right_ink] = (0, 0, 0)
+            overlay[left_ink & ~right_ink] = (220, 0, 0)
+            overlay[~left_ink & right_ink] = (0, 0, 220)
+            Image.fromarray(overlay).save(f"{out_prefix}-page{index + 1}.png")
+
+    return {
+        "pages": f"{len(reference_pages)} / {len(candidate_pages)}",
+        "diff": differing / total if total else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較 libreoffice 與 native 生成方式的耗時與版面差異")
+    parser.add_argument("--template", type=Path, help="Word 模板路徑（預設自動尋找）")
+    parser.add_argument("--corpus", type=int, default=3, help="合成申請表數量")
+    parser.add_argument("--iterations", type=int, default=3, help="每份申請表重複次數")
+    parser.add_argument("--members", type=int, default=3)
+    parser.add_argument("--plan-items", type=int, default=9)
+    parser.add_argument("--references", type=int, default=3)
+    parser.add_argument("--signatures", type=int, default=5)
+    parser.add_argument("--text-length", type=int, default=200)
+    parser.add_argument(
+        "--no-long-content", dest="long_content", action="store_false",
+        help="不加入長內容的申請表（大量參考資料、跨頁的長文字）",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="點陣化倍率（1.0 為 72 DPI）")
+    parser.add_argument("--out-dir", type=Path, help="輸出 PDF 與疊圖的目錄")
+    parser.add_argument("--max-diff", type=float, help="任一份申請表的差異比例超過此值時結束碼為 1")
+    args = parser.parse_args()
+
+    template = args.template
+    if template is None:
+        template = PDFService.TEMPLATE_PATH if PDFService.TEMPLATE_PATH.exists() else REPO_TEMPLATE
+    if not template.exists():
+        parser.error(f"找不到 Word 模板: {template}")
+    if shutil.which("libreoffice") is None:
+        parser.error("未安裝 LibreOffice")
+    if not Path(settings.PDF_FONT_PATH).exists():
+        parser.error(f"找不到字型: {settings.PDF_FONT_PATH}（以 PDF_FONT_PATH 指定）")
+    PDFService.TEMPLATE_PATH = template
+
+    try:
+        import pypdfium2  # noqa: F401
+        compare = True
+    except ImportError:
+        print("未安裝 pypdfium2，只比較耗時")
+        compare = False
+
+    corpus = build_corpus(args)
+    timings: Dict[str, List[float]] = {engine: [] for engine in ENGINES}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        PDFService.TEMP_DIR = Path(tmp)
+
+        # 暖身（模組與字型載入、LibreOffice 首次啟動），不計入結果
+        for engine in ENGINES:
+            render(engine, corpus[0]).unlink()
+
+        outputs: Dict[str, List[Path]] = {engine: [] for engine in ENGINES}
+        for iteration in range(args.iterations):
+            for application in corpus:
+                for engine in ENGINES:
+                    start = time.perf_counter()
+                    pdf_path = render(engine, application)
+                    timings[engine].append(time.perf_counter() - start)
+                    if iteration == 0:
+                        outputs[engine].append(pdf_path)
+                    else:
+                        pdf_path.unlink()
+
+        long_cases = len(corpus) - args.corpus
+        print(
+            f"\n{args.corpus} 份申請表 + {long_cases} 份長內容 × {args.iterations} 次"
+            f"（計畫 {args.plan_items} 項、簽名 {args.signatures} 個）"
+        )
+        print(f"\n{'生成方式':<16}{'次數':>6}{'mean (ms)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}{'PDF 大小 (KB)':>16}")
+        print("-" * 74)
+        for engine in ENGINES:
+            stats = summarize(timings[engine])
+            size = sum(path.stat().st_size for path in outputs[engine]) / len(outputs[engine]) / 1024
+            print(
+                f"{engine:<16}{len(timings[engine]):>6}{stats['mean']:>12,.1f}{stats['p50']:>12,.1f}"
+                f"{stats['p95']:>12,.1f}{size:>16,.1f}"
+            )
+
+        if args.out_dir is not None:
+            args.out_dir.mkdir(parents=True, exist_ok=True)
+
+        exceeded = False
+        if compare:
+            print(f"\n{'申請表':<10}{'頁數 (libreoffice / native)':>30}{'不同像素比例':>16}")
+            print("-" * 56)
+            for index, (reference, candidate) in enumerate(zip(outputs["libreoffice"], outputs["native"])):
+                prefix = args.out_dir / f"application{index}" if args.out_dir is not None else None
+                result = visual_diff(reference, candidate, args.scale, prefix)
+                print(f"{index:<10}{result['pages']:>30}{result['diff']:>16.2%}")
+                if args.max_diff is not None and result["diff"] > args.max_diff:
+                    exceeded = True
+
+        if args.out_dir is not None:
+            for engine in ENGINES:
+                for index, pdf_path in enumerate(outputs[engine]):
+                    shutil.copyfile(pdf_path, args.out_dir / f"application{index}-{engine}.pdf")
+            print(f"\nPDF 與疊圖已輸出到 {args.out_dir}")
+
+    if exceeded:
+        print(f"\n差異比例超過 --max-diff {args.max_diff:.2%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
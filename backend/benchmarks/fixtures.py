@@ -0,0 +1,131 @@
+"""
+效能測試共用的合成資料產生器
+
+產生與前端送出格式相同的申請表資料（含真實可解碼的 base64 PNG 簽名），
+供各個 benchmark 指令碼使用。
+"""
+import base64
+import io
+import random
+from typing import Any, Dict, List
+
+from PIL import Image, ImageDraw
+
+# 申請表簽名欄位（與 PDFService 的 signature_types 對應）
+SIGNATURE_TYPES = [
+    "學生 1 簽名",
+    "學生 2 簽名",
+    "學生 3 簽名",
+    "指導教師簽章",
+    "空間裝置管理人簽章",
+]
+
+
+def make_signature(width: int = 600, height: int = 200, strokes: int = 40, seed: int = 0) -> str:
+    """
+    產生模擬簽名板輸出的 data URL（透明背景、白色筆跡）
+
+    Args:
+        width: 畫布寬度（像素）
+        height: 畫布高度（像素）
+        strokes: 筆劃數量
+        seed: 亂數種子
+
+    Returns:
+        str: data:image/png;base64,... 字串
+    """
+    rng = random.Random(seed)
+    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    x, y = rng.randint(0, width), rng.randint(0, height)
+    for _ in range(strokes):
+        nx = min(max(x + rng.randint(-80, 80), 0), width)
+        ny = min(max(y + rng.randint(-40, 40), 0), height)
+        draw.line([(x, y), (nx, ny)], fill=(255, 255, 255, 255), width=3)
+        x, y = nx, ny
+
+    output = io.BytesIO()
+    img.save(output, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(output.getvalue()).decode("ascii")
+
+
+def make_application_payload(
+    members: int = 3,
+    plan_items: int = 16,
+    references: int = 5,
+    signatures: int = 5,
+    text_length: int = 300,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    產生 ApplicationCreate 格式的申請表資料
+
+    Args:
+        members: 組員數量（最多 3）
+        plan_items: 學習計畫項次數量
+        references: 參考資料數量
+        signatures: 簽名數量（最多 5）
+        text_length: 長文字欄位的字數
+        seed: 亂數種子
+
+    Returns:
+        Dict: 可直接傳給 ApplicationCreate(**payload) 的資料
+    """
+    rng = random.Random(seed)
+    filler = "自主學習計畫內容測試文字"
+
+    def text(length: int = text_length) -> str:
+        return (filler * (length // len(filler) + 1))[:length]
+
+    member_list: List[Dict[str, Any]] = [
+        {
+            "student_id": f"1143{seed % 10000:04d}{i}",
+            "student_class": str(101 + rng.randint(0, 20)),
+            "student_seat": str(rng.randint(1, 40)),
+            "student_name": f"測試學生{i + 1}",
+            "has_submitted": rng.choice(["是", "否"]),
+        }
+        for i in range(min(members, 3))
+    ]
+
+    return {
+        "title": f"合成測試計畫 #{seed}",
+        "apply_date_start": "2025-02-01",
+        "apply_date_end": "2025-06-30",
+        "members": member_list,
+        "motivation": text(),
+        "learning_categories": {"專題研究": True, "技藝學習": rng.random() > 0.5, "其他": False},
+        "learning_category_other": "",
+        "references": [
+            {
+                "book_title": f"參考書籍 {i + 1} " + text(40),
+                "author": f"作者 {i + 1}",
+                "publisher": "測試出版社",
+                "link": f"https://example.com/book/{i + 1}",
+            }
+            for i in range(references)
+        ],
+        "expected_outcome": text(),
+        "equipment_needs": text(80),
+        "env_needs": {"圖書館": True, "電腦教室": rng.random() > 0.5},
+        "env_other": "",
+        "plan_items": [
+            {
+                "date": f"2025-{2 + i // 4:02d}-{1 + (i % 4) * 7:02d}",
+                "content": text(120),
+                "hours": str(rng.randint(1, 4)),
+                "metric": text(60),
+            }
+            for i in range(plan_items)
+        ],
+        "midterm_goal": text(),
+        "final_goal": text(),
+        "presentation_formats": {"書面報告": True},
+        "presentation_other": "",
+        "phone_agreement": "同意",
+        "signatures": [
+            {"type": sig_type, "image_url": make_signature(seed=seed * 10 + i)}
+            for i, sig_type in enumerate(SIGNATURE_TYPES[:signatures])
+        ],
+    }
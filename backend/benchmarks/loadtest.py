@@ -0,0 +1,403 @@
+"""
+尖峰時段壓力測試
+
+依實際使用流程對執行中的後端發出請求，統計每個端點的吞吐量與
+p50 / p95 / p99 延遲，並輸出 JSON 結果檔，可與其他 commit 的結果比較。
+
+流程（依序執行，模擬申請截止前的尖峰）：
+1. 大量登入：所有學生同時登入
+2. 學生：組員學號即時搜尋（typeahead）→ 草稿自動儲存 → 提交申請表 → 查看自己的列表
+3. 教師：列表 / 依狀態篩選 → 審核（觸發郵件通知）→ 匯出 PDF
+
+測試環境（請使用獨立的資料庫，測試會建立使用者與申請表）：
+    # 1. 本機 MongoDB
+    docker run -d -p 27017:27017 mongo:7.0
+    # 2. SMTP sink（另開終端機）
+    python benchmarks/smtp_sink.py --port 2525
+    # 3. 後端
+    MONGODB_DB_NAME=loadtest SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_STARTTLS=false \\
+        uvicorn app.main:app --port 8000
+    # 4. 壓力測試
+    python benchmarks/loadtest.py --students 200 --concurrency 50 --configure-smtp
+
+比較兩次結果（p95 變慢超過門檻時結束碼為 1）：
+    python benchmarks/loadtest.py --compare results/base.json results/head.json
+
+需要額外安裝 httpx（見 benchmarks/requirements.txt）。
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# 新增父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fixtures import make_application_payload
+
+PASSWORD = "loadtest-password"
+
+# 小於此毫秒數的 p95 差異視為量測雜訊，不判定為退步
+NOISE_FLOOR_MS = 5.0
+
+
+@dataclass
+class Recorder:
+    """記錄每個端點的延遲與錯誤"""
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    endpoint_phase: Dict[str, str] = field(default_factory=dict)
+
+    def record(self, name: str, phase: str, seconds: float, ok: bool) -> None:
+        self.samples.setdefault(name, []).append(seconds)
+        self.endpoint_phase[name] = phase
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+@dataclass
+class VirtualUser:
+    """壓力測試使用者"""
+    index: int
+    username: str
+    role: str
+    student_id: Optional[str] = None
+    token: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+
+class LoadTest:
+    """壓力測試執行器"""
+
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.recorder = Recorder()
+        self.semaphore = asyncio.Semaphore(args.concurrency)
+        self.rng = random.Random(args.seed)
+        self.phase = "setup"
+        # 學生提交的申請表：(申請表 ID, revision)
+        self.submitted: List[Dict[str, Any]] = []
+
+    async def request(self, name: str, method: str, url: str, expected=(200,), **kwargs) -> Optional[httpx.Response]:
+        """發出請求並記錄耗時（setup 階段不記錄）"""
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                ok = response.status_code in expected
+            except httpx.HTTPError:
+                response, ok = None, False
+            elapsed = time.perf_counter() - start
+
+        if self.phase != "setup":
+            self.recorder.record(name, self.phase, elapsed, ok)
+        return response if ok else None
+
+    async def run_phase(self, phase: str, coroutines) -> None:
+        """同時執行一個階段的所有工作並記錄總耗時"""
+        self.phase = phase
+        start = time.perf_counter()
+        await asyncio.gather(*coroutines)
+        self.recorder.phase_seconds[phase] = time.perf_counter() - start
+        print(f"  {phase}: {self.recorder.phase_seconds[phase]:.2f}s")
+
+    # ------------------------------------------------------------------
+    # 準備資料
+    # ------------------------------------------------------------------
+
+    async def register(self, user: VirtualUser) -> None:
+        """建立測試帳號（已存在時略過）"""
+        params = {"username": user.username, "password": PASSWORD, "role": user.role}
+        if user.role == "student":
+            params.update({
+                "student_id": user.student_id,
+                "student_name": f"壓測學生{user.index}",
+                "class_name": str(101 + user.index % 20),
+                "seat_number": user.index % 40 + 1,
+            })
+        else:
+            params["teacher_name"] = f"壓測教師{user.index}"
+        await self.request("POST /auth/register", "POST", "/auth/register", expected=(200, 400), params=params)
+
+    async def login(self, user: VirtualUser) -> None:
+        response = await self.request(
+            "POST /auth/login", "POST", "/auth/login",
+            json={"username": user.username, "password": PASSWORD},
+        )
+        if response is not None:
+            user.token = response.json()["access_token"]
+
+    async def configure_smtp(self, teacher: VirtualUser) -> None:
+        """設定郵件帳號，讓審核流程寄出通知（後端需指向 SMTP sink）"""
+        await self.request(
+            "PUT /settings/gmail", "PUT", "/settings/gmail", headers=teacher.headers,
+            json={"gmail_user": "loadtest@example.com", "gmail_app_password": "sink"},
+        )
+
+    # ------------------------------------------------------------------
+    # 學生流程
+    # ------------------------------------------------------------------
+
+    async def student_journey(self, user: VirtualUser) -> None:
+        if user.token is None:
+            return
+
+        # 組員學號即時搜尋：每輸入一個字元查詢一次
+        keyword = self.args.typeahead_keyword or user.student_id
+        for length in range(3, len(keyword) + 1):
+            await self.request(
+                "GET /students/search", "GET", "/students/search",
+                params={"student_id": keyword[:length]},
+            )
+
+        # 草稿自動儲存：每次修改一部分內容
+        payload = make_application_payload(
+            plan_items=self.args.plan_items,
+            signatures=self.args.signatures,
+            seed=user.index,
+        )
+        form_data = dict(payload)
+        for step in range(self.args.autosaves):
+            form_data["motivation"] = payload["motivation"][: (step + 1) * 20]
+            await self.request(
+                "POST /drafts/", "POST", "/drafts/", headers=user.headers,
+                json={"form_data": form_data},
+            )
+            if self.args.autosave_interval:
+                await asyncio.sleep(self.args.autosave_interval)
+
+        # 提交申請表
+        response = await self.request(
+            "POST /applications/", "POST", "/applications/", expected=(200, 201),
+            headers=user.headers, json=payload,
+        )
+        if response is not None:
+            created = response.json()
+            self.submitted.append({"id": created["id"], "revision": created.get("revision")})
+
+        await self.request("GET /applications/ (student)", "GET", "/applications/", headers=user.headers)
+
+    # ------------------------------------------------------------------
+    # 教師流程
+    # ------------------------------------------------------------------
+
+    async def teacher_journey(self, teacher: VirtualUser, assigned: List[Dict[str, Any]]) -> None:
+        if teacher.token is None:
+            return
+
+        await self.request("GET /applications/ (teacher)", "GET", "/applications/", headers=teacher.headers)
+        await self.request(
+            "GET /applications/?status", "GET", "/applications/", headers=teacher.headers,
+            params={"status": "審核中"},
+        )
+
+        for application in assigned:
+            await self.request(
+                "GET /applications/{id}", "GET", f"/applications/{application['id']}",
+                headers=teacher.headers,
+            )
+            await self.request(
+                "PATCH /applications/{id}/review", "PATCH", f"/applications/{application['id']}/review",
+                headers=teacher.headers,
+                json={
+                    "status": "通過" if self.rng.random() < 0.8 else "未通過",
+                    "comment": "壓力測試審核",
+                    "revision": application["revision"],
+                },
+            )
+            if self.rng.random() < self.args.export_ratio:
+                await self.request(
+                    "GET /applications/{id}/export-pdf", "GET", f"/applications/{application['id']}/export-pdf",
+                    headers=teacher.headers,
+                )
+
+    # ------------------------------------------------------------------
+
+    async def run(self) -> None:
+        prefix = self.args.user_prefix
+        students = [
+            VirtualUser(i, f"{prefix}-student-{i}@loadtest.local", "student", student_id=f"9{i:07d}")
+            for i in range(self.args.students)
+        ]
+        teachers = [
+            VirtualUser(i, f"{prefix}-teacher-{i}@loadtest.local", "teacher")
+            for i in range(self.args.teachers)
+        ]
+
+        print("準備測試帳號...")
+        await asyncio.gather(*(self.register(user) for user in students + teachers))
+        await asyncio.gather(*(self.login(user) for user in teachers))
+        if self.args.configure_smtp and teachers:
+            await self.configure_smtp(teachers[0])
+
+        print("執行中:")
+        await self.run_phase("login", (self.login(user) for user in students))
+        await self.run_phase("student", (self.student_journey(user) for user in students))
+
+        assignments = [self.submitted[i::len(teachers)] for i in range(len(teachers))]
+        await self.run_phase(
+            "teacher",
+            (self.teacher_journey(teacher, assigned) for teacher, assigned in zip(teachers, assignments)),
+        )
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """最近秩法百分位數"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(recorder: Recorder) -> Dict[str, Dict[str, float]]:
+    """計算每個端點的統計（毫秒）"""
+    summary = {}
+    for name, samples in recorder.samples.items():
+        values = sorted(samples)
+        phase_seconds = recorder.phase_seconds.get(recorder.endpoint_phase[name], 0)
+        summary[name] = {
+            "count": len(values),
+            "errors": recorder.errors.get(name, 0),
+            "throughput_rps": round(len(values) / phase_seconds, 2) if phase_seconds else 0.0,
+            "mean_ms": round(sum(values) / len(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{'端點':<38}{'次數':>7}{'錯誤':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    print("-" * 92)
+    for name, row in summary.items():
+        print(
+            f"{name:<38}{row['count']:>7}{row['errors']:>6}{row['throughput_rps']:>9.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+        )
+
+
+def git_commit() -> Optional[str]:
+    """目前的 git commit（非 git 目錄時返回 None）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base_path: Path, head_path: Path, threshold: float) -> int:
+    """
+    比較兩個結果檔的 p95 延遲
+
+    Returns:
+        int: 結束碼（有端點退步超過門檻時為 1）
+    """
+    base = json.loads(base_path.read_text(encoding="utf-8"))
+    head = json.loads(head_path.read_text(encoding="utf-8"))
+    print(f"base: {base['meta'].get('commit')}  head: {head['meta'].get('commit')}")
+    print(f"\n{'端點':<38}{'base p95':>11}{'head p95':>11}{'變化':>9}  錯誤 (base→head)")
+    print("-" * 88)
+
+    regressions = []
+    for name, head_row in head["endpoints"].items():
+        base_row = base["endpoints"].get(name)
+        if base_row is None:
+            print(f"{name:<38}{'-':>11}{head_row['p95_ms']:>11.1f}{'new':>9}")
+            continue
+        change = (head_row["p95_ms"] - base_row["p95_ms"]) / base_row["p95_ms"] if base_row["p95_ms"] else 0.0
+        regressed = (
+            change > threshold
+            and head_row["p95_ms"] - base_row["p95_ms"] > NOISE_FLOOR_MS
+        ) or head_row["errors"] > base_row["errors"]
+        marker = "  ⚠" if regressed else ""
+        print(
+            f"{name:<38}{base_row['p95_ms']:>11.1f}{head_row['p95_ms']:>11.1f}{change:>+9.0%}"
+            f"  {base_row['errors']}→{head_row['errors']}{marker}"
+        )
+        if regressed:
+            regressions.append(name)
+
+    if regressions:
+        print(f"\n退步的端點（p95 超過 {threshold:.0%} 或錯誤增加）: {', '.join(regressions)}")
+        return 1
+    print("\n沒有退步的端點")
+    return 0
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        test = LoadTest(client, args)
+        started_at = datetime.utcnow()
+        await test.run()
+
+    summary = summarize(test.recorder)
+    print_summary(summary)
+
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at.isoformat(),
+            "base_url": args.base_url,
+            "students": args.students,
+            "teachers": args.teachers,
+            "concurrency": args.concurrency,
+            "autosaves": args.autosaves,
+            "export_ratio": args.export_ratio,
+            "seed": args.seed,
+            "phase_seconds": {k: round(v, 3) for k, v in test.recorder.phase_seconds.items()},
+        },
+        "endpoints": summary,
+    }
+    output = Path(args.output or f"benchmarks/results/loadtest-{result['meta']['commit'] or 'local'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n結果已寫入 {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="尖峰時段壓力測試")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--students", type=int, default=100, help="學生人數")
+    parser.add_argument("--teachers", type=int, default=3, help="教師人數")
+    parser.add_argument("--concurrency", type=int, default=50, help="同時進行的請求上限")
+    parser.add_argument("--autosaves", type=int, default=10, help="每位學生的草稿自動儲存次數")
+    parser.add_argument("--autosave-interval", type=float, default=0.0, help="自動儲存間隔（秒）")
+    parser.add_argument("--typeahead-keyword", help="搜尋用的學號（預設為測試學生自己的學號）")
+    parser.add_argument("--plan-items", type=int, default=16)
+    parser.add_argument("--signatures", type=int, default=3)
+    parser.add_argument("--export-ratio", type=float, default=0.2, help="審核後匯出 PDF 的比例")
+    parser.add_argument("--configure-smtp", action="store_true", help="設定郵件帳號以觸發審核通知（後端需指向 SMTP sink）")
+    parser.add_argument("--user-prefix", default="loadtest")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="結果 JSON 路徑（預設 benchmarks/results/loadtest-<commit>.json）")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="比較兩個結果檔")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 退步門檻（比例）")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(Path(args.compare[0]), Path(args.compare[1]), args.threshold))
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
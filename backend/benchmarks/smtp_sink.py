@@ -0,0 +1,104 @@
+"""
+壓力測試用的 SMTP sink
+
+接受任何帳號密碼與郵件、丟棄內容，只統計收到的郵件數量與大小，
+讓審核通知可以在不寄出真實郵件的情況下完整走過 SMTP 流程。
+
+使用方法:
+    python benchmarks/smtp_sink.py --port 2525
+
+後端需以下列環境變數啟動，才會寄到 sink：
+    SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_STARTTLS=false
+"""
+import argparse
+import asyncio
+import time
+
+
+class SinkStats:
+    """收到的郵件統計"""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, stats: SinkStats) -> None:
+    """處理單一 SMTP 連線（僅實作 smtplib 寄信需要的指令）"""
+
+    async def reply(line: str) -> None:
+        writer.write(line.encode("ascii") + b"\r\n")
+        await writer.drain()
+
+    await reply("220 smtp-sink ready")
+    try:
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            command = raw.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                await reply("250-smtp-sink")
+                await reply("250-AUTH PLAIN LOGIN")
+                await reply("250 SIZE 52428800")
+            elif verb == "HELO":
+                await reply("250 smtp-sink")
+            elif verb == "AUTH":
+                await reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    line = await reader.readline()
+                    if not line or line == b".\r\n":
+                        break
+                    size += len(line)
+                stats.messages += 1
+                stats.bytes += size
+                await reply("250 OK: queued")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def report(stats: SinkStats, interval: float) -> None:
+    """定期列印統計"""
+    while True:
+        await asyncio.sleep(interval)
+        elapsed = time.monotonic() - stats.started
+        print(f"[smtp-sink] {stats.messages} 封郵件, {stats.bytes / 1024:,.0f} KB, 經過 {elapsed:,.0f} 秒")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="壓力測試用的 SMTP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    stats = SinkStats()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(reader, writer, stats), args.host, args.port
+    )
+    print(f"[smtp-sink] 監聽 {args.host}:{args.port}")
+    asyncio.create_task(report(stats, args.report_interval))
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
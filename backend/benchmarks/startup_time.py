@@ -0,0 +1,80 @@
+"""
+啟動時間量測（time-to-ready）
+
+重複啟動 uvicorn，量測從啟動行程到健康檢查端點返回 200 的時間，以及
+`import app.main` 的匯入時間。需要可連線的 MongoDB（資料庫已有學生資料，
+避免把首次匯入計入）。
+
+    python benchmarks/startup_time.py --runs 5
+    python benchmarks/startup_time.py --path /health/ready
+
+需要額外安裝 httpx（見 benchmarks/requirements.txt）。
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def measure_import() -> float:
+    """在新的直譯器中量測 import app.main 的秒數"""
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_ready(app: str, port: int, path: str, timeout: float) -> float:
+    """啟動 uvicorn 並輪詢健康檢查端點，返回第一次 200 的秒數"""
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn 已結束（結束碼 {process.returncode}）")
+            try:
+                if httpx.get(url, timeout=1.0).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.02)
+        raise TimeoutError(f"{timeout} 秒內 {url} 沒有返回 200")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="量測後端啟動到就緒的時間")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--app", default="app.main:app", help="uvicorn 應用路徑")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--path", default="/health/live", help="視為就緒的端點")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    readies = [measure_ready(args.app, args.port, args.path, args.timeout) for _ in range(args.runs)]
+
+    print(f"{'項目':<24}{'min (ms)':>12}{'median (ms)':>14}{'max (ms)':>12}")
+    print("-" * 62)
+    for name, values in (("import app.main", imports), (f"ready ({args.path})", readies)):
+        print(
+            f"{name:<24}{min(values) * 1000:>12.0f}{statistics.median(values) * 1000:>14.0f}"
+            f"{max(values) * 1000:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+匯出分析用欄式資料（申請表、組員、學習計畫項次）
+
+依 updated_at 增量匯出：每次只處理上次匯出後變更的申請表，
+在輸出目錄的 applications/、members/、plan_items/ 下各新增一個檔案。
+適合以 cron 每晚執行。
+
+使用方法:
+    python scripts/export_analytics.py [輸出目錄] [--format parquet|arrow] [--full]
+
+讀取（pandas）:
+    pd.read_parquet("uploads/analytics/applications")
+"""
+import sys
+import argparse
+import asyncio
+from pathlib import Path
+
+# 新增父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.database import mongodb_client
+from app.services.export_service import ApplicationExportService
+from app.utils.log import setup_logging
+
+
+async def export_analytics(output_dir: Path, file_format: str, full: bool) -> None:
+    """
+    匯出分析用欄式資料
+
+    Args:
+        output_dir: 輸出目錄
+        file_format: parquet 或 arrow
+        full: 忽略上次匯出的時間，匯出所有申請表
+    """
+    # 連線資料庫
+    await mongodb_client.connect_db()
+    try:
+        counts = await ApplicationExportService().export_analytics(output_dir, file_format, full)
+    finally:
+        # 關閉資料庫連線
+        await mongodb_client.close_db()
+
+    for name, count in counts.items():
+        print(f"📊 {name}: {count} 列")
+    print(f"\n✨ 匯出完成: {output_dir}")
+
+
+async def main():
+    """主函式"""
+    parser = argparse.ArgumentParser(description="匯出分析用欄式資料（Parquet / Arrow IPC）")
+    parser.add_argument("output_dir", nargs="?", default=settings.ANALYTICS_EXPORT_DIR, help="輸出目錄")
+    parser.add_argument(
+        "--format",
+        choices=sorted(ApplicationExportService.ANALYTICS_FORMATS),
+        default=settings.ANALYTICS_EXPORT_FORMAT,
+        help="檔案格式",
+    )
+    parser.add_argument("--full", action="store_true", help="匯出所有申請表（忽略上次匯出的時間）")
+    args = parser.parse_args()
+
+    setup_logging()
+    await export_analytics(Path(args.output_dir), args.format, args.full)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -45,6 +45,45 @@ const TeacherActions: React.FC<{
     </div>
 );
 
+const ApplicationThumbnail: React.FC<{ application: Application }> = ({ application }) => {
+    const [url, setUrl] = useState<string | null>(null);
+
+    useEffect(() => {
+        let objectUrl: string | null = null;
+        let cancelled = false;
+        if (!application.thumbnailUrl) {
+            return;
+        }
+        api.getApplicationThumbnail(application.thumbnailUrl)
+            .then((result) => {
+                objectUrl = result;
+                if (cancelled && result) {
+                    URL.revokeObjectURL(result);
+                } else {
+                    setUrl(result);
+                }
+            })
+            .catch(() => setUrl(null));
+        return () => {
+            cancelled = true;
+            if (objectUrl) {
+                URL.revokeObjectURL(objectUrl);
+            }
+        };
+    }, [application.thumbnailUrl, application.status, application.title]);
+
+    if (!url) {
+        return null;
+    }
+    return (
+        <img
+            src={url}
+            alt={`${application.title} 預覽`}
+            className="w-20 rounded-md border border-white/10 bg-white shrink-0"
+        />
+    );
+};
+
 const ApplicationCard: React.FC<{
     application: Application;
     userRole: UserRole;
@@ -57,7 +96,8 @@ const ApplicationCard: React.FC<{
     return (
         <GlassCard className="p-6" hover glow="subtle">
             {/* Header with Status */}
-            <div className="flex items-start justify-between mb-4">
+            <div className="flex items-start justify-between gap-4 mb-4">
+                {userRole === UserRole.Teacher && <ApplicationThumbnail application={application} />}
                 <div className="flex-1">
                     <h3 className="text-lg font-bold text-white mb-1">{application.title}</h3>
                     <p className="text-sm text-white/50">計畫名稱</p>
@@ -147,6 +187,7 @@ const HistoryPage: React.FC<HistoryPageProps> = ({ userRole, onEdit }) => {
     const [filters, setFilters] = useState({ year: '', month: '', day: '', status: '' });
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
+    const [exportingXLSX, setExportingXLSX] = useState(false);
 
     useEffect(() => {
         const fetchApplications = async () => {
@@ -162,6 +203,7 @@ const HistoryPage: React.FC<HistoryPageProps> = ({ userRole, onEdit }) => {
                     status: app.status as ApplicationStatus,
                     comment: app.comment || '',
                     submitter_student_id: app.submitter_student_id || '',
+                    thumbnailUrl: app.thumbnail_url || null,
                 }));
                 setApplications(transformedApps);
             } catch (err) {
@@ -175,6 +217,20 @@ const HistoryPage: React.FC<HistoryPageProps> = ({ userRole, onEdit }) => {
         fetchApplications();
     }, []);
 
+    // 即時更新審核狀態與評語（不需重新整理頁面）
+    useEffect(() => {
+        const unsubscribe = api.subscribeApplicationEvents((event) => {
+            setApplications((apps) =>
+                apps.map((app) =>
+                    app.id === event.id
+                        ? { ...app, status: event.status as ApplicationStatus, comment: event.comment || '' }
+                        : app
+                )
+            );
+        });
+        return unsubscribe;
+    }, []);
+
     const filteredApplications = useMemo(() => {
         return applications.filter((app) => {
             const appDate = new Date(app.applyDateStart.split(' ')[0]);
@@ -284,6 +340,40 @@ const HistoryPage: React.FC<HistoryPageProps> = ({ userRole, onEdit }) => {
         }
     };
 
+    // 以篩選條件匯出 Excel：年／月／日換算為建立日期範圍
+    const handleExportXLSX = async () => {
+        const pad = (n: number) => n.toString().padStart(2, '0');
+        const toDate = (d: Date) => `${d.getFullYear()}-${pad(d.getMonth() + 1)}-${pad(d.getDate())}`;
+        let createdFrom: string | undefined;
+        let createdTo: string | undefined;
+        if (filters.year) {
+            const year = Number(filters.year);
+            const month = filters.month ? Number(filters.month) - 1 : null;
+            const day = filters.day ? Number(filters.day) : null;
+            const start = new Date(year, month ?? 0, day ?? 1);
+            const end =
+                month === null ? new Date(year, 11, 31)
+                : day === null ? new Date(year, month + 1, 0)
+                : start;
+            createdFrom = toDate(start);
+            createdTo = toDate(end);
+        }
+
+        setExportingXLSX(true);
+        try {
+            await api.exportApplicationsXLSX({
+                status: filters.status || undefined,
+                created_from: createdFrom,
+                created_to: createdTo,
+            });
+        } catch (err) {
+            console.error('匯出 Excel 失敗:', err);
+            alert('匯出 Excel 失敗: ' + (err instanceof Error ? err.message : '未知錯誤'));
+        } finally {
+            setExportingXLSX(false);
+        }
+    };
+
     const handleEdit = async (app: Application) => {
         try {
             // 取得完整的申請表資料
@@ -326,6 +416,19 @@ const HistoryPage: React.FC<HistoryPageProps> = ({ userRole, onEdit }) => {
                             <h2 className="font-bold text-white">篩選條件</h2>
                             <p className="text-sm text-white/50">依日期或狀態篩選申請表</p>
                         </div>
+                        <GlassButton
+                            variant="primary"
+                            size="sm"
+                            className="ml-auto"
+                            onClick={handleExportXLSX}
+                            disabled={exportingXLSX}
+                            title="依狀態與建立日期匯出申請表"
+                        >
+                            <svg className="w-4 h-4" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 10v6m0 0l-3-3m3 3l3-3m2 8H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+                            </svg>
+                            {exportingXLSX ? '匯出中...' : '匯出 Excel'}
+                        </GlassButton>
                     </div>
                     <div className="grid grid-cols-2 sm:grid-cols-5 gap-3">
                         <GlassInput
@@ -365,8 +365,99 @@ export const reviewApplication = async (
     });
 };
 
+/**
+ * 訂閱申請表狀態變更（Server-Sent Events）
+ *
+ * EventSource 無法設定標頭，token 只能放在網址中；為避免登入 token 出現在存取日誌，
+ * 每次連線前先取得短效的事件串流 token。連線中斷且無法自動重連（token 已過期）時，
+ * 重新取得 token 後再連線。
+ *
+ * 返回取消訂閱的函數
+ */
+export const subscribeApplicationEvents = (
+    onEvent: (event: {
+        id: string;
+        status: string;
+        comment: string;
+        revision: number;
+        updated_at: string;
+    }) => void
+): (() => void) => {
+    let source: EventSource | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+    let closed = false;
+
+    const scheduleReconnect = () => {
+        if (!closed && reconnectTimer === null) {
+            reconnectTimer = setTimeout(() => {
+                reconnectTimer = null;
+                connect();
+            }, 5000);
+        }
+    };
+
+    const connect = async () => {
+        let token: string;
+        try {
+            ({ token } = await fetchAPI<{ token: string; expires_in: number }>('/applications/events/token', {
+                method: 'POST',
+            }));
+        } catch (error) {
+            console.error('取得事件串流 token 失敗:', error);
+            scheduleReconnect();
+            return;
+        }
+        if (closed) {
+            return;
+        }
+
+        source = new EventSource(
+            `${API_BASE_URL}/applications/events?access_token=${encodeURIComponent(token)}`
+        );
+        source.addEventListener('application.updated', (message) => {
+            try {
+                onEvent(JSON.parse((message as MessageEvent).data));
+            } catch (error) {
+                console.error('解析申請表事件失敗:', error);
+            }
+        });
+        source.onerror = () => {
+            // 瀏覽器自動重連失敗（例如 token 已過期返回 401）時，以新的 token 重新連線
+            if (source && source.readyState === EventSource.CLOSED) {
+                source = null;
+                scheduleReconnect();
+            }
+        };
+    };
+
+    connect();
+
+    return () => {
+        closed = true;
+        if (reconnectTimer !== null) {
+            clearTimeout(reconnectTimer);
+        }
+        source?.close();
+    };
+};
+
+interface PdfJob {
+    job_id: string;
+    status: 'queued' | 'running' | 'done' | 'failed';
+    error: string | null;
+    status_url: string;
+    result_url: string | null;
+    download_url: string | null;
+}
+
+// PDF 匯出工作輪詢的最長等待時間（毫秒）
+const PDF_JOB_TIMEOUT_MS = 5 * 60 * 1000;
+
 /**
  * 匯出申請表為 PDF
+ *
+ * 建立匯出工作後輪詢狀態，完成時下載 PDF（生成時間不受 HTTP 逾時限制）。
+ * 優先使用簽章下載網址，檔案不經過 JavaScript 記憶體。
  */
 export const exportApplicationPDF = async (id: string): Promise<void> => {
     const token = getToken();
@@ -375,7 +466,34 @@ export const exportApplicationPDF = async (id: string): Promise<void> => {
     }
 
     try {
-        const response = await fetch(`${API_BASE_URL}/applications/${id}/export-pdf`, {
+        let job = await fetchAPI<PdfJob>(`/applications/${id}/export-pdf/jobs`, {
+            method: 'POST',
+        });
+
+        const deadline = Date.now() + PDF_JOB_TIMEOUT_MS;
+        while (job.status === 'queued' || job.status === 'running') {
+            if (Date.now() > deadline) {
+                throw new Error('生成 PDF 逾時，請稍後再試');
+            }
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+            job = await fetchAPI<PdfJob>(job.status_url);
+        }
+
+        if (job.status === 'failed' || !job.result_url) {
+            throw new Error(job.error || '匯出 PDF 失敗');
+        }
+
+        // 簽章下載網址不需登入：交給瀏覽器直接下載（由 nginx 傳送檔案）
+        if (job.download_url) {
+            const a = document.createElement('a');
+            a.href = `${API_BASE_URL}${job.download_url}`;
+            document.body.appendChild(a);
+            a.click();
+            document.body.removeChild(a);
+            return;
+        }
+
+        const response = await fetch(`${API_BASE_URL}${job.result_url}`, {
             method: 'GET',
             headers: {
                 'Authorization': `Bearer ${token}`,
@@ -391,9 +509,9 @@ export const exportApplicationPDF = async (id: string): Promise<void> => {
         const contentDisposition = response.headers.get('Content-Disposition');
         let filename = '自主學習申請表.pdf';
         if (contentDisposition) {
-            const matches = /filename="(.+)"/.exec(contentDisposition);
+            const matches = /filename\*=UTF-8''(.+)/i.exec(contentDisposition);
             if (matches && matches[1]) {
-                filename = matches[1];
+                filename = decodeURIComponent(matches[1]);
             }
         }
 
@@ -412,6 +530,86 @@ export const exportApplicationPDF = async (id: string): Promise<void> => {
     }
 };
 
+/**
+ * 獲取申請表第一頁縮圖
+ *
+ * thumbnailUrl 為列表回應的 thumbnail_url（後端未啟用預先生成時沒有，不需請求）。
+ * 只讀取後端預先生成的縮圖，不會觸發 PDF 生成；尚未生成時返回 null。
+ * 返回的 object URL 不再使用時需以 URL.revokeObjectURL 釋放。
+ */
+export const getApplicationThumbnail = async (thumbnailUrl: string): Promise<string | null> => {
+    const token = getToken();
+    if (!token) {
+        return null;
+    }
+
+    const response = await fetch(`${API_BASE_URL}${thumbnailUrl}`, {
+        headers: {
+            'Authorization': `Bearer ${token}`,
+        },
+    });
+    if (!response.ok) {
+        return null;
+    }
+    return window.URL.createObjectURL(await response.blob());
+};
+
+export interface ApplicationExportFilters {
+    status?: string;
+    student_class?: string;
+    created_from?: string;  // YYYY-MM-DD
+    created_to?: string;    // YYYY-MM-DD
+}
+
+/**
+ * 匯出符合條件的申請表為 Excel（教師）
+ */
+export const exportApplicationsXLSX = async (filters: ApplicationExportFilters = {}): Promise<void> => {
+    const token = getToken();
+    if (!token) {
+        throw new Error('未登入');
+    }
+
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+        if (value) {
+            params.append(key, value);
+        }
+    });
+    const query = params.toString();
+
+    const response = await fetch(`${API_BASE_URL}/applications/export/xlsx${query ? `?${query}` : ''}`, {
+        method: 'GET',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+        },
+    });
+
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({}));
+        throw new Error(error.detail || '匯出 Excel 失敗');
+    }
+
+    const contentDisposition = response.headers.get('Content-Disposition');
+    let filename = '申請表匯出.xlsx';
+    if (contentDisposition) {
+        const matches = /filename\*=UTF-8''(.+)/i.exec(contentDisposition);
+        if (matches && matches[1]) {
+            filename = decodeURIComponent(matches[1]);
+        }
+    }
+
+    const blob = await response.blob();
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = filename;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    window.URL.revokeObjectURL(url);
+};
+
 // ==================== 草稿 API ====================
 
 /**
@@ -431,6 +629,18 @@ export const saveDraft = async (formData: any): Promise<any> => {
     });
 };
 
+/**
+ * 增量儲存草稿（JSON Patch 風格，只傳送變更的欄位）
+ */
+export const patchDraft = async (
+    operations: { op: 'add' | 'replace' | 'remove'; path: string; value?: any }[]
+): Promise<any> => {
+    return fetchAPI('/drafts/', {
+        method: 'PATCH',
+        body: JSON.stringify({ operations }),
+    });
+};
+
 /**
  * 刪除草稿
  */
@@ -536,11 +746,15 @@ const api = {
     updateApplication,
     deleteApplication,
     reviewApplication,
+    subscribeApplicationEvents,
     exportApplicationPDF,
+    getApplicationThumbnail,
+    exportApplicationsXLSX,
 
     // 草稿
     getDraft,
     saveDraft,
+    patchDraft,
     deleteDraft,
 
     // 學生
@@ -60,6 +60,8 @@ export interface Application {
     applyDateEnd: string;
     status: ApplicationStatus;
     comment: string;
+    // 列表：第一頁縮圖網址（後端啟用預先生成時才有）
+    thumbnailUrl?: string | null;
     // 完整欄位
     members?: Member[];
     motivation?: string;